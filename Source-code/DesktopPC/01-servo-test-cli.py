@@ -4,12 +4,22 @@ import serial
 import time
 import argparse
 
-def UARTServo(ser, servonum, angle):
+from yahboom import ServoDriver, frame
+from yahboom.pacing import Pacer
+from yahboom.recorder import MotionRecorder, replay
+from yahboom.metrics import DriverMetrics
+from yahboom import trace
+from yahboom.daemon import DaemonDriver
+from yahboom import discover
+from yahboom.writer import ServoWriter
+from yahboom.script import run as run_script
+
+def UARTServo(driver, servonum, angle):
     """
     Kontrol servo via UART dengan protokol: $[A-P][000-180]#
     
     Args:
-        ser: Serial port object
+        driver: ServoDriver (lihat yahboom/driver.py)
         servonum: Nomor servo (1-16 untuk 16 channel controller)
         angle: Sudut servo (0-180)
     
@@ -21,24 +31,44 @@ def UARTServo(ser, servonum, angle):
     
     Example: Servo 1 ke 180 derajat = "$A180#"
     """
-    # Convert servo number to ASCII character (A-P)
-    # Servo 1 = 'A' (65), Servo 2 = 'B' (66), ..., Servo 16 = 'P' (80)
-    servo_char = 64 + servonum
+    # Frame diambil dari tabel yang sudah dihitung saat import
+    cmd = frame(servonum, angle)
+    
+    # Debug output
+    print(f"  -> Mengirim: {cmd.decode()} (hex: {binascii.hexlify(cmd).decode()})")
     
-    # Convert angle to 3-digit ASCII string
-    date1 = int(angle/100 + 48)      # Hundreds digit
-    date2 = int((angle%100)/10 + 48)  # Tens digit
-    date3 = int(angle%10 + 48)        # Units digit
+    # Tidak ada sleep tetap: Pacer di driver mengatur jeda sesuai baudrate
+    driver.set(servonum, angle)
+
+def UARTServoBatch(driver, targets):
+    """
+    Kirim beberapa servo sekaligus dalam SATU write() (tanpa sleep per servo).
     
-    # Build command: $ + ServoChar + Angle(3digits) + #
-    cmd = bytearray([36, servo_char, date1, date2, date3, 35])
+    Args:
+        driver: ServoDriver (lihat yahboom/driver.py)
+        targets: dict {servonum: angle}
+    
+    Example: {1: 90, 2: 90} -> "$A090#$B090#" (12 byte, ~13ms @ 9600bps)
+    """
+    cmd = b"".join(frame(servonum, angle) for servonum, angle in targets.items())
     
     # Debug output
-    cmd_str = ''.join([chr(b) for b in cmd])
-    print(f"  -> Mengirim: {cmd_str} (hex: {binascii.hexlify(cmd).decode()})")
+    print(f"  -> Mengirim batch {len(targets)} servo ({len(cmd)} byte): {cmd.decode()}")
     
-    ser.write(cmd)
-    time.sleep(0.05)
+    start = time.perf_counter()
+    driver.set_many(targets)
+    driver.flush()  # Tunggu sampai byte terakhir keluar dari port
+    print(f"  -> Selesai dalam {(time.perf_counter() - start) * 1000:.0f} ms")
+
+def parse_pose(text):
+    """Parse '90,60,120' -> {1: 90, 2: 60, 3: 120}"""
+    angles = [int(a) for a in text.split(',') if a.strip()]
+    if not 1 <= len(angles) <= 16:
+        raise ValueError("Pose harus berisi 1-16 sudut")
+    for angle in angles:
+        if angle < 0 or angle > 180:
+            raise ValueError("Angle harus antara 0-180 derajat")
+    return {i: angle for i, angle in enumerate(angles, start=1)}
 
 def main():
     # Setup argument parser
@@ -67,6 +97,12 @@ Contoh penggunaan:
   # Kontrol servo 3 ke sudut 0
   python script.py -s 3 -a 0 -p COM4
   
+  # Tanpa --port: board dicari lewat identitas USB (cache dulu, scan jika meleset)
+  python script.py -s 1 -a 90 -p auto:kaki-kiri
+  
+  # Catat port manual sebagai board 'auto' berikutnya
+  python script.py --reset -p /dev/ttyUSB1 --save-port
+  
   # Test 1 servo (sweep 0 -> 180)
   python script.py --test
   python script.py --test -s 5
@@ -83,6 +119,31 @@ Contoh penggunaan:
   # Reset semua servo ke posisi 90 (center)
   python script.py --reset
   
+  # Set pose servo 1-6 sekaligus (satu write)
+  python script.py --pose 90,60,120,90,90,45
+  
+  # Mode lama: kirim servo satu per satu dengan delay
+  python script.py --reset --one-by-one
+  
+  # Rekam semua frame yang dikirim, lalu putar ulang setengah kecepatan
+  python script.py --test-sweep --record sweep.ybr
+  python script.py --play sweep.ybr --speed 0.5
+  
+  # Simpan metrik link (frame, byte, latency) dalam format Prometheus
+  python script.py --test-sweep --metrics sweep.prom
+  
+  # Rekam trace (buka di https://ui.perfetto.dev atau chrome://tracing)
+  python script.py --test-sweep --trace sweep.json
+  
+  # Script perintah dari file atau stdin, satu proses & satu port
+  python script.py --script gerakan.txt
+  printf 'loop 10\nset 1 0\nwait 500ms\nset 1 180\nwait 500ms\nend\n' | python script.py --script -
+  
+  # Lewat daemon (python -m yahboom.daemon /dev/ttyUSB0): port tidak dibuka
+  # ulang, satu perintah = satu round trip socket, GUI/script lain bisa ikut
+  python script.py --daemon --pose 90,60,120,90,90,45
+  python script.py --daemon 127.0.0.1:9107 --reset
+  
   # Default mode tanpa argument (test servo 1)
   python script.py
 
@@ -92,6 +153,10 @@ Catatan:
   - Baudrate: 9600bps (fixed, tidak bisa diubah)
   - Di Windows gunakan: COM3, COM4, dll
   - Di Linux gunakan: /dev/ttyUSB0, /dev/ttyAMA0, dll
+  - --reset, --all-angle, --test-sweep dan --pose mengirim semua frame
+    dalam satu write() (16 servo = 96 byte = ~100ms @ 9600bps)
+  - Jeda antar frame dihitung dari baudrate (~1.04ms/byte); gunakan
+    --min-gap jika board butuh jeda tambahan (contoh: --min-gap 2)
         '''
     )
     
@@ -99,8 +164,9 @@ Catatan:
     parser.add_argument(
         '-p', '--port',
         type=str,
-        default='COM23',
-        help='Serial port (default: COM23). Windows: COM3, COM4. Linux: /dev/ttyUSB0'
+        default='auto',
+        help='Serial port. Windows: COM3, COM4. Linux: /dev/ttyUSB0. '
+             'Default: auto (cari board lewat identitas USB, auto:NAMA untuk beberapa board)'
     )
     
     # Servo control arguments
@@ -150,6 +216,91 @@ Catatan:
         help='Reset semua servo ke posisi center (90 derajat)'
     )
     
+    parser.add_argument(
+        '--pose',
+        type=str,
+        default=None,
+        help='Set servo 1..N sekaligus, contoh: --pose 90,60,120,90,90,45'
+    )
+    
+    parser.add_argument(
+        '--min-gap',
+        type=float,
+        default=0.0,
+        help='Jeda minimum antar frame di kabel dalam ms (default: 0, diukur sekali per board)'
+    )
+    
+    parser.add_argument(
+        '--record',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Rekam semua frame yang dikirim ke file .ybr (bisa digabung dengan mode lain)'
+    )
+    
+    parser.add_argument(
+        '--play',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Putar ulang rekaman .ybr dengan timing aslinya'
+    )
+    
+    parser.add_argument(
+        '--script',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Jalankan perintah set/setall/pose/wait/flush/loop dari file (- = stdin)'
+    )
+    
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=1.0,
+        help='Skala waktu untuk --play (default: 1.0, 2 = dua kali lebih cepat)'
+    )
+    
+    parser.add_argument(
+        '--metrics',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Simpan metrik link (format teks Prometheus) ke file saat selesai'
+    )
+    
+    parser.add_argument(
+        '--trace',
+        type=str,
+        default=None,
+        metavar='FILE',
+        help='Rekam trace write()/pacer/sleep dan simpan sebagai JSON Chrome/Perfetto'
+    )
+    
+    parser.add_argument(
+        '--save-port',
+        nargs='?',
+        const='default',
+        default=None,
+        metavar='NAME',
+        help='Catat --port (identitas USB) sebagai board NAME (default: default) untuk -p auto'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='ADDR',
+        help='Kirim lewat yahboom.daemon (path UNIX socket atau host:port, default: socket standar)'
+    )
+    
+    parser.add_argument(
+        '--one-by-one',
+        action='store_true',
+        help='Kirim servo satu per satu dengan delay (perilaku lama, tanpa batch)'
+    )
+    
     args = parser.parse_args()
     
     # Validasi input untuk 16 channel controller
@@ -165,46 +316,151 @@ Catatan:
         if args.all_angle < 0 or args.all_angle > 180:
             parser.error("All-angle harus antara 0-180 derajat")
     
+    if args.min_gap < 0:
+        parser.error("Min-gap tidak boleh negatif")
+    
+    if args.speed <= 0:
+        parser.error("Speed harus lebih besar dari 0")
+    
+    recording = None
+    if args.play is not None:
+        try:
+            recording = MotionRecorder.load(args.play)
+        except (OSError, ValueError, EOFError) as e:
+            parser.error(f"Rekaman tidak valid: {e}")
+    
+    pose = None
+    if args.pose is not None:
+        try:
+            pose = parse_pose(args.pose)
+        except ValueError as e:
+            parser.error(f"Pose tidak valid: {e}")
+    
+    if args.trace is not None:
+        trace.enable()
+    
+    # Mode client: daemon yang memegang port
+    if args.daemon is not None:
+        try:
+            driver = DaemonDriver(args.daemon or None)
+            print(f"OK Terhubung ke daemon {driver.address} (round trip {driver.ping() * 1000:.2f} ms)\n")
+        except OSError as e:
+            print(f"ERROR: Tidak bisa terhubung ke daemon: {e}")
+            print(f"  Jalankan dulu: python -m yahboom.daemon {args.port}")
+            return
+    
     # Configure serial port - Fixed 9600 8N1
-    try:
-        ser = serial.Serial(
-            port=args.port,
-            baudrate=9600,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=1
-        )
-        print(f"OK Terhubung ke {args.port} @ 9600bps 8N1")
-        print(f"  Protokol: $[A-P][000-180]#\n")
-    except serial.SerialException as e:
-        print(f"ERROR: Tidak bisa membuka port {args.port}")
-        print(f"  Detail: {e}")
-        print(f"\n  Tips:")
-        print(f"  - Cek port tersedia di Device Manager (Windows)")
-        print(f"  - Pastikan tidak ada program lain yang menggunakan port ini")
-        print(f"  - Coba port lain: COM3, COM4, COM5, dll")
-        return
+    else:
+        auto = args.port == 'auto' or args.port.startswith('auto:')
+        if auto:
+            t0 = time.perf_counter()
+            try:
+                args.port = discover.resolve(args.port)
+            except OSError as e:
+                print(f"ERROR: {e}")
+                print(f"  Berikan port manual: --port COM3 atau --port /dev/ttyUSB0")
+                print(f"  Daftar port: python -m yahboom.discover")
+                return
+            print(f"OK Board ditemukan di {args.port} ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+        try:
+            ser = serial.Serial(
+                port=args.port,
+                baudrate=9600,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=1
+            )
+            driver = ServoDriver(ser, Pacer(baudrate=9600, min_gap=args.min_gap / 1000.0))
+            if args.save_port is not None and not auto:
+                # Hanya atas permintaan: port manual bisa saja bukan board servo
+                if discover.remember(args.port, args.save_port):
+                    print(f"OK {args.port} dicatat sebagai board '{args.save_port}'")
+                else:
+                    print(f"PERINGATAN: identitas USB {args.port} tidak diketahui, tidak dicatat")
+            print(f"OK Terhubung ke {args.port} @ 9600bps 8N1")
+            print(f"  Protokol: $[A-P][000-180]#\n")
+        except serial.SerialException as e:
+            print(f"ERROR: Tidak bisa membuka port {args.port}")
+            print(f"  Detail: {e}")
+            print(f"\n  Tips:")
+            print(f"  - Cek port tersedia di Device Manager (Windows)")
+            print(f"  - Pastikan tidak ada program lain yang menggunakan port ini")
+            print(f"  - Coba port lain: COM3, COM4, COM5, dll")
+            return
+    
+    if args.record is not None:
+        driver.recorder = MotionRecorder()
+    if args.metrics is not None:
+        driver.metrics = DriverMetrics({"port": args.port if args.daemon is None else "daemon"})
     
     try:
+        # Mode 0: Play recording
+        if recording is not None:
+            print(f"=== PLAY {args.play}: {len(recording)} event, "
+                  f"{recording.duration() / args.speed:.1f} detik (speed {args.speed}x) ===")
+            report = replay(recording.events(), driver, speed=args.speed)
+            driver.flush()
+            error = report["error"]
+            print(f"\nOK Selesai: {report['batches']} batch dalam {report['duration_s']:.2f} detik "
+                  f"(rencana {report['planned_s']:.2f} detik)")
+            if error["n"]:
+                print(f"  Timing error: rata-rata {error['mean_ms']:.1f} ms, "
+                      f"p95 {error['p95_ms']:.1f} ms, max {error['max_ms']:.1f} ms")
+        
+        # Mode 0b: Script perintah (streaming, lewat thread penulis)
+        elif args.script is not None:
+            source = "stdin" if args.script == "-" else args.script
+            print(f"=== SCRIPT {source} ===")
+            writer = ServoWriter(driver)
+            try:
+                stats = run_script(args.script, writer,
+                                   flush=lambda: (writer.flush(), driver.flush()))
+                writer.flush()
+            finally:
+                writer.close()
+            driver.flush()
+            print(f"\nOK {stats['commands']} perintah ({stats['sends']} kirim, {stats['waits']} wait) "
+                  f"dalam {stats['duration_s']:.2f} detik")
+            if stats["late"]:
+                print(f"  {stats['late']} wait terlambat, maks {stats['max_late_ms']:.1f} ms")
+        
         # Mode 1: Reset all servos to center
-        if args.reset:
+        elif args.reset:
             print("=== RESET ALL SERVOS TO CENTER (90 derajat) ===")
-            for i in range(1, 17):
-                print(f"Servo {i} ('{chr(64+i)}') -> 90 derajat")
-                UARTServo(ser, i, 90)
-                time.sleep(0.1)
+            if args.one_by_one:
+                for i in range(1, 17):
+                    print(f"Servo {i} ('{chr(64+i)}') -> 90 derajat")
+                    UARTServo(driver, i, 90)
+                    time.sleep(0.1)
+            else:
+                UARTServoBatch(driver, {i: 90 for i in range(1, 17)})
             print("\nOK Reset selesai! Semua servo di posisi center (90 derajat)")
         
         # Mode 2: Set all servos to specific angle
         elif args.all_angle is not None:
             print(f"=== SET ALL SERVOS TO {args.all_angle} DERAJAT ===")
-            for i in range(1, 17):
-                print(f"Servo {i} ('{chr(64+i)}') -> {args.all_angle} derajat")
-                UARTServo(ser, i, args.all_angle)
-                time.sleep(0.1)
+            if args.one_by_one:
+                for i in range(1, 17):
+                    print(f"Servo {i} ('{chr(64+i)}') -> {args.all_angle} derajat")
+                    UARTServo(driver, i, args.all_angle)
+                    time.sleep(0.1)
+            else:
+                UARTServoBatch(driver, {i: args.all_angle for i in range(1, 17)})
             print(f"\nOK Semua servo di posisi {args.all_angle} derajat")
         
+        # Mode 2b: Set pose (servo 1..N) in one write
+        elif pose is not None:
+            print(f"=== SET POSE SERVO 1-{len(pose)} ===")
+            if args.one_by_one:
+                for i, angle in pose.items():
+                    print(f"Servo {i} ('{chr(64+i)}') -> {angle} derajat")
+                    UARTServo(driver, i, angle)
+                    time.sleep(0.1)
+            else:
+                UARTServoBatch(driver, pose)
+            print("\nOK Pose terkirim")
+        
         # Mode 3: Test sweep all servos
         elif args.test_sweep:
             print("=== TEST SWEEP ALL SERVOS ===")
@@ -212,9 +468,12 @@ Catatan:
             
             for angle in positions:
                 print(f"\n>>> Menggerakkan SEMUA servo ke {angle} derajat")
-                for i in range(1, 17):
-                    UARTServo(ser, i, angle)
-                    time.sleep(0.05)
+                if args.one_by_one:
+                    for i in range(1, 17):
+                        UARTServo(driver, i, angle)
+                        time.sleep(0.05)
+                else:
+                    UARTServoBatch(driver, {i: angle for i in range(1, 17)})
                 print(f"OK Semua servo di posisi {angle} derajat")
                 time.sleep(1.5)
             
@@ -225,7 +484,7 @@ Catatan:
             print("=== TEST ALL SERVOS (1-16) ===")
             for i in range(1, 17):
                 print(f"\nServo {i} ('{chr(64+i)}') -> 90 derajat")
-                UARTServo(ser, i, 90)
+                UARTServo(driver, i, 90)
                 time.sleep(0.3)
             print("\nOK Test semua servo selesai!")
         
@@ -236,11 +495,11 @@ Catatan:
             print(f"=== TEST MODE: Servo {servo} ('{servo_char}') ===\n")
             
             print(f"Menggerakkan servo {servo} ke posisi 0 derajat")
-            UARTServo(ser, servo, 0)
+            UARTServo(driver, servo, 0)
             time.sleep(2)
             
             print(f"\nMenggerakkan servo {servo} ke posisi 180 derajat")
-            UARTServo(ser, servo, 180)
+            UARTServo(driver, servo, 180)
             time.sleep(2)
             
             print("\nOK Test selesai!")
@@ -249,7 +508,7 @@ Catatan:
         elif args.servonum is not None and args.angle is not None:
             servo_char = chr(64 + args.servonum)
             print(f"Menggerakkan servo {args.servonum} ('{servo_char}') ke sudut {args.angle} derajat")
-            UARTServo(ser, args.servonum, args.angle)
+            UARTServo(driver, args.servonum, args.angle)
             print("OK Perintah terkirim")
         
         # Mode 7: Default test (backward compatibility)
@@ -257,11 +516,11 @@ Catatan:
             print("=== DEFAULT TEST MODE: Servo 1 ('A') ===\n")
             
             print("Menggerakkan servo 1 ke posisi 0 derajat")
-            UARTServo(ser, 1, 0)
+            UARTServo(driver, 1, 0)
             time.sleep(2)
             
             print("\nMenggerakkan servo 1 ke posisi 180 derajat")
-            UARTServo(ser, 1, 180)
+            UARTServo(driver, 1, 180)
             time.sleep(2)
             
             print("\nOK Test selesai!")
@@ -275,8 +534,28 @@ Catatan:
     except Exception as e:
         print(f"\nERROR: {e}")
     finally:
-        ser.close()
-        print("\nSerial port ditutup")
+        try:
+            # Seperti UARTServoBatch: frame terakhir (mis. mode --servonum/--angle)
+            # harus keluar dari port sebelum ditutup
+            driver.flush()
+        except OSError as e:
+            print(f"\nERROR: {e}")
+        if driver.recorder is not None:
+            count = driver.recorder.save(args.record)
+            print(f"\nRekaman {count} event disimpan ke {args.record}")
+        if driver.metrics is not None:
+            m = driver.metrics
+            m.write_prometheus(args.metrics)
+            latency = m.set_to_wire_seconds.quantile(0.95)
+            print(f"\nMetrik disimpan ke {args.metrics}: {m.frames_sent} frame, {m.bytes_sent} byte, "
+                  f"{m.frames_skipped} dilewati shadow, {m.write_errors} error")
+            if latency is not None:
+                print(f"  set() -> kabel p95 <= {latency * 1000:.1f} ms")
+        if args.trace is not None:
+            count = trace.save(args.trace)
+            print(f"\nTrace {count} event disimpan ke {args.trace}")
+        driver.close()
+        print("\nSerial port ditutup" if args.daemon is None else "\nKoneksi daemon ditutup")
 
 if __name__ == "__main__":
     main()
@@ -5,13 +5,46 @@ Berjalan tanpa koneksi serial hardware untuk testing dan demonstrasi
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import time
 import threading
-import json
 import math
+import os
+from collections import ChainMap
+
+from yahboom import ServoDriver
+from yahboom.writer import ServoWriter
+from yahboom.trajectory import PROFILES, plan, play
+from yahboom.canvas import CanvasScene
+from yahboom.patterns import BUILTIN_PATTERNS, PatternStore
+from yahboom.choreo import perform
+from yahboom import trace
+
+# Frekuensi kontrol animasi ARM: 6 frame = 36 byte = ~37ms @ 9600bps
+ANIM_RATE = 25.0
+# Jarak minimum antar redraw ARM view (~60 fps)
+ARM_REDRAW_MS = 16
+# Frekuensi loop GUI: target slider dikirim & label diperbarui sekali per tick
+GUI_RATE = 50.0
+# Koreografi demo (NDJSON), dibaca streaming baris per baris
+DEMO_CHOREO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "demo_sequence.ndjson")
+
+class DemoPort:
+    """Pengganti port serial di demo mode: frame hanya dicetak ke console"""
+    
+    def write(self, data):
+        data = bytes(data)
+        # Satu write() bisa berisi beberapa frame (batch)
+        for i in range(0, len(data), 6):
+            cmd = data[i:i + 6]
+            servo_num = cmd[1] - 64
+            angle = int(cmd[2:5])
+            print(f"📡 DEMO: Servo {servo_num} ({chr(cmd[1])}) -> {angle}° | Command: {cmd.decode()}")
+        return len(data)
+        
+    def close(self):
+        pass
 
 class ServoControllerGUI:
-    def __init__(self, root):
+    def __init__(self, root, update_rate=GUI_RATE):
         self.root = root
         self.root.title("16 Channel Servo Controller + ARM Robot 6DOF [DEMO MODE]")
         self.root.geometry("1200x800")
@@ -19,22 +52,26 @@ class ServoControllerGUI:
         # Demo mode - no serial
         self.ser = None
         self.connected = True  # Always "connected" in demo mode
+        self.writer = ServoWriter(ServoDriver(DemoPort()))
         
         # Servo states (1-16)
         self.servo_angles = {i: 90 for i in range(1, 17)}
         
         # ARM robot patterns
-        self.patterns = {
-            "Home Position": [90, 90, 90, 90, 90, 90],
-            "Rest Position": [90, 45, 45, 90, 90, 90],
-            "Reach Forward": [90, 60, 120, 90, 90, 45],
-            "Reach Up": [90, 135, 45, 90, 90, 45],
-            "Pick Position": [90, 60, 90, 120, 90, 90],
-        }
-        self.custom_patterns = {}
+        self.patterns = dict(BUILTIN_PATTERNS)
+        # Demo: library di memori saja, diisi dari example_patterns.json
+        self.custom_patterns = PatternStore()
         
         # Animation state
         self.animating = False
+        # Validator trajectory (numpy), dibuat saat pertama dipakai
+        self.validator = None
+        
+        # Slider yang berubah sejak tick terakhir: {servo: dict kontrol asal}
+        self._changed = {}
+        self._tick = None
+        self._tick_at = 0
+        self.update_ms = max(1, int(round(1000.0 / update_rate)))
         
         # Demo mode banner
         banner = ttk.Frame(self.root)
@@ -50,8 +87,7 @@ class ServoControllerGUI:
     def load_example_patterns(self):
         """Load example patterns from file if available"""
         try:
-            with open('example_patterns.json', 'r') as f:
-                self.custom_patterns = json.load(f)
+            self.custom_patterns.import_json('example_patterns.json')
             self.refresh_pattern_list()
             print("✓ Example patterns loaded")
         except FileNotFoundError:
@@ -249,11 +285,17 @@ class ServoControllerGUI:
         anim_frame = ttk.LabelFrame(pattern_frame, text="Animation", padding=5)
         anim_frame.pack(fill="x", pady=5)
         
-        ttk.Label(anim_frame, text="Speed (ms):").pack(side="left", padx=5)
-        self.anim_speed = ttk.Spinbox(anim_frame, from_=10, to=1000, width=8)
-        self.anim_speed.set(50)
+        # Kecepatan puncak joint; durasi gerakan dihitung dari jarak terjauh
+        ttk.Label(anim_frame, text="Max speed (°/s):").pack(side="left", padx=5)
+        self.anim_speed = ttk.Spinbox(anim_frame, from_=10, to=360, width=6, increment=10)
+        self.anim_speed.set(90)
         self.anim_speed.pack(side="left", padx=5)
         
+        self.anim_profile = ttk.Combobox(anim_frame, width=9, state="readonly",
+                                         values=list(PROFILES))
+        self.anim_profile.set("minjerk")
+        self.anim_profile.pack(side="left", padx=5)
+        
         self.animate_btn = ttk.Button(anim_frame, text="Animate to Pattern", 
                                      command=self.animate_to_pattern)
         self.animate_btn.pack(side="left", padx=5)
@@ -278,6 +320,10 @@ class ServoControllerGUI:
         
         self.arm_canvas = tk.Canvas(right_panel, width=400, height=600, bg="white")
         self.arm_canvas.pack()
+        # Item dibuat sekali lalu hanya dipindah (coords/itemconfig)
+        self.arm_scene = CanvasScene(self.arm_canvas)
+        self._arm_redraw = None
+        self._arm_redraw_at = 0
         
         self.draw_arm()
         
@@ -363,27 +409,57 @@ class ServoControllerGUI:
             'delay': delay_spinbox  # Store delay control for safety
         }
         
+    @trace.traced("gui.slider", "gui")
     def on_slider_change(self, servo_num, value):
+        # Hanya catat target; label & frame diurus _gui_tick
         angle = int(float(value))
+        if angle == self.servo_angles[servo_num]:
+            return  # Tidak berubah, atau slider hanya mengikuti _show_angles
         self.servo_angles[servo_num] = angle
-        self.servo_controls[servo_num]['angle_var'].set(f"{angle}°")
-        self.send_servo_command(servo_num, angle)
+        self._mark_changed(servo_num, self.servo_controls)
         
+    @trace.traced("gui.slider", "gui")
     def on_arm_slider_change(self, servo_num, value):
         angle = int(float(value))
+        if angle == self.servo_angles[servo_num]:
+            return
         self.servo_angles[servo_num] = angle
-        self.arm_controls[servo_num]['angle_var'].set(f"{angle}°")
+        self._mark_changed(servo_num, self.arm_controls)
         
-        # Get delay from ARM control for safety
-        try:
-            delay = int(self.arm_controls[servo_num]['delay'].get())
-            if delay > 0:
-                time.sleep(delay / 1000.0)
-        except:
-            time.sleep(0.05)  # Default fallback
+    def _mark_changed(self, servo_num, controls):
+        self._changed[servo_num] = controls
+        if self._tick is None:
+            self._tick_at = trace.now()
+            self._tick = self.root.after(self.update_ms, self._gui_tick)
             
-        self.send_servo_command(servo_num, angle)
-        self.draw_arm()
+    def _send_changed(self, servo_num, controls):
+        if controls is self.arm_controls:
+            # Delay ARM dipakai sebagai jarak minimum antar frame di thread penulis
+            delay = self.get_delay(controls[servo_num]['delay'], 50)
+            self.send_servo_command(servo_num, self.servo_angles[servo_num], delay)
+        else:
+            self.send_servo_command(servo_num, self.servo_angles[servo_num])
+            
+    @trace.traced("gui.tick", "gui")
+    def _gui_tick(self):
+        """Satu tick loop GUI: perbarui label, kirim channel yang berubah, redraw ARM"""
+        self._tick = None
+        if trace.tracer is not None:
+            # Keterlambatan root.after() dibanding jadwal = antrian event Tk
+            trace.counter("tk.after lag gui_tick", {"ms": (trace.now() - self._tick_at) / 1e6 - self.update_ms})
+        changed, self._changed = self._changed, {}
+        arm_changed = False
+        for servo_num, controls in changed.items():
+            controls[servo_num]['angle_var'].set(f"{self.servo_angles[servo_num]}°")
+            arm_changed = arm_changed or controls is self.arm_controls
+            
+        # Semua channel yang berubah masuk ke satu write() thread penulis
+        with self.writer.batch():
+            for servo_num, controls in changed.items():
+                self._send_changed(servo_num, controls)
+                
+        if arm_changed:
+            self.draw_arm()
         
     def adjust_servo(self, servo_num, delta):
         current = self.servo_angles[servo_num]
@@ -414,21 +490,28 @@ class ServoControllerGUI:
         except ValueError:
             messagebox.showwarning("Invalid Input", "Please enter a valid number")
             
-    def send_servo_command(self, servo_num, angle):
-        # Demo mode - just print
-        servo_char = chr(64 + servo_num)
-        print(f"📡 DEMO: Servo {servo_num} ({servo_char}) -> {angle}° | Command: ${servo_char}{angle:03d}#")
+    def get_delay(self, spinbox, default):
+        """Baca delay (ms) dari spinbox, pakai default jika isinya tidak valid"""
+        try:
+            return int(spinbox.get())
+        except (ValueError, tk.TclError):
+            return default
+            
+    def send_servo_command(self, servo_num, angle, delay=None):
+        # Demo mode - DemoPort hanya print frame yang dikirim thread penulis
         
         # Apply delay if in servo_controls
-        if servo_num in self.servo_controls:
-            try:
-                delay = int(self.servo_controls[servo_num]['speed'].get())
-                if delay > 0:
-                    time.sleep(delay / 1000.0)
-            except:
-                pass
+        if delay is None:
+            if servo_num in self.servo_controls:
+                delay = self.get_delay(self.servo_controls[servo_num]['speed'], 0)
+            else:
+                delay = 0
+                
+        self.writer.set_interval(servo_num, delay / 1000.0)
+        self.writer.post(servo_num, angle)
             
     def reset_all_servos(self):
+        # Tick GUI berikutnya mengirim ke-16 frame dalam satu write()
         for i in range(1, 17):
             self.servo_controls[i]['slider'].set(90)
         print("🔄 DEMO: All servos reset to 90°")
@@ -445,9 +528,10 @@ class ServoControllerGUI:
         for name in self.patterns.keys():
             self.pattern_listbox.insert(tk.END, f"[Built-in] {name}")
             
-        # Add custom patterns
-        for name in self.custom_patterns.keys():
-            self.pattern_listbox.insert(tk.END, f"[Custom] {name}")
+        # Add custom patterns (hanya nama; sudut dibaca saat dipakai)
+        names = [f"[Custom] {name}" for name in self.custom_patterns.keys()]
+        if names:
+            self.pattern_listbox.insert(tk.END, *names)
             
     def apply_pattern(self):
         selection = self.pattern_listbox.curselection()
@@ -495,34 +579,82 @@ class ServoControllerGUI:
             
         print(f"🎬 DEMO: Animating to pattern '{pattern_name}'...")
             
+        vmax, profile = self.get_anim_limits()
+        if not self.check_motion(target_angles, vmax, profile):
+            return
+            
         # Start animation in separate thread
         self.animating = True
         self.animate_btn.config(state="disabled")
         
-        thread = threading.Thread(target=self._animate_thread, args=(target_angles,))
+        thread = threading.Thread(target=self._animate_thread,
+                                  args=(target_angles, vmax, profile))
         thread.daemon = True
         thread.start()
         
-    def _animate_thread(self, target_angles):
-        try:
-            speed = int(self.anim_speed.get())
-            current_angles = [self.servo_angles[i] for i in range(1, 7)]
+    def check_motion(self, target_angles, vmax, profile):
+        """
+        Validasi gerakan ARM (batas joint, kecepatan, tabrakan) sebelum
+        animasi. Return True jika aman atau user tetap ingin melanjutkan.
+        """
+        if self.validator is None:
+            try:
+                from yahboom.validate import TrajectoryValidator
+                self.validator = TrajectoryValidator()
+            except ImportError:
+                # Tanpa numpy: validasi dilewati, perilaku lama
+                self.validator = False
+        if not self.validator:
+            return True
             
-            # Calculate steps (20 steps for smooth animation)
-            steps = 20
+        current = [self.servo_angles[i] for i in range(1, 7)]
+        traj = plan(current, target_angles, vmax=vmax, profile=profile, rate=ANIM_RATE)
+        violation = self.validator.check_trajectory(traj)
+        if violation is None:
+            return True
+        return messagebox.askyesno(
+            "Unsafe Motion",
+            f"Motion check failed at t={violation.time:.2f}s (sample {violation.index}):\n"
+            f"{violation.kind} - {violation.detail} "
+            f"({violation.value:.1f}, limit {violation.limit:.1f})\n\nAnimate anyway?")
             
-            for step in range(steps + 1):
-                for i in range(6):
-                    servo_num = i + 1
-                    start = current_angles[i]
-                    end = target_angles[i]
-                    angle = int(start + (end - start) * step / steps)
-                    
-                    # Update UI from main thread
-                    self.root.after(0, lambda s=servo_num, a=angle: 
-                                   self.arm_controls[s]['slider'].set(a))
-                    
-                time.sleep(speed / 1000.0)
+    def get_anim_limits(self):
+        """Baca max speed (°/s) dan profil animasi dari UI"""
+        try:
+            vmax = float(self.anim_speed.get())
+        except ValueError:
+            vmax = 90.0
+        return max(1.0, vmax), self.anim_profile.get() or "minjerk"
+        
+    def _send_pose(self, targets):
+        """
+        Kirim sampel yang timing-nya sudah diatur pemanggil (trajectory,
+        koreografi) langsung ke thread penulis, tanpa lewat slider, tick GUI
+        atau delay per joint; slider hanya menampilkan. Aman dari thread lain.
+        """
+        self.writer.post_many(targets, immediate=True)
+        self.root.after(0, self._show_angles, targets)
+        
+    def _show_angles(self, targets):
+        """Tampilkan sudut yang sudah dikirim (slider, label, ARM view) tanpa mengirim ulang"""
+        for servo_num, angle in targets:
+            # servo_angles diisi dulu: callback slider melihat sudut sama dan tidak mengirim
+            self.servo_angles[servo_num] = angle
+            self._changed.pop(servo_num, None)
+            self.arm_controls[servo_num]['slider'].set(angle)
+            self.arm_controls[servo_num]['angle_var'].set(f"{angle}°")
+        self.draw_arm()
+            
+    def _move_arm(self, start, target_angles, vmax, profile):
+        # Sampel dikirim pada deadline absolut; sampel yang sudah basi
+        # dilewati sehingga durasi gerakan tetap sesuai rencana
+        traj = plan(start, target_angles, vmax=vmax, profile=profile, rate=ANIM_RATE)
+        play(traj, lambda pose: self._send_pose(list(zip(range(1, len(pose) + 1), pose))))
+        
+    def _animate_thread(self, target_angles, vmax, profile):
+        try:
+            current_angles = [self.servo_angles[i] for i in range(1, 7)]
+            self._move_arm(current_angles, target_angles, vmax, profile)
                 
             print("✓ DEMO: Animation complete!")
                 
@@ -536,53 +668,24 @@ class ServoControllerGUI:
             messagebox.showinfo("Busy", "Animation already in progress")
             return
             
-        print("\n🎬 Starting demo sequence...")
-        
-        sequence = [
-            "Home Position",
-            "Reach Forward",
-            "Pick Position",
-            "Reach Up",
-            "Rest Position",
-            "Home Position"
-        ]
+        print(f"\n🎬 Starting demo sequence ({os.path.basename(DEMO_CHOREO)})...")
         
         self.animating = True
         self.animate_btn.config(state="disabled")
         
+        _, profile = self.get_anim_limits()
+        
         def run_sequence():
             try:
-                speed = int(self.anim_speed.get())
-                
-                for pattern_name in sequence:
-                    print(f"  → Moving to: {pattern_name}")
-                    
-                    if pattern_name in self.patterns:
-                        target_angles = self.patterns[pattern_name]
-                    elif pattern_name in self.custom_patterns:
-                        target_angles = self.custom_patterns[pattern_name]
-                    else:
-                        continue
-                        
-                    current_angles = [self.servo_angles[i] for i in range(1, 7)]
-                    steps = 20
-                    
-                    for step in range(steps + 1):
-                        for i in range(6):
-                            servo_num = i + 1
-                            start = current_angles[i]
-                            end = target_angles[i]
-                            angle = int(start + (end - start) * step / steps)
-                            
-                            self.root.after(0, lambda s=servo_num, a=angle: 
-                                           self.arm_controls[s]['slider'].set(a))
-                        
-                        time.sleep(speed / 1000.0)
-                    
-                    # Hold position
-                    time.sleep(1.0)
-                
+                # Keyframe tanpa "ease" memakai profil yang dipilih di UI;
+                # gerakan mulai dari pose ARM saat ini
+                start = {i: self.servo_angles[i] for i in range(1, 7)}
+                patterns = ChainMap(self.patterns, self.custom_patterns)
+                perform(DEMO_CHOREO, self._send_pose,
+                        patterns=patterns, ease=profile, rate=ANIM_RATE, start=start)
                 print("✓ Demo sequence complete!\n")
+            except (OSError, ValueError) as e:
+                print(f"✗ Demo sequence error: {e}")
                     
             finally:
                 self.animating = False
@@ -657,8 +760,7 @@ class ServoControllerGUI:
         
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    json.dump(self.custom_patterns, f, indent=2)
+                self.custom_patterns.export_json(filename)
                 print(f"💾 DEMO: Patterns saved to {filename}")
                 messagebox.showinfo("Saved", f"Patterns saved to {filename}")
             except Exception as e:
@@ -671,18 +773,28 @@ class ServoControllerGUI:
         
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    loaded = json.load(f)
-                self.custom_patterns.update(loaded)
+                # Satu transaksi; pattern dengan nama sama ditimpa
+                loaded = self.custom_patterns.import_json(filename)
                 self.refresh_pattern_list()
-                print(f"📂 DEMO: Loaded {len(loaded)} patterns from {filename}")
-                messagebox.showinfo("Loaded", f"Loaded {len(loaded)} patterns")
+                print(f"📂 DEMO: Loaded {loaded} patterns from {filename}")
+                messagebox.showinfo("Loaded", f"Loaded {loaded} patterns")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load: {e}")
                 
     def draw_arm(self):
+        """Tandai ARM view kotor; digambar ulang paling banyak sekali per frame layar"""
+        if self._arm_redraw is None:
+            self._arm_redraw_at = trace.now()
+            self._arm_redraw = self.root.after(ARM_REDRAW_MS, self._render_arm)
+            
+    @trace.traced("gui.render_arm", "gui")
+    def _render_arm(self):
         """Draw simplified 2D representation of 6DOF robot arm"""
-        self.arm_canvas.delete("all")
+        self._arm_redraw = None
+        if trace.tracer is not None:
+            trace.counter("tk.after lag render_arm", {"ms": (trace.now() - self._arm_redraw_at) / 1e6 - ARM_REDRAW_MS})
+        scene = self.arm_scene
+        scene.begin()
         
         # Get current angles for servos 1-6
         base = self.servo_angles[1]
@@ -725,93 +837,93 @@ class ServoControllerGUI:
         end_y = wrist_y - wrist * math.sin(wrist_angle)
         
         # Draw ground
-        self.arm_canvas.create_line(0, cy + 20, 400, cy + 20, fill="gray", width=3)
-        self.arm_canvas.create_rectangle(0, cy + 20, 400, 600, fill="#f0f0f0", outline="")
+        scene.create_line(0, cy + 20, 400, cy + 20, fill="gray", width=3)
+        scene.create_rectangle(0, cy + 20, 400, 600, fill="#f0f0f0", outline="")
         
         # Draw shadow (simple)
         shadow_offset = 5
-        self.arm_canvas.create_line(base_x + shadow_offset, base_y + shadow_offset, 
-                                    shoulder_x + shadow_offset, shoulder_y + shadow_offset, 
-                                    fill="lightgray", width=6)
-        self.arm_canvas.create_line(shoulder_x + shadow_offset, shoulder_y + shadow_offset, 
-                                    elbow_x + shadow_offset, elbow_y + shadow_offset, 
-                                    fill="lightgray", width=6)
+        scene.create_line(base_x + shadow_offset, base_y + shadow_offset, 
+                          shoulder_x + shadow_offset, shoulder_y + shadow_offset, 
+                          fill="lightgray", width=6)
+        scene.create_line(shoulder_x + shadow_offset, shoulder_y + shadow_offset, 
+                          elbow_x + shadow_offset, elbow_y + shadow_offset, 
+                          fill="lightgray", width=6)
         
         # Draw base
-        self.arm_canvas.create_oval(base_x - 30, base_y - 10, base_x + 30, base_y + 30, 
-                                    fill="lightgray", outline="black", width=2)
-        self.arm_canvas.create_arc(base_x - 25, base_y - 5, base_x + 25, base_y + 25,
-                                   start=0, extent=180, fill="darkgray", outline="")
-        self.arm_canvas.create_text(base_x, base_y + 50, text=f"Base: {base}°", 
-                                    font=("Arial", 9, "bold"))
+        scene.create_oval(base_x - 30, base_y - 10, base_x + 30, base_y + 30, 
+                          fill="lightgray", outline="black", width=2)
+        scene.create_arc(base_x - 25, base_y - 5, base_x + 25, base_y + 25,
+                         start=0, extent=180, fill="darkgray", outline="")
+        scene.create_text(base_x, base_y + 50, text=f"Base: {base}°", 
+                          font=("Arial", 9, "bold"))
         
         # Draw links with gradient effect
         # Base to shoulder
-        self.arm_canvas.create_line(base_x, base_y, shoulder_x, shoulder_y, 
-                                    fill="navy", width=10)
-        self.arm_canvas.create_line(base_x, base_y, shoulder_x, shoulder_y, 
-                                    fill="blue", width=8)
+        scene.create_line(base_x, base_y, shoulder_x, shoulder_y, 
+                          fill="navy", width=10)
+        scene.create_line(base_x, base_y, shoulder_x, shoulder_y, 
+                          fill="blue", width=8)
         
         # Upper arm
-        self.arm_canvas.create_line(shoulder_x, shoulder_y, elbow_x, elbow_y, 
-                                    fill="darkgreen", width=10)
-        self.arm_canvas.create_line(shoulder_x, shoulder_y, elbow_x, elbow_y, 
-                                    fill="green", width=8)
+        scene.create_line(shoulder_x, shoulder_y, elbow_x, elbow_y, 
+                          fill="darkgreen", width=10)
+        scene.create_line(shoulder_x, shoulder_y, elbow_x, elbow_y, 
+                          fill="green", width=8)
         
         # Forearm
-        self.arm_canvas.create_line(elbow_x, elbow_y, wrist_x, wrist_y, 
-                                    fill="darkorange", width=10)
-        self.arm_canvas.create_line(elbow_x, elbow_y, wrist_x, wrist_y, 
-                                    fill="orange", width=8)
+        scene.create_line(elbow_x, elbow_y, wrist_x, wrist_y, 
+                          fill="darkorange", width=10)
+        scene.create_line(elbow_x, elbow_y, wrist_x, wrist_y, 
+                          fill="orange", width=8)
         
         # Wrist to end effector
-        self.arm_canvas.create_line(wrist_x, wrist_y, end_x, end_y, 
-                                    fill="darkred", width=8)
-        self.arm_canvas.create_line(wrist_x, wrist_y, end_x, end_y, 
-                                    fill="red", width=6)
+        scene.create_line(wrist_x, wrist_y, end_x, end_y, 
+                          fill="darkred", width=8)
+        scene.create_line(wrist_x, wrist_y, end_x, end_y, 
+                          fill="red", width=6)
         
         # Draw joints with 3D effect
         joint_radius = 10
         
         # Shoulder
-        self.arm_canvas.create_oval(shoulder_x - joint_radius, shoulder_y - joint_radius,
-                                    shoulder_x + joint_radius, shoulder_y + joint_radius,
-                                    fill="navy", outline="black", width=2)
-        self.arm_canvas.create_oval(shoulder_x - joint_radius + 2, shoulder_y - joint_radius + 2,
-                                    shoulder_x + joint_radius - 2, shoulder_y + joint_radius - 2,
-                                    fill="darkblue", outline="")
+        scene.create_oval(shoulder_x - joint_radius, shoulder_y - joint_radius,
+                          shoulder_x + joint_radius, shoulder_y + joint_radius,
+                          fill="navy", outline="black", width=2)
+        scene.create_oval(shoulder_x - joint_radius + 2, shoulder_y - joint_radius + 2,
+                          shoulder_x + joint_radius - 2, shoulder_y + joint_radius - 2,
+                          fill="darkblue", outline="")
         
         # Elbow
-        self.arm_canvas.create_oval(elbow_x - joint_radius, elbow_y - joint_radius,
-                                    elbow_x + joint_radius, elbow_y + joint_radius,
-                                    fill="darkgreen", outline="black", width=2)
-        self.arm_canvas.create_oval(elbow_x - joint_radius + 2, elbow_y - joint_radius + 2,
-                                    elbow_x + joint_radius - 2, elbow_y + joint_radius - 2,
-                                    fill="green", outline="")
+        scene.create_oval(elbow_x - joint_radius, elbow_y - joint_radius,
+                          elbow_x + joint_radius, elbow_y + joint_radius,
+                          fill="darkgreen", outline="black", width=2)
+        scene.create_oval(elbow_x - joint_radius + 2, elbow_y - joint_radius + 2,
+                          elbow_x + joint_radius - 2, elbow_y + joint_radius - 2,
+                          fill="green", outline="")
         
         # Wrist
-        self.arm_canvas.create_oval(wrist_x - joint_radius, wrist_y - joint_radius,
-                                    wrist_x + joint_radius, wrist_y + joint_radius,
-                                    fill="darkorange", outline="black", width=2)
-        self.arm_canvas.create_oval(wrist_x - joint_radius + 2, wrist_y - joint_radius + 2,
-                                    wrist_x + joint_radius - 2, wrist_y + joint_radius - 2,
-                                    fill="orange", outline="")
+        scene.create_oval(wrist_x - joint_radius, wrist_y - joint_radius,
+                          wrist_x + joint_radius, wrist_y + joint_radius,
+                          fill="darkorange", outline="black", width=2)
+        scene.create_oval(wrist_x - joint_radius + 2, wrist_y - joint_radius + 2,
+                          wrist_x + joint_radius - 2, wrist_y + joint_radius - 2,
+                          fill="orange", outline="")
         
         # Draw gripper with more detail
         gripper_open = (180 - gripper) / 180.0 * 20
         
         # Gripper fingers
-        self.arm_canvas.create_rectangle(end_x - gripper_open - 3, end_y - 15,
-                                        end_x - gripper_open + 3, end_y + 15,
-                                        fill="purple", outline="black", width=2)
-        self.arm_canvas.create_rectangle(end_x + gripper_open - 3, end_y - 15,
-                                        end_x + gripper_open + 3, end_y + 15,
-                                        fill="purple", outline="black", width=2)
+        scene.create_rectangle(end_x - gripper_open - 3, end_y - 15,
+                              end_x - gripper_open + 3, end_y + 15,
+                              fill="purple", outline="black", width=2)
+        scene.create_rectangle(end_x + gripper_open - 3, end_y - 15,
+                              end_x + gripper_open + 3, end_y + 15,
+                              fill="purple", outline="black", width=2)
         
         # Gripper base
-        self.arm_canvas.create_oval(end_x - 8, end_y - 8,
-                                    end_x + 8, end_y + 8,
-                                    fill="darkviolet", outline="black", width=2)
+        scene.create_oval(end_x - 8, end_y - 8,
+                          end_x + 8, end_y + 8,
+                          fill="darkviolet", outline="black", width=2)
         
         # Labels with background
         labels = [
@@ -823,24 +935,32 @@ class ServoControllerGUI:
         
         for x, y, text in labels:
             # Background
-            self.arm_canvas.create_rectangle(x - 25, y - 12, x + 25, y + 12,
-                                            fill="lightyellow", outline="black")
+            scene.create_rectangle(x - 25, y - 12, x + 25, y + 12,
+                                  fill="lightyellow", outline="black")
             # Text
-            self.arm_canvas.create_text(x, y, text=text, font=("Arial", 8, "bold"))
+            scene.create_text(x, y, text=text, font=("Arial", 8, "bold"))
         
         # Info text with background
-        self.arm_canvas.create_rectangle(0, 0, 400, 70, fill="lightblue", outline="")
-        self.arm_canvas.create_text(200, 20, 
-                                    text="6DOF Robot ARM Visualization", 
-                                    font=("Arial", 14, "bold"))
-        self.arm_canvas.create_text(200, 40, 
-                                    text="Side View - 2D Projection", 
-                                    font=("Arial", 10))
-        self.arm_canvas.create_text(200, 55, 
-                                    text="🎮 DEMO MODE", 
-                                    font=("Arial", 9), fill="blue")
+        scene.create_rectangle(0, 0, 400, 70, fill="lightblue", outline="")
+        scene.create_text(200, 20, 
+                          text="6DOF Robot ARM Visualization", 
+                          font=("Arial", 14, "bold"))
+        scene.create_text(200, 40, 
+                          text="Side View - 2D Projection", 
+                          font=("Arial", 10))
+        scene.create_text(200, 55, 
+                          text="🎮 DEMO MODE", 
+                          font=("Arial", 9), fill="blue")
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Servo Controller GUI (demo tanpa hardware)')
+    parser.add_argument('--trace', default=None, metavar='FILE',
+                        help='Rekam trace (JSON Chrome/Perfetto) dan simpan ke FILE saat GUI ditutup')
+    args = parser.parse_args()
+    if args.trace is not None:
+        trace.enable()
+        
     root = tk.Tk()
     app = ServoControllerGUI(root)
     
@@ -854,6 +974,10 @@ def main():
     print("="*60 + "\n")
     
     root.mainloop()
+    
+    if args.trace is not None:
+        count = trace.save(args.trace)
+        print(f"Trace {count} event disimpan ke {args.trace} (buka di https://ui.perfetto.dev)")
 
 if __name__ == "__main__":
     main()
@@ -1,39 +1,100 @@
 # -*- coding:utf-8 -*-
+import time
+# Titik nol pengukuran waktu startup (sampai window pertama tampil)
+_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import serial
-import serial.tools.list_ports
-import binascii
-import time
 import threading
-import json
 import math
+import os
+import sqlite3
+
+from yahboom import ServoDriver
+from yahboom.writer import ServoWriter
+from yahboom.trajectory import PROFILES, plan, play
+from yahboom.canvas import CanvasScene
+from yahboom.patterns import BUILTIN_PATTERNS, PatternStore
+from yahboom.pacing import Pacer
+from yahboom.recorder import MotionRecorder, replay
+from yahboom.metrics import DriverMetrics
+from yahboom import trace
+from yahboom import discover
+
+# Frekuensi kontrol animasi ARM: 6 frame = 36 byte = ~37ms @ 9600bps
+ANIM_RATE = 25.0
+# Jarak minimum antar redraw ARM view (~60 fps)
+ARM_REDRAW_MS = 16
+# Frekuensi loop GUI: target slider dikirim & label diperbarui sekali per tick
+GUI_RATE = 50.0
+# Interval refresh panel metrik link (ms)
+METRICS_MS = 500
+# Nama entri cache port (yahboom.discover) milik GUI; pilihan manual di GUI
+# tidak menimpa board "default" yang dipakai -p auto
+GUI_BOARD = "gui"
+# Library pattern custom (SQLite), disimpan per pattern, bukan seluruh dict
+PATTERN_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns.db")
 
 class ServoControllerGUI:
-    def __init__(self, root):
+    def __init__(self, root, update_rate=GUI_RATE):
         self.root = root
         self.root.title("16 Channel Servo Controller + ARM Robot 6DOF")
         self.root.geometry("1200x800")
         
         # Serial connection
         self.ser = None
+        self.driver = None
+        self.writer = None
         self.connected = False
         
         # Servo states (1-16)
         self.servo_angles = {i: 90 for i in range(1, 17)}
         
         # ARM robot patterns
-        self.patterns = {
-            "Home Position": [90, 90, 90, 90, 90, 90],
-            "Rest Position": [90, 45, 45, 90, 90, 90],
-            "Reach Forward": [90, 60, 120, 90, 90, 45],
-            "Reach Up": [90, 135, 45, 90, 90, 45],
-            "Pick Position": [90, 60, 90, 120, 90, 90],
-        }
-        self.custom_patterns = {}
+        self.patterns = dict(BUILTIN_PATTERNS)
+        try:
+            self.custom_patterns = PatternStore(PATTERN_DB)
+        except sqlite3.Error as e:
+            print(f"Pattern library {PATTERN_DB} tidak bisa dibuka ({e}), pakai memori saja")
+            self.custom_patterns = PatternStore()
         
         # Animation state
         self.animating = False
+        # Validator trajectory (numpy), dibuat saat pertama dipakai
+        self.validator = None
+        
+        # Rekaman semua frame yang dikirim (ring buffer, memori tetap)
+        self.recorder = MotionRecorder()
+        self.playing = False
+        
+        # Metrik driver/writer koneksi terakhir (tetap bisa diekspor setelah disconnect)
+        self.metrics = None
+        self._metrics_tick = None
+        self._metrics_prev = None
+        
+        # IK solver (numpy + scipy) dibuat saat pertama dipakai
+        self.ik_solver = None
+        
+        # Slider yang berubah sejak tick terakhir: {servo: dict kontrol asal}
+        self._changed = {}
+        self._tick = None
+        self._tick_at = 0
+        self.update_ms = max(1, int(round(1000.0 / update_rate)))
+        
+        # Kontrol tab diisi saat tab pertama kali dibuka (lihat _build_tab)
+        self.servo_controls = {}
+        self.arm_controls = {}
+        self.arm_scene = None
+        self._arm_redraw = None
+        self._arm_redraw_at = 0
+        
+        # Scan port berjalan di thread terpisah (comports() bisa makan detik)
+        self._scanning = False
+        # Identitas USB per device dari scan terakhir (untuk cache discover)
+        self._port_ids = {}
+        # Waktu startup sampai window pertama tampil (ms), diisi _on_map
+        self.startup_ms = None
+        self.root.bind("<Map>", self._on_map, add="+")
         
         self.setup_ui()
         self.refresh_ports()
@@ -44,10 +105,12 @@ class ServoControllerGUI:
         conn_frame.pack(fill="x", padx=10, pady=5)
         
         ttk.Label(conn_frame, text="Port:").grid(row=0, column=0, padx=5)
-        self.port_combo = ttk.Combobox(conn_frame, width=15, state="readonly")
+        # Bisa diketik juga, mis. /dev/pts/N dari simulator (python -m yahboom.sim)
+        self.port_combo = ttk.Combobox(conn_frame, width=15)
         self.port_combo.grid(row=0, column=1, padx=5)
         
-        ttk.Button(conn_frame, text="Refresh", command=self.refresh_ports).grid(row=0, column=2, padx=5)
+        self.refresh_btn = ttk.Button(conn_frame, text="Refresh", command=self.refresh_ports)
+        self.refresh_btn.grid(row=0, column=2, padx=5)
         
         self.connect_btn = ttk.Button(conn_frame, text="Connect", command=self.toggle_connection)
         self.connect_btn.grid(row=0, column=3, padx=5)
@@ -55,20 +118,55 @@ class ServoControllerGUI:
         self.status_label = ttk.Label(conn_frame, text="● Disconnected", foreground="red")
         self.status_label.grid(row=0, column=4, padx=10)
         
+        # Jeda minimum antar frame di kabel (diukur sekali per board)
+        ttk.Label(conn_frame, text="Frame gap (ms):").grid(row=0, column=5, padx=5)
+        self.frame_gap = ttk.Spinbox(conn_frame, from_=0, to=50, width=5, increment=0.5)
+        self.frame_gap.set(0)
+        self.frame_gap.grid(row=0, column=6, padx=5)
+        
+        # Ringkasan metrik link, diperbarui selama terhubung
+        self.metrics_label = ttk.Label(conn_frame, text="Link metrics: -", foreground="gray")
+        self.metrics_label.grid(row=1, column=0, columnspan=6, sticky="w", padx=5, pady=(5, 0))
+        ttk.Button(conn_frame, text="Export Metrics",
+                  command=self.export_metrics).grid(row=1, column=6, padx=5, pady=(5, 0))
+        
         # ===== MAIN NOTEBOOK =====
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=5)
         
-        # Tab 1: Manual Control (16 Servos)
-        self.setup_manual_tab()
-        
-        # Tab 2: ARM Robot Control (6 DOF)
-        self.setup_arm_tab()
+        # Tab 1: Manual Control (16 Servos), Tab 2: ARM Robot Control (6 DOF)
+        # Hanya frame kosong; isinya dibangun saat tab pertama kali dipilih
+        self._tab_builders = {}
+        for text, builder in (("Manual Control (16 Servos)", self.setup_manual_tab),
+                              ("ARM Robot 6DOF", self.setup_arm_tab)):
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            self._tab_builders[str(frame)] = (text, builder)
+        self.notebook.bind("<<NotebookTabChanged>>", self._build_tab)
+        self._build_tab()
+        
+    def _build_tab(self, event=None):
+        """Bangun isi tab yang sedang dipilih jika belum pernah dibangun"""
+        tab = self.notebook.select()
+        if tab not in self._tab_builders:
+            return
+        text, builder = self._tab_builders.pop(tab)
+        with trace.span("gui.build_tab", "gui", {"tab": text}):
+            builder(self.notebook.nametowidget(tab))
+            
+    def _on_map(self, event):
+        """Window utama tampil: ukur waktu startup setelah frame pertama digambar"""
+        if event.widget is not self.root or self.startup_ms is not None:
+            return
+        self.startup_ms = 0
+        self.root.after_idle(self._report_startup)
         
-    def setup_manual_tab(self):
-        manual_frame = ttk.Frame(self.notebook)
-        self.notebook.add(manual_frame, text="Manual Control (16 Servos)")
+    def _report_startup(self):
+        self.startup_ms = (time.perf_counter() - _START) * 1000.0
+        trace.instant("gui.first_frame", "gui", {"ms": self.startup_ms})
+        print(f"Window pertama tampil {self.startup_ms:.0f} ms setelah start")
         
+    def setup_manual_tab(self, manual_frame):
         # Canvas with scrollbar
         canvas = tk.Canvas(manual_frame)
         scrollbar = ttk.Scrollbar(manual_frame, orient="vertical", command=canvas.yview)
@@ -83,7 +181,6 @@ class ServoControllerGUI:
         canvas.configure(yscrollcommand=scrollbar.set)
         
         # Create 16 servo controls
-        self.servo_controls = {}
         for i in range(1, 17):
             self.create_servo_control(scrollable_frame, i, (i-1)//4, (i-1)%4)
         
@@ -107,14 +204,14 @@ class ServoControllerGUI:
         parent.grid_columnconfigure(col, weight=1)
         
         # Angle display
-        angle_var = tk.StringVar(value="90°")
+        angle_var = tk.StringVar(value=f"{self.servo_angles[servo_num]}°")
         angle_label = ttk.Label(frame, textvariable=angle_var, font=("Arial", 16, "bold"))
         angle_label.pack()
         
         # Slider
         slider = ttk.Scale(frame, from_=0, to=180, orient="horizontal", length=200,
                           command=lambda v: self.on_slider_change(servo_num, v))
-        slider.set(90)
+        slider.set(self.servo_angles[servo_num])
         slider.pack(pady=5)
         
         # +/- buttons
@@ -164,10 +261,7 @@ class ServoControllerGUI:
             'speed': speed_spinbox
         }
         
-    def setup_arm_tab(self):
-        arm_frame = ttk.Frame(self.notebook)
-        self.notebook.add(arm_frame, text="ARM Robot 6DOF")
-        
+    def setup_arm_tab(self, arm_frame):
         # Left panel: Controls
         left_panel = ttk.Frame(arm_frame)
         left_panel.pack(side="left", fill="both", expand=True, padx=5, pady=5)
@@ -193,7 +287,6 @@ class ServoControllerGUI:
                                 foreground="red")
         safety_label.pack()
         
-        self.arm_controls = {}
         joint_info = [
             ("Base", "S1", "Rotasi dasar robot (Yaw)"),
             ("Shoulder", "S2", "Gerakan bahu atas/bawah"),
@@ -206,6 +299,20 @@ class ServoControllerGUI:
         for i in range(1, 7):
             self.create_arm_joint_control(controls_frame, i, joint_info[i-1], i-1)
         
+        # Cartesian control (inverse kinematics), satuan = panjang link di ARM view
+        ik_frame = ttk.LabelFrame(left_panel, text="Cartesian Target (IK)", padding=10)
+        ik_frame.pack(fill="x", pady=5)
+        
+        self.ik_entries = {}
+        for name, default in (("X", "200"), ("Y", "0"), ("Z", "150"), ("Pitch", "")):
+            ttk.Label(ik_frame, text=f"{name}:").pack(side="left", padx=2)
+            entry = ttk.Entry(ik_frame, width=6)
+            entry.insert(0, default)
+            entry.pack(side="left", padx=2)
+            self.ik_entries[name] = entry
+        ttk.Button(ik_frame, text="Move to XYZ", 
+                  command=self.move_to_xyz).pack(side="left", padx=5)
+        
         # Pattern controls
         pattern_frame = ttk.LabelFrame(left_panel, text="Movement Patterns", padding=10)
         pattern_frame.pack(fill="x", pady=10)
@@ -238,11 +345,17 @@ class ServoControllerGUI:
         anim_frame = ttk.LabelFrame(pattern_frame, text="Animation", padding=5)
         anim_frame.pack(fill="x", pady=5)
         
-        ttk.Label(anim_frame, text="Speed (ms):").pack(side="left", padx=5)
-        self.anim_speed = ttk.Spinbox(anim_frame, from_=10, to=1000, width=8)
-        self.anim_speed.set(50)
+        # Kecepatan puncak joint; durasi gerakan dihitung dari jarak terjauh
+        ttk.Label(anim_frame, text="Max speed (°/s):").pack(side="left", padx=5)
+        self.anim_speed = ttk.Spinbox(anim_frame, from_=10, to=360, width=6, increment=10)
+        self.anim_speed.set(90)
         self.anim_speed.pack(side="left", padx=5)
         
+        self.anim_profile = ttk.Combobox(anim_frame, width=9, state="readonly",
+                                         values=list(PROFILES))
+        self.anim_profile.set("minjerk")
+        self.anim_profile.pack(side="left", padx=5)
+        
         self.animate_btn = ttk.Button(anim_frame, text="Animate to Pattern", 
                                      command=self.animate_to_pattern)
         self.animate_btn.pack(side="left", padx=5)
@@ -256,12 +369,25 @@ class ServoControllerGUI:
         ttk.Button(file_frame, text="Save Patterns", 
                   command=self.save_patterns_file).pack(side="left", padx=2)
         
+        # Recording: semua frame yang dikirim ke board direkam otomatis
+        rec_frame = ttk.Frame(pattern_frame)
+        rec_frame.pack(fill="x", pady=5)
+        
+        ttk.Button(rec_frame, text="Save Recording", 
+                  command=self.save_recording).pack(side="left", padx=2)
+        ttk.Button(rec_frame, text="Play Recording", 
+                  command=self.play_recording).pack(side="left", padx=2)
+        ttk.Button(rec_frame, text="Clear", 
+                  command=self.recorder.clear).pack(side="left", padx=2)
+        
         # Right panel: 3D Visualization
         right_panel = ttk.LabelFrame(arm_frame, text="ARM Visualization", padding=10)
         right_panel.pack(side="right", fill="both", expand=True, padx=5, pady=5)
         
         self.arm_canvas = tk.Canvas(right_panel, width=400, height=600, bg="white")
         self.arm_canvas.pack()
+        # Item dibuat sekali lalu hanya dipindah (coords/itemconfig)
+        self.arm_scene = CanvasScene(self.arm_canvas)
         
         self.draw_arm()
         
@@ -295,7 +421,7 @@ class ServoControllerGUI:
         ttk.Label(control_frame, text="", width=3).pack(side="left")
         
         # Angle display
-        angle_var = tk.StringVar(value="90°")
+        angle_var = tk.StringVar(value=f"{self.servo_angles[servo_num]}°")
         angle_label = ttk.Label(control_frame, textvariable=angle_var, width=6, 
                                font=("Arial", 10, "bold"), foreground="blue")
         angle_label.pack(side="left", padx=5)
@@ -303,7 +429,7 @@ class ServoControllerGUI:
         # Slider
         slider = ttk.Scale(control_frame, from_=0, to=180, orient="horizontal", length=200,
                           command=lambda v: self.on_arm_slider_change(servo_num, v))
-        slider.set(90)
+        slider.set(self.servo_angles[servo_num])
         slider.pack(side="left", padx=5)
         
         # +/- buttons
@@ -347,26 +473,58 @@ class ServoControllerGUI:
             'delay': delay_spinbox  # Store delay control
         }
         
+    @trace.traced("gui.slider", "gui")
     def on_slider_change(self, servo_num, value):
+        # Hanya catat target; label & frame diurus _gui_tick
         angle = int(float(value))
+        if angle == self.servo_angles[servo_num]:
+            return  # Tidak berubah, atau slider hanya mengikuti _show_angles
         self.servo_angles[servo_num] = angle
-        self.servo_controls[servo_num]['angle_var'].set(f"{angle}°")
-        self.send_servo_command(servo_num, angle)
+        self._mark_changed(servo_num, self.servo_controls)
         
+    @trace.traced("gui.slider", "gui")
     def on_arm_slider_change(self, servo_num, value):
         angle = int(float(value))
+        if angle == self.servo_angles[servo_num]:
+            return
         self.servo_angles[servo_num] = angle
-        self.arm_controls[servo_num]['angle_var'].set(f"{angle}°")
+        self._mark_changed(servo_num, self.arm_controls)
         
-        # Get delay from ARM control (use arm delay, not manual control delay)
-        try:
-            delay = int(self.arm_controls[servo_num]['delay'].get())
-            time.sleep(delay / 1000.0)
-        except:
-            time.sleep(0.05)  # Default fallback
+    def _mark_changed(self, servo_num, controls):
+        self._changed[servo_num] = controls
+        if self._tick is None:
+            self._tick_at = trace.now()
+            self._tick = self.root.after(self.update_ms, self._gui_tick)
             
-        self.send_servo_command(servo_num, angle)
-        self.draw_arm()
+    def _send_changed(self, servo_num, controls):
+        if controls is self.arm_controls:
+            # Delay ARM dipakai sebagai jarak minimum antar frame di thread penulis
+            delay = self.get_delay(controls[servo_num]['delay'], 50)
+            self.send_servo_command(servo_num, self.servo_angles[servo_num], delay)
+        else:
+            self.send_servo_command(servo_num, self.servo_angles[servo_num])
+            
+    @trace.traced("gui.tick", "gui")
+    def _gui_tick(self):
+        """Satu tick loop GUI: perbarui label, kirim channel yang berubah, redraw ARM"""
+        self._tick = None
+        if trace.tracer is not None:
+            # Keterlambatan root.after() dibanding jadwal = antrian event Tk
+            trace.counter("tk.after lag gui_tick", {"ms": (trace.now() - self._tick_at) / 1e6 - self.update_ms})
+        changed, self._changed = self._changed, {}
+        arm_changed = False
+        for servo_num, controls in changed.items():
+            controls[servo_num]['angle_var'].set(f"{self.servo_angles[servo_num]}°")
+            arm_changed = arm_changed or controls is self.arm_controls
+            
+        if self.writer is not None:
+            # Semua channel yang berubah masuk ke satu write() thread penulis
+            with self.writer.batch():
+                for servo_num, controls in changed.items():
+                    self._send_changed(servo_num, controls)
+                
+        if arm_changed:
+            self.draw_arm()
         
     def adjust_servo(self, servo_num, delta):
         current = self.servo_angles[servo_num]
@@ -397,45 +555,80 @@ class ServoControllerGUI:
         except ValueError:
             messagebox.showwarning("Invalid Input", "Please enter a valid number")
             
-    def send_servo_command(self, servo_num, angle):
-        if not self.connected or self.ser is None:
-            return
-            
+    def get_delay(self, spinbox, default):
+        """Baca delay (ms) dari spinbox, pakai default jika isinya tidak valid"""
         try:
-            # Protocol: $[A-P][000-180]#
-            servo_char = 64 + servo_num
-            date1 = int(angle/100 + 48)
-            date2 = int((angle%100)/10 + 48)
-            date3 = int(angle%10 + 48)
+            return int(spinbox.get())
+        except (ValueError, tk.TclError):
+            return default
             
-            cmd = bytearray([36, servo_char, date1, date2, date3, 35])
-            self.ser.write(cmd)
+    def send_servo_command(self, servo_num, angle, delay=None):
+        if not self.connected or self.writer is None:
+            return
             
-            # Get delay from servo control if available
+        # Get delay from servo control if available
+        if delay is None:
             if servo_num in self.servo_controls:
-                try:
-                    delay = int(self.servo_controls[servo_num]['speed'].get())
-                    time.sleep(delay / 1000.0)
-                except:
-                    time.sleep(0.01)
+                delay = self.get_delay(self.servo_controls[servo_num]['speed'], 10)
             else:
-                time.sleep(0.01)
-        except Exception as e:
-            messagebox.showerror("Communication Error", f"Failed to send command: {e}")
+                delay = 10
+                
+        # Protocol: $[A-P][000-180]# - dikirim oleh thread penulis,
+        # thread Tk tidak pernah menunggu port/sleep
+        self.writer.set_interval(servo_num, delay / 1000.0)
+        self.writer.post(servo_num, angle)
+        
+    def on_write_error(self, error):
+        # Dipanggil dari thread penulis, tampilkan di thread Tk
+        self.root.after(0, lambda: messagebox.showerror(
+            "Communication Error", f"Failed to send command: {error}"))
             
     def reset_all_servos(self):
-        for i in range(1, 17):
-            self.servo_controls[i]['slider'].set(90)
+        self.set_all_servos(90)
             
     def set_all_servos(self, angle):
+        # Slider hanya mencatat target; tick GUI berikutnya mengirim
+        # ke-16 frame dalam satu write() lewat thread penulis
         for i in range(1, 17):
             self.servo_controls[i]['slider'].set(angle)
             
     def refresh_ports(self):
-        ports = [port.device for port in serial.tools.list_ports.comports()]
+        """Scan port di thread terpisah; combobox diisi saat hasilnya siap"""
+        if self._scanning:
+            return
+        self._scanning = True
+        self.refresh_btn.config(state="disabled", text="Scanning...")
+        threading.Thread(target=self._scan_ports, name="port-scan", daemon=True).start()
+        
+    def _scan_ports(self):
+        with trace.span("gui.scan_ports", "gui"):
+            # Board terakhir (cache identitas USB); cached_port() mengimpor
+            # serial.tools, jadi ikut di thread ini, bukan di thread Tk
+            cached = None
+            try:
+                cached = discover.cached_port(GUI_BOARD) or discover.cached_port()
+                import serial.tools.list_ports
+                infos = serial.tools.list_ports.comports()
+            except Exception as e:
+                print(f"Scan port gagal: {e}")
+                infos = []
+        ids = {info.device: discover.identity(info) for info in infos}
+        try:
+            self.root.after(0, self._fill_ports, [info.device for info in infos], ids, cached)
+        except (RuntimeError, tk.TclError):
+            pass  # Window sudah ditutup
+            
+    def _fill_ports(self, ports, ids=None, cached=None):
+        self._scanning = False
+        self._port_ids = ids or {}
+        self.refresh_btn.config(state="normal", text="Refresh")
         self.port_combo['values'] = ports
-        if ports:
-            self.port_combo.current(0)
+        # Port yang sudah diketik/dipilih user selama scan tidak ditimpa
+        if not self.port_combo.get():
+            if cached:
+                self.port_combo.set(cached)
+            elif ports:
+                self.port_combo.current(0)
             
     def toggle_connection(self):
         if not self.connected:
@@ -450,6 +643,7 @@ class ServoControllerGUI:
             return
             
         try:
+            import serial
             self.ser = serial.Serial(
                 port=port,
                 baudrate=9600,
@@ -458,20 +652,87 @@ class ServoControllerGUI:
                 stopbits=serial.STOPBITS_ONE,
                 timeout=1
             )
+            # Pacer: kirim secepat link 9600bps mengizinkan, maksimal satu
+            # batch (16 frame) antri di port supaya target basi tidak menumpuk
+            try:
+                gap = float(self.frame_gap.get()) / 1000.0
+            except ValueError:
+                gap = 0.0
+            pacer = Pacer(baudrate=9600, min_gap=gap, max_queue=96)
+            # Frame yang sudutnya sama dengan yang terakhir dikirim dibuang;
+            # setiap 5 detik shadow dianggap basi supaya board tetap sinkron
+            self.driver = ServoDriver(self.ser, pacer, resync=5.0)
+            self.driver.recorder = self.recorder
+            self.metrics = DriverMetrics({"port": port})
+            self.driver.metrics = self.metrics
+            self.writer = ServoWriter(self.driver, on_error=self.on_write_error)
+            # Port yang berhasil dibuka diingat untuk start berikutnya
+            discover.remember(port, GUI_BOARD, ident=self._port_ids.get(port))
             self.connected = True
             self.connect_btn.config(text="Disconnect")
             self.status_label.config(text="● Connected", foreground="green")
+            self._metrics_prev = None
+            self._update_metrics()
             messagebox.showinfo("Connected", f"Connected to {port} @ 9600bps")
         except Exception as e:
             messagebox.showerror("Connection Error", f"Failed to connect: {e}")
             
     def disconnect(self):
+        if self._metrics_tick is not None:
+            self.root.after_cancel(self._metrics_tick)
+            self._metrics_tick = None
+        if self.writer:
+            self.writer.close()
         if self.ser:
             self.ser.close()
+        self.writer = None
+        self.driver = None
         self.connected = False
         self.connect_btn.config(text="Connect")
         self.status_label.config(text="● Disconnected", foreground="red")
         
+    def _update_metrics(self):
+        m = self.metrics
+        now = time.monotonic()
+        # Laju dihitung per interval refresh, bukan rata-rata sejak connect
+        prev = self._metrics_prev
+        if prev is None:
+            fps = bps = 0.0
+        else:
+            dt = max(now - prev[0], 1e-6)
+            fps = (m.frames_sent - prev[1]) / dt
+            bps = (m.bytes_sent - prev[2]) / dt
+        self._metrics_prev = (now, m.frames_sent, m.bytes_sent)
+        
+        def ms(hist):
+            p95 = hist.quantile(0.95)
+            return "-" if p95 is None else f"{p95 * 1000:.1f} ms"
+            
+        self.metrics_label.config(
+            text=f"{fps:.0f} frames/s ({bps:.0f} B/s) | skipped {m.frames_skipped} | "
+                 f"coalesced {m.frames_coalesced} | dropped {m.frames_dropped} | "
+                 f"queue {m.queue_depth} (max {m.queue_depth_max}) | "
+                 f"post→wire p95 {ms(m.post_to_wire_seconds)} | write p95 {ms(m.write_latency_seconds)}",
+            foreground="black")
+        self._metrics_tick = self.root.after(METRICS_MS, self._update_metrics)
+        
+    def export_metrics(self):
+        if self.metrics is None:
+            messagebox.showinfo("No Metrics", "Connect to a port first")
+            return
+            
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".prom",
+            filetypes=[("Prometheus text", "*.prom"), ("All files", "*.*")]
+        )
+        
+        if filename:
+            try:
+                self.metrics.write_prometheus(filename)
+                messagebox.showinfo("Saved", f"Metrics saved to {filename}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save: {e}")
+                
     def refresh_pattern_list(self):
         self.pattern_listbox.delete(0, tk.END)
         
@@ -479,9 +740,10 @@ class ServoControllerGUI:
         for name in self.patterns.keys():
             self.pattern_listbox.insert(tk.END, f"[Built-in] {name}")
             
-        # Add custom patterns
-        for name in self.custom_patterns.keys():
-            self.pattern_listbox.insert(tk.END, f"[Custom] {name}")
+        # Add custom patterns (hanya nama; sudut dibaca saat dipakai)
+        names = [f"[Custom] {name}" for name in self.custom_patterns.keys()]
+        if names:
+            self.pattern_listbox.insert(tk.END, *names)
             
     def apply_pattern(self):
         selection = self.pattern_listbox.curselection()
@@ -525,34 +787,115 @@ class ServoControllerGUI:
         else:
             return
             
+        vmax, profile = self.get_anim_limits()
+        if not self.check_motion(target_angles, vmax, profile):
+            return
+            
         # Start animation in separate thread
         self.animating = True
         self.animate_btn.config(state="disabled")
         
-        thread = threading.Thread(target=self._animate_thread, args=(target_angles,))
+        thread = threading.Thread(target=self._animate_thread,
+                                  args=(target_angles, vmax, profile))
         thread.daemon = True
         thread.start()
         
-    def _animate_thread(self, target_angles):
+    def move_to_xyz(self):
+        """Animasikan ARM ke posisi tip (X, Y, Z) hasil inverse kinematics"""
+        if self.animating:
+            messagebox.showinfo("Busy", "Animation already in progress")
+            return
         try:
-            speed = int(self.anim_speed.get())
-            current_angles = [self.servo_angles[i] for i in range(1, 7)]
+            target = [float(self.ik_entries[name].get()) for name in ("X", "Y", "Z")]
+            pitch = self.ik_entries["Pitch"].get().strip()
+            pitch = float(pitch) if pitch else None
+        except ValueError:
+            messagebox.showwarning("Invalid Input", "X, Y, Z and Pitch must be numbers")
+            return
+            
+        if self.ik_solver is None:
+            try:
+                from yahboom.ik import IKSolver
+            except ImportError as e:
+                messagebox.showerror("IK Unavailable", f"Inverse kinematics needs numpy and scipy: {e}")
+                return
+            # Tabel workspace di-cache ke disk; hanya lambat saat pertama kali
+            self.ik_solver = IKSolver()
+            
+        current = [self.servo_angles[i] for i in range(1, 7)]
+        sol = self.ik_solver.solve(target, pitch=pitch, roll=current[4],
+                                   gripper=current[5], seed=current)
+        if sol.error > 5.0:
+            messagebox.showwarning("Out of Reach",
+                                   f"Target not reachable (closest: {sol.error:.1f} away)")
+            return
+            
+        vmax, profile = self.get_anim_limits()
+        if not self.check_motion(sol.pose, vmax, profile):
+            return
+            
+        self.animating = True
+        self.animate_btn.config(state="disabled")
+        thread = threading.Thread(target=self._animate_thread,
+                                  args=(sol.pose, vmax, profile))
+        thread.daemon = True
+        thread.start()
+        
+    def check_motion(self, target_angles, vmax, profile):
+        """
+        Validasi gerakan ARM (batas joint, kecepatan, tabrakan) sebelum
+        animasi. Return True jika aman atau user tetap ingin melanjutkan.
+        """
+        if self.validator is None:
+            try:
+                from yahboom.validate import TrajectoryValidator
+                self.validator = TrajectoryValidator()
+            except ImportError:
+                # Tanpa numpy: validasi dilewati, perilaku lama
+                self.validator = False
+        if not self.validator:
+            return True
             
-            # Calculate steps (10 steps for smooth animation)
-            steps = 20
-            
-            for step in range(steps + 1):
-                for i in range(6):
-                    servo_num = i + 1
-                    start = current_angles[i]
-                    end = target_angles[i]
-                    angle = int(start + (end - start) * step / steps)
-                    
-                    # Update UI from main thread
-                    self.root.after(0, lambda s=servo_num, a=angle: 
-                                   self.arm_controls[s]['slider'].set(a))
-                    
-                time.sleep(speed / 1000.0)
+        current = [self.servo_angles[i] for i in range(1, 7)]
+        traj = plan(current, target_angles, vmax=vmax, profile=profile, rate=ANIM_RATE)
+        violation = self.validator.check_trajectory(traj)
+        if violation is None:
+            return True
+        return messagebox.askyesno(
+            "Unsafe Motion",
+            f"Motion check failed at t={violation.time:.2f}s (sample {violation.index}):\n"
+            f"{violation.kind} - {violation.detail} "
+            f"({violation.value:.1f}, limit {violation.limit:.1f})\n\nAnimate anyway?")
+            
+    def get_anim_limits(self):
+        """Baca max speed (°/s) dan profil animasi dari UI"""
+        try:
+            vmax = float(self.anim_speed.get())
+        except ValueError:
+            vmax = 90.0
+        return max(1.0, vmax), self.anim_profile.get() or "minjerk"
+        
+    def _send_pose(self, targets, writer=None):
+        """
+        Kirim sampel yang timing-nya sudah diatur pemanggil (trajectory,
+        playback) langsung ke thread penulis, tanpa lewat slider, tick GUI
+        atau delay per joint; slider hanya menampilkan. Aman dari thread lain.
+        """
+        writer = writer or self.writer
+        if writer is not None:
+            writer.post_many(targets, immediate=True)
+        self.root.after(0, self._show_angles, targets)
+        
+    def _move_arm(self, start, target_angles, vmax, profile):
+        # Sampel dikirim pada deadline absolut; sampel yang sudah basi
+        # dilewati sehingga durasi gerakan tetap sesuai rencana
+        traj = plan(start, target_angles, vmax=vmax, profile=profile, rate=ANIM_RATE)
+        play(traj, lambda pose: self._send_pose(list(zip(range(1, len(pose) + 1), pose))))
+        
+    def _animate_thread(self, target_angles, vmax, profile):
+        try:
+            current_angles = [self.servo_angles[i] for i in range(1, 7)]
+            self._move_arm(current_angles, target_angles, vmax, profile)
                 
         finally:
             self.animating = False
@@ -620,8 +963,7 @@ class ServoControllerGUI:
         
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    json.dump(self.custom_patterns, f, indent=2)
+                self.custom_patterns.export_json(filename)
                 messagebox.showinfo("Saved", f"Patterns saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save: {e}")
@@ -633,17 +975,99 @@ class ServoControllerGUI:
         
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    loaded = json.load(f)
-                self.custom_patterns.update(loaded)
+                # Satu transaksi; pattern dengan nama sama ditimpa
+                loaded = self.custom_patterns.import_json(filename)
                 self.refresh_pattern_list()
-                messagebox.showinfo("Loaded", f"Loaded {len(loaded)} patterns")
+                messagebox.showinfo("Loaded", f"Loaded {loaded} patterns")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load: {e}")
                 
+    def save_recording(self):
+        if not len(self.recorder):
+            messagebox.showinfo("No Recording", "Nothing recorded yet")
+            return
+            
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".ybr",
+            filetypes=[("Servo recordings", "*.ybr"), ("All files", "*.*")]
+        )
+        
+        if filename:
+            try:
+                count = self.recorder.save(filename)
+                messagebox.showinfo("Saved", f"{count} events saved to {filename}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save: {e}")
+                
+    def play_recording(self):
+        if not self.connected:
+            messagebox.showwarning("Not Connected", "Please connect to serial port first")
+            return
+        if self.playing or self.animating:
+            return
+            
+        filename = filedialog.askopenfilename(
+            filetypes=[("Servo recordings", "*.ybr"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            events = MotionRecorder.load(filename).events()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load: {e}")
+            return
+            
+        self.playing = True
+        threading.Thread(target=self._play_thread, args=(events,), daemon=True).start()
+        
+    def _play_thread(self, events):
+        writer = self.writer
+        
+        def send(targets):
+            # Timing dijaga thread ini; slider hanya mengikuti di thread Tk
+            self._send_pose(targets, writer)
+            
+        # Playback tidak ikut direkam ulang
+        self.recorder.enabled = False
+        try:
+            report = replay(events, send, stop=lambda: not self.connected)
+        finally:
+            self.recorder.enabled = True
+            self.playing = False
+        error = report["error"]
+        if error["n"]:
+            print(f"Playback {report['events']} event: timing error rata-rata "
+                  f"{error['mean_ms']:.1f} ms, p95 {error['p95_ms']:.1f} ms, max {error['max_ms']:.1f} ms")
+            
+    def _show_angles(self, targets):
+        """Tampilkan sudut yang sudah dikirim (slider, label, ARM view) tanpa mengirim ulang"""
+        arm_changed = False
+        for servo_num, angle in targets:
+            # servo_angles diisi dulu: callback slider melihat sudut sama dan tidak mengirim
+            self.servo_angles[servo_num] = angle
+            self._changed.pop(servo_num, None)
+            for controls in (self.servo_controls, self.arm_controls):
+                if servo_num in controls:
+                    controls[servo_num]['slider'].set(angle)
+                    controls[servo_num]['angle_var'].set(f"{angle}°")
+            arm_changed = arm_changed or servo_num in self.arm_controls
+        if arm_changed:
+            self.draw_arm()
+                
     def draw_arm(self):
+        """Tandai ARM view kotor; digambar ulang paling banyak sekali per frame layar"""
+        if self._arm_redraw is None and self.arm_scene is not None:
+            self._arm_redraw_at = trace.now()
+            self._arm_redraw = self.root.after(ARM_REDRAW_MS, self._render_arm)
+            
+    @trace.traced("gui.render_arm", "gui")
+    def _render_arm(self):
         """Draw simplified 2D representation of 6DOF robot arm"""
-        self.arm_canvas.delete("all")
+        self._arm_redraw = None
+        if trace.tracer is not None:
+            trace.counter("tk.after lag render_arm", {"ms": (trace.now() - self._arm_redraw_at) / 1e6 - ARM_REDRAW_MS})
+        scene = self.arm_scene
+        scene.begin()
         
         # Get current angles for servos 1-6
         base = self.servo_angles[1]
@@ -691,75 +1115,87 @@ class ServoControllerGUI:
         end_y = wrist_y - wrist * math.sin(wrist_angle)
         
         # Draw ground
-        self.arm_canvas.create_line(0, cy + 20, 400, cy + 20, fill="gray", width=3)
+        scene.create_line(0, cy + 20, 400, cy + 20, fill="gray", width=3)
         
         # Draw base
-        self.arm_canvas.create_oval(base_x - 30, base_y - 10, base_x + 30, base_y + 30, 
-                                    fill="lightgray", outline="black", width=2)
-        self.arm_canvas.create_text(base_x, base_y + 50, text=f"Base: {base}°", font=("Arial", 9))
+        scene.create_oval(base_x - 30, base_y - 10, base_x + 30, base_y + 30, 
+                          fill="lightgray", outline="black", width=2)
+        scene.create_text(base_x, base_y + 50, text=f"Base: {base}°", font=("Arial", 9))
         
         # Draw links
         # Base to shoulder
-        self.arm_canvas.create_line(base_x, base_y, shoulder_x, shoulder_y, 
-                                    fill="blue", width=8)
+        scene.create_line(base_x, base_y, shoulder_x, shoulder_y, 
+                          fill="blue", width=8)
         
         # Upper arm
-        self.arm_canvas.create_line(shoulder_x, shoulder_y, elbow_x, elbow_y, 
-                                    fill="green", width=8)
+        scene.create_line(shoulder_x, shoulder_y, elbow_x, elbow_y, 
+                          fill="green", width=8)
         
         # Forearm
-        self.arm_canvas.create_line(elbow_x, elbow_y, wrist_x, wrist_y, 
-                                    fill="orange", width=8)
+        scene.create_line(elbow_x, elbow_y, wrist_x, wrist_y, 
+                          fill="orange", width=8)
         
         # Wrist to end effector
-        self.arm_canvas.create_line(wrist_x, wrist_y, end_x, end_y, 
-                                    fill="red", width=6)
+        scene.create_line(wrist_x, wrist_y, end_x, end_y, 
+                          fill="red", width=6)
         
         # Draw joints
         joint_radius = 8
-        self.arm_canvas.create_oval(shoulder_x - joint_radius, shoulder_y - joint_radius,
-                                    shoulder_x + joint_radius, shoulder_y + joint_radius,
-                                    fill="darkblue", outline="black", width=2)
+        scene.create_oval(shoulder_x - joint_radius, shoulder_y - joint_radius,
+                          shoulder_x + joint_radius, shoulder_y + joint_radius,
+                          fill="darkblue", outline="black", width=2)
         
-        self.arm_canvas.create_oval(elbow_x - joint_radius, elbow_y - joint_radius,
-                                    elbow_x + joint_radius, elbow_y + joint_radius,
-                                    fill="darkgreen", outline="black", width=2)
+        scene.create_oval(elbow_x - joint_radius, elbow_y - joint_radius,
+                          elbow_x + joint_radius, elbow_y + joint_radius,
+                          fill="darkgreen", outline="black", width=2)
         
-        self.arm_canvas.create_oval(wrist_x - joint_radius, wrist_y - joint_radius,
-                                    wrist_x + joint_radius, wrist_y + joint_radius,
-                                    fill="darkorange", outline="black", width=2)
+        scene.create_oval(wrist_x - joint_radius, wrist_y - joint_radius,
+                          wrist_x + joint_radius, wrist_y + joint_radius,
+                          fill="darkorange", outline="black", width=2)
         
         # Draw gripper
         gripper_open = (180 - gripper) / 180.0 * 20
-        self.arm_canvas.create_line(end_x - gripper_open, end_y - 10,
-                                    end_x - gripper_open, end_y + 10,
-                                    fill="purple", width=4)
-        self.arm_canvas.create_line(end_x + gripper_open, end_y - 10,
-                                    end_x + gripper_open, end_y + 10,
-                                    fill="purple", width=4)
+        scene.create_line(end_x - gripper_open, end_y - 10,
+                          end_x - gripper_open, end_y + 10,
+                          fill="purple", width=4)
+        scene.create_line(end_x + gripper_open, end_y - 10,
+                          end_x + gripper_open, end_y + 10,
+                          fill="purple", width=4)
         
         # Labels
-        self.arm_canvas.create_text(shoulder_x + 20, shoulder_y - 20, 
-                                    text=f"S: {shoulder}°", font=("Arial", 8))
-        self.arm_canvas.create_text(elbow_x + 20, elbow_y - 20, 
-                                    text=f"E: {elbow}°", font=("Arial", 8))
-        self.arm_canvas.create_text(wrist_x + 20, wrist_y - 20, 
-                                    text=f"W: {wrist_pitch}°", font=("Arial", 8))
-        self.arm_canvas.create_text(end_x, end_y + 30, 
-                                    text=f"G: {gripper}°", font=("Arial", 8))
+        scene.create_text(shoulder_x + 20, shoulder_y - 20, 
+                          text=f"S: {shoulder}°", font=("Arial", 8))
+        scene.create_text(elbow_x + 20, elbow_y - 20, 
+                          text=f"E: {elbow}°", font=("Arial", 8))
+        scene.create_text(wrist_x + 20, wrist_y - 20, 
+                          text=f"W: {wrist_pitch}°", font=("Arial", 8))
+        scene.create_text(end_x, end_y + 30, 
+                          text=f"G: {gripper}°", font=("Arial", 8))
         
         # Info text
-        self.arm_canvas.create_text(200, 30, 
-                                    text="6DOF Robot ARM Visualization", 
-                                    font=("Arial", 14, "bold"))
-        self.arm_canvas.create_text(200, 50, 
-                                    text="(Side View - 2D Projection)", 
-                                    font=("Arial", 10))
+        scene.create_text(200, 30, 
+                          text="6DOF Robot ARM Visualization", 
+                          font=("Arial", 14, "bold"))
+        scene.create_text(200, 50, 
+                          text="(Side View - 2D Projection)", 
+                          font=("Arial", 10))
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='16 Channel Servo Controller + ARM Robot 6DOF GUI')
+    parser.add_argument('--trace', default=None, metavar='FILE',
+                        help='Rekam trace (JSON Chrome/Perfetto) dan simpan ke FILE saat GUI ditutup')
+    args = parser.parse_args()
+    if args.trace is not None:
+        trace.enable()
+        
     root = tk.Tk()
     app = ServoControllerGUI(root)
     root.mainloop()
+    
+    if args.trace is not None:
+        count = trace.save(args.trace)
+        print(f"Trace {count} event disimpan ke {args.trace} (buka di https://ui.perfetto.dev)")
 
 if __name__ == "__main__":
     main()
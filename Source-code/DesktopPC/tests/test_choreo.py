@@ -0,0 +1,14 @@
+# -*- coding:utf-8 -*-
+import os
+
+from yahboom.choreo import stream
+from yahboom.patterns import BUILTIN_PATTERNS
+
+DEMO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    "demo_sequence.ndjson")
+
+
+def test_demo_sequence_plays_with_builtin_patterns():
+    batches = list(stream(DEMO, BUILTIN_PATTERNS))
+    assert batches
+    assert all(type(angle) is int for _, changed in batches for _, angle in changed)
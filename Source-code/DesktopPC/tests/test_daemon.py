@@ -0,0 +1,70 @@
+# -*- coding:utf-8 -*-
+import asyncio
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("serial")
+if os.name != "posix":
+    pytest.skip("daemon hanya POSIX", allow_module_level=True)
+
+from yahboom.daemon import OP_DRAIN, DaemonDriver, serve
+from yahboom.sim import BoardSimulator
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    sim = BoardSimulator()
+    port = sim.open()
+    path = str(tmp_path / "servo.sock")
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+    task = []
+
+    def run():
+        asyncio.set_event_loop(loop)
+        task.append(loop.create_task(serve(port, path, tcp_port=None, ready=lambda d: ready.set())))
+        try:
+            loop.run_until_complete(task[0])
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield sim, path
+    loop.call_soon_threadsafe(task[0].cancel)
+    thread.join(5)
+    sim.close()
+
+
+def test_clients_share_board(daemon):
+    sim, path = daemon
+    a = DaemonDriver(path)
+    b = DaemonDriver(path)
+    try:
+        assert a.set(1, 90) == 6
+        assert b.set(1, 30) == 6
+        # Shadow client A tidak boleh menelan perintah yang sama
+        assert a.set(1, 90) == 6
+        a.flush()
+        assert sim.wait_for(3, 2)
+        assert [c.angle for c in sim.commands if c.servo == 1] == [90, 30, 90]
+    finally:
+        a.close()
+        b.close()
+
+
+def test_wait_twice_raises(daemon):
+    sim, path = daemon
+    driver = DaemonDriver(path)
+    try:
+        seq = driver.post(OP_DRAIN)
+        driver.wait(seq)
+        with pytest.raises(KeyError):
+            driver.wait(seq)
+        with pytest.raises(KeyError):
+            driver.wait(seq + 100)
+    finally:
+        driver.close()
@@ -0,0 +1,56 @@
+# -*- coding:utf-8 -*-
+import types
+
+import pytest
+
+pytest.importorskip("serial")
+import serial.tools.list_ports
+
+from yahboom import discover
+
+
+def port(device, vid, pid, sn=None, loc=None):
+    return types.SimpleNamespace(device=device, vid=vid, pid=pid, serial_number=sn, location=loc)
+
+
+@pytest.fixture
+def fake(monkeypatch, tmp_path):
+    ports = []
+    probed = []
+    monkeypatch.setattr(serial.tools.list_ports, "comports", lambda: list(ports))
+    monkeypatch.setattr(discover, "probe", lambda device, check=None: probed.append(device) or True)
+    # Tanpa sysfs: entri cache diverifikasi lewat probe saja
+    monkeypatch.setattr(discover.sys, "platform", "test")
+    return ports, probed, str(tmp_path / "ports.json")
+
+
+def test_single_candidate_is_found_and_cached(fake):
+    ports, probed, path = fake
+    ports += [port("/dev/ttyS0", None, None), port("/dev/ttyUSB0", 0x1A86, 0x7523, loc="1-1.2")]
+    assert discover.find_port(path=path) == "/dev/ttyUSB0"
+    assert discover.load_cache(path)["default"]["device"] == "/dev/ttyUSB0"
+
+
+def test_several_candidates_raise_instead_of_guessing(fake):
+    ports, probed, path = fake
+    ports += [port("/dev/ttyUSB0", 0x1A86, 0x7523, loc="1-1.2"),
+              port("/dev/ttyUSB1", 0x1A86, 0x7523, loc="1-1.3")]
+    with pytest.raises(OSError) as err:
+        discover.find_port(path=path)
+    assert "/dev/ttyUSB0" in str(err.value) and "/dev/ttyUSB1" in str(err.value)
+    assert probed == []
+    assert discover.load_cache(path) == {}
+    # match memilih satu
+    assert discover.find_port(match={"location": "1-1.3"}, path=path) == "/dev/ttyUSB1"
+
+
+def test_known_identity_survives_renumbering(fake, monkeypatch):
+    ports, probed, path = fake
+    board = port("/dev/ttyUSB0", 0x10C4, 0xEA60, sn="A1")
+    ports += [board]
+    assert discover.find_port(path=path) == "/dev/ttyUSB0"
+    # Setelah reboot: board pindah nama, muncul adapter lain di nama lama
+    board.device = "/dev/ttyUSB1"
+    ports.insert(0, port("/dev/ttyUSB0", 0x1A86, 0x7523, loc="1-4"))
+    monkeypatch.setattr(discover, "probe", lambda device, check=None: device == "/dev/ttyUSB1")
+    assert discover.find_port(path=path) == "/dev/ttyUSB1"
@@ -0,0 +1,69 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+from yahboom.driver import ServoDriver, check
+
+
+class FakePort:
+    def __init__(self):
+        self.data = bytearray()
+        self.fail = False
+
+    def write(self, data):
+        if self.fail:
+            raise OSError("port putus")
+        self.data += data
+        return len(data)
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("angle", [90.0, True, "90", None])
+def test_check_rejects_non_int_angle(angle):
+    with pytest.raises(ValueError):
+        check(1, angle)
+
+
+def test_set_float_angle_leaves_shadow():
+    port = FakePort()
+    driver = ServoDriver(port)
+    with pytest.raises(ValueError):
+        driver.set(3, 90.0)
+    assert driver.shadow[3] is None
+    assert driver.set(3, 90) == 6
+    assert bytes(port.data) == b"$C090#"
+
+
+def test_set_many_invalid_target_sends_nothing():
+    port = FakePort()
+    driver = ServoDriver(port)
+    with pytest.raises(ValueError):
+        driver.set_many({1: 90, 2: 200})
+    assert port.data == b""
+    assert driver.shadow[1] is None
+    # Target valid berikutnya tetap dikirim
+    assert driver.set(1, 90) == 6
+    assert bytes(port.data) == b"$A090#"
+
+
+def test_write_error_does_not_commit_shadow():
+    port = FakePort()
+    driver = ServoDriver(port)
+    port.fail = True
+    with pytest.raises(OSError):
+        driver.set_many([(1, 45), (2, 45)])
+    with pytest.raises(OSError):
+        driver.set(3, 45)
+    assert driver.shadow[1:4] == [None, None, None]
+    port.fail = False
+    assert driver.set_many([(1, 45), (2, 45), (3, 45)]) == 18
+
+
+def test_set_many_skips_shadow_and_duplicates():
+    port = FakePort()
+    driver = ServoDriver(port)
+    driver.set(1, 90)
+    assert driver.set_many([(1, 90), (2, 30), (2, 30)]) == 6
+    assert bytes(port.data) == b"$A090#$B030#"
+    assert driver.shadow[2] == 30
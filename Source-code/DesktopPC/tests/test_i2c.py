@@ -0,0 +1,54 @@
+# -*- coding:utf-8 -*-
+import pytest
+
+from yahboom.i2c import FakeSMBus, I2CDriver
+from yahboom.recorder import MotionRecorder
+
+
+class FlakySMBus(FakeSMBus):
+    """FakeSMBus yang gagal mulai transaksi ke-`ok + 1`"""
+
+    def __init__(self, ok=0):
+        FakeSMBus.__init__(self)
+        self.ok = ok
+
+    def _transfer(self, address, reg, values):
+        if len(self.log) >= self.ok:
+            raise OSError("bus error")
+        FakeSMBus._transfer(self, address, reg, values)
+
+
+def _driver(bus, block=False):
+    driver = I2CDriver(bus, block=block)
+    driver.recorder = MotionRecorder()
+    return driver
+
+
+def test_set_failed_write_is_not_recorded():
+    driver = _driver(FlakySMBus(ok=0))
+    with pytest.raises(OSError):
+        driver.set(1, 45)
+    assert driver.shadow[1] is None
+    assert len(driver.recorder) == 0
+
+
+def test_set_many_records_only_written_servos():
+    bus = FlakySMBus(ok=1)
+    driver = _driver(bus)
+    with pytest.raises(OSError):
+        driver.set_many([(1, 45), (2, 45), (3, 45)])
+    assert driver.shadow[1:4] == [None, None, None]
+    assert [(ch, a) for _, ch, a in driver.recorder.events()] == [(1, 45)]
+    assert bus.log[0][2:] == (1, (45,))
+
+
+def test_block_write_records_only_written_runs():
+    bus = FlakySMBus(ok=1)
+    driver = _driver(bus, block=True)
+    with pytest.raises(OSError):
+        driver.set_many([(1, 10), (2, 20), (5, 50), (6, 60)])
+    assert driver.shadow[1:7] == [None] * 6
+    assert [(ch, a) for _, ch, a in driver.recorder.events()] == [(1, 10), (2, 20)]
+    bus.ok = 10
+    assert driver.set_many([(1, 10), (2, 20), (5, 50), (6, 60)]) == 6
+    assert driver.shadow[1:7] == [10, 20, None, None, 50, 60]
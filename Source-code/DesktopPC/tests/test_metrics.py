@@ -0,0 +1,33 @@
+# -*- coding:utf-8 -*-
+import time
+
+from yahboom.driver import ServoDriver
+from yahboom.metrics import DriverMetrics
+from yahboom.pacing import Pacer
+from yahboom.writer import ServoWriter
+
+
+class NullPort:
+    def write(self, data):
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def test_skipped_posts_do_not_observe_wire_latency():
+    driver = ServoDriver(NullPort(), Pacer(baudrate=9600))
+    driver.metrics = metrics = DriverMetrics()
+    writer = ServoWriter(driver)
+    try:
+        for _ in range(3):
+            writer.post(1, 90)
+            writer.flush()
+            time.sleep(0.02)  # wire_free dari Pacer sudah lewat
+    finally:
+        writer.close()
+    hist = metrics.post_to_wire_seconds
+    assert hist.count == 1
+    assert hist.sum >= 0
+    assert metrics.frames_skipped == 2
+    assert metrics.set_to_wire_seconds.sum >= 0
@@ -0,0 +1,44 @@
+# -*- coding:utf-8 -*-
+import time
+
+from yahboom.driver import ServoDriver
+from yahboom.multi import MultiBoard
+
+
+class SlowPort:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.flushed = 0
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return len(data)
+
+    def flush(self):
+        self.flushed += 1
+
+    def close(self):
+        pass
+
+
+def test_flush_shares_one_deadline_across_boards():
+    ports = [SlowPort(1.0), SlowPort(1.0)]
+    boards = MultiBoard([ServoDriver(p) for p in ports])
+    try:
+        boards.set_many({1: 90, 17: 90})
+        t0 = time.monotonic()
+        assert boards.flush(timeout=0.3) is False
+        assert time.monotonic() - t0 < 0.5
+    finally:
+        boards.close()
+
+
+def test_flush_drains_each_driver():
+    ports = [SlowPort(), SlowPort()]
+    boards = MultiBoard([ServoDriver(p) for p in ports])
+    try:
+        boards.set_many({1: 90, 17: 90})
+        assert boards.flush(timeout=1.0)
+    finally:
+        boards.close()
+    assert [p.flushed for p in ports] == [1, 1]
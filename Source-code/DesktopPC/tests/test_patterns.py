@@ -0,0 +1,27 @@
+# -*- coding:utf-8 -*-
+import json
+
+import pytest
+
+from yahboom.patterns import PatternStore
+
+
+def test_put_replaces_tags_on_upsert():
+    store = PatternStore()
+    store.put("Wave", [90] * 6, tags=["wave", "demo"])
+    store.put("Wave", [45] * 6, tags=["wave"])
+    assert store["Wave"] == [45] * 6
+    assert store.tags("Wave") == ["wave"]
+    assert store.find(tag="demo") == []
+    store["Wave"] = [30] * 6  # Tanpa tags: tag lama tetap
+    assert store.tags("Wave") == ["wave"]
+
+
+@pytest.mark.parametrize("angles", [[90, 200], [90, 45.5], [90, True], "90", [90] * 17])
+def test_import_json_rejects_invalid_poses(tmp_path, angles):
+    path = tmp_path / "patterns.json"
+    path.write_text(json.dumps({"Good": [90] * 6, "Bad": angles}))
+    store = PatternStore()
+    with pytest.raises(ValueError):
+        store.import_json(str(path))
+    assert len(store) == 0
@@ -0,0 +1,32 @@
+# -*- coding:utf-8 -*-
+import time
+
+from yahboom.driver import ServoDriver
+from yahboom.recorder import replay
+from yahboom.writer import ServoWriter
+
+
+class RecordingPort:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append((time.monotonic(), bytes(data)))
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def test_replay_through_writer_ignores_channel_interval():
+    port = RecordingPort()
+    writer = ServoWriter(ServoDriver(port))
+    writer.set_interval(1, 0.5)
+    try:
+        report = replay([(0.0, 1, 10), (0.05, 1, 20), (0.1, 1, 30)], writer)
+        assert writer.flush(1.0)
+    finally:
+        writer.close()
+    assert report["batches"] == 3
+    assert [data for _, data in port.writes] == [b"$A010#", b"$A020#", b"$A030#"]
+    assert port.writes[-1][0] - port.writes[0][0] < 0.3
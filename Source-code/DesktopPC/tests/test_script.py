@@ -0,0 +1,67 @@
+# -*- coding:utf-8 -*-
+import itertools
+
+import pytest
+
+from yahboom.driver import ServoDriver
+from yahboom.script import parse, parse_duration, run
+from yahboom.writer import ServoWriter
+
+
+def test_nested_unbounded_loop_streams():
+    source = ["loop 2", "loop", "set 1 90", "wait 10ms", "end", "end"]
+    cmds = list(itertools.islice(parse(source), 1000))
+    assert len(cmds) == 1000
+    assert [c.op for c in cmds[:4]] == ["send", "wait", "send", "wait"]
+
+
+def test_nested_counted_loops():
+    source = ["loop 2", "set 1 0", "loop 3", "set 2 0", "end", "end", "flush"]
+    ops = [(c.op, c.line) for c in parse(source)]
+    assert ops == [("send", 2), ("send", 4), ("send", 4), ("send", 4)] * 2 + [("flush", 7)]
+
+
+def test_empty_unbounded_loop_terminates():
+    assert list(parse(["loop", "loop 0", "set 1 90", "end", "end", "set 2 30"]))[0].arg == [(2, 30)]
+
+
+@pytest.mark.parametrize("source, line", [
+    (["loop 2", "set 1 90"], None),
+    (["end"], 1),
+    (["set 1 90", "set 1 200"], 2),
+])
+def test_errors(source, line):
+    with pytest.raises(ValueError) as err:
+        list(parse(source))
+    if line is not None:
+        assert str(err.value).startswith("Baris %d:" % line)
+
+
+class RecordingPort:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def test_run_through_writer_keeps_every_command():
+    port = RecordingPort()
+    writer = ServoWriter(ServoDriver(port))
+    writer.set_interval(1, 0.5)  # Throttle channel tidak berlaku untuk script
+    try:
+        run(["set 1 0", "set 1 180", "set 2 90", "set 1 0"], writer)
+        assert writer.flush(1.0)
+    finally:
+        writer.close()
+    assert bytes(port.data) == b"$A000#$A180#$B090#$A000#"
+
+
+@pytest.mark.parametrize("text", ["inf", "infs", "nan", "-5ms"])
+def test_parse_duration_rejects_non_finite(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
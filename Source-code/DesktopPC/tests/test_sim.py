@@ -0,0 +1,20 @@
+# -*- coding:utf-8 -*-
+from yahboom.sim import BoardSimulator
+
+
+def test_rejected_counts_frames_not_bytes():
+    sim = BoardSimulator()
+    # sampah 5 byte, frame terpotong, frame dengan sudut > 180 + sisa byte
+    sim.feed(b"xxxxx$A090#$B09$C200#zz$D045#")
+    assert [(c.servo, c.angle) for c in sim.commands] == [(1, 90), (4, 45)]
+    assert sim.rejected == 3
+
+
+def test_commands_keep_only_history():
+    sim = BoardSimulator(history=4)
+    sim.feed(b"$A090#" * 10)
+    assert sim.accepted == 10
+    assert len(sim.commands) == 4
+    assert sim.wait_for(10, 0)
+    sim.reset()
+    assert sim.accepted == 0 and len(sim.commands) == 0
@@ -0,0 +1,15 @@
+# -*- coding:utf-8 -*-
+from yahboom.trajectory import Trajectory
+
+
+def test_all_samples_are_int_including_last():
+    traj = Trajectory([90, 90], [45.5, 30.2], 1)
+    samples = list(traj)
+    assert samples[-1] == (1.0, [46, 30])
+    for _, pose in samples:
+        assert all(type(a) is int for a in pose)
+
+
+def test_int_end_pose_is_exact():
+    t, pose = list(Trajectory([0, 180], [180, 0], 0.5, rate=10))[-1]
+    assert (t, pose) == (0.5, [180, 0])
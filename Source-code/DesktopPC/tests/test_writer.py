@@ -0,0 +1,34 @@
+# -*- coding:utf-8 -*-
+import time
+
+from yahboom.driver import ServoDriver
+from yahboom.writer import ServoWriter
+
+
+class RecordingPort:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, data):
+        self.frames.append(data)
+        return len(data)
+
+    def close(self):
+        pass
+
+
+def test_immediate_post_bypasses_channel_interval():
+    port = RecordingPort()
+    writer = ServoWriter(ServoDriver(port))
+    try:
+        writer.set_interval(2, 0.5)
+        writer.post(2, 10)
+        writer.flush()
+        t0 = time.monotonic()
+        writer.post_many([(2, 20)], immediate=True)
+        writer.flush(timeout=0.4)
+        elapsed = time.monotonic() - t0
+    finally:
+        writer.close()
+    assert len(port.frames) == 2
+    assert elapsed < 0.3
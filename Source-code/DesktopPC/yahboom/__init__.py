@@ -0,0 +1,22 @@
+# -*- coding:utf-8 -*-
+"""
+Library bersama untuk Yahboom 16 Channel Servo Controller.
+
+Dipakai oleh script CLI/GUI di folder DesktopPC dan contoh board lain
+(Raspberry Pi, Jetson NANO, Pico).
+
+Hanya driver yang di-import di sini supaya paket tetap bisa dipakai di
+MicroPython; modul lain di-import langsung, mis. `from yahboom.xxx import ...`.
+"""
+
+from .driver import (
+    NUM_CHANNELS,
+    MAX_ANGLE,
+    FRAME_LEN,
+    FRAMES,
+    BaseDriver,
+    ServoDriver,
+    check,
+    frame,
+    open_serial,
+)
@@ -0,0 +1,247 @@
+# -*- coding:utf-8 -*-
+"""
+Controller servo berbasis asyncio.
+
+Tidak ada thread dan tidak ada time.sleep: file descriptor port didaftarkan
+ke event loop dengan loop.add_writer(), jadi ribuan coroutine bisa berbagi
+satu port. Seperti ServoWriter, setiap channel punya slot "target terakhir";
+target yang tertimpa sebelum dikirim ikut selesai saat frame penggantinya
+terkirim.
+
+Hanya untuk POSIX (Linux/macOS) karena butuh file descriptor yang bisa
+di-select. Bisa diuji tanpa hardware dengan pseudo-terminal (pty).
+
+Example:
+    ctrl = AsyncServoController.open("/dev/ttyUSB0")
+    await ctrl.set(1, 90)
+    await ctrl.move_to([90, 60, 120, 90, 90, 45], duration=1.5)
+    await ctrl.drain()
+    ctrl.close()
+"""
+
+import asyncio
+import os
+
+from .driver import FRAMES, FRAME_LEN, NUM_CHANNELS, check
+from .trajectory import Trajectory
+
+
+class AsyncServoController:
+    """
+    Args:
+        fd: File descriptor port (mis. ser.fileno() atau sisi slave pty)
+        pacer: Pacer opsional (yahboom.pacing) untuk membatasi antrian di OS
+        port: Object port pemilik fd, ditutup saat close() (opsional)
+        loop: Event loop (default: loop yang sedang berjalan)
+    """
+
+    def __init__(self, fd, pacer=None, port=None, loop=None):
+        self.fd = fd
+        self.pacer = pacer
+        self.port = port
+        self._loop = loop
+        os.set_blocking(fd, False)
+
+        self._pending = [None] * (NUM_CHANNELS + 1)
+        self._pending_futs = []
+        self._out = bytearray()
+        # (total byte setelah frame ini ditulis, future)
+        self._inflight = []
+        self._queued = 0
+        self._written = 0
+        self._drain_futs = []
+        self._writing = False
+        self._paused = None
+        self._closed = False
+        self.error = None
+
+        # Sudut terakhir yang diminta per channel (untuk move_to)
+        self.angles = [None] * (NUM_CHANNELS + 1)
+
+    @classmethod
+    def open(cls, port, pacer=None, loop=None):
+        """Buka port serial 9600 8N1 dengan pyserial lalu pakai fd-nya"""
+        from .driver import open_serial
+        driver = open_serial(port, timeout=0)
+        ser = driver.port
+        if pacer is not None and pacer.port is None:
+            pacer.port = ser
+        return cls(ser.fileno(), pacer=pacer, port=ser, loop=loop)
+
+    @property
+    def loop(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop
+
+    def post(self, ch, angle):
+        """Simpan target tanpa menunggu; return future yang selesai saat frame ditulis"""
+        check(ch, angle)
+        if self._closed:
+            raise RuntimeError("AsyncServoController sudah ditutup")
+        self._pending[ch] = angle
+        self.angles[ch] = angle
+        fut = self.loop.create_future()
+        self._pending_futs.append(fut)
+        self._start()
+        return fut
+
+    async def set(self, ch, angle):
+        """Gerakkan satu servo; selesai saat frame sudah diserahkan ke OS"""
+        await self.post(ch, angle)
+
+    async def set_many(self, targets):
+        """
+        Gerakkan beberapa servo; semua frame masuk ke satu write().
+
+        Args:
+            targets: dict {servo: angle} atau iterable pasangan (servo, angle)
+        """
+        if hasattr(targets, "items"):
+            targets = targets.items()
+        if self._closed:
+            raise RuntimeError("AsyncServoController sudah ditutup")
+        # Validasi semua target dulu supaya batch yang salah tidak setengah masuk
+        targets = list(targets)
+        for ch, angle in targets:
+            check(ch, angle)
+        for ch, angle in targets:
+            self._pending[ch] = angle
+            self.angles[ch] = angle
+        fut = self.loop.create_future()
+        self._pending_futs.append(fut)
+        self._start()
+        await fut
+
+    async def move_to(self, pose, duration, rate=50.0, first=1, profile="linear"):
+        """
+        Gerakkan servo dari sudut terakhir ke pose dalam `duration` detik.
+
+        Sampel dari yahboom.trajectory dijadwalkan dengan deadline absolut
+        (loop.time()), jadi total waktu tidak bergeser karena overhead per
+        langkah.
+
+        Args:
+            pose: List sudut untuk servo first, first+1, ...
+            duration: Lama gerakan (detik)
+            rate: Frekuensi kontrol (Hz)
+            profile: Profil di yahboom.trajectory.PROFILES
+        """
+        channels = range(first, first + len(pose))
+        for ch, angle in zip(channels, pose):
+            check(ch, angle)
+        start = [self.angles[ch] if self.angles[ch] is not None else angle
+                 for ch, angle in zip(channels, pose)]
+        t0 = self.loop.time()
+        for t, angles in Trajectory(start, pose, duration, profile, rate):
+            delay = t0 + t - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.set_many(zip(channels, angles))
+
+    async def drain(self):
+        """Tunggu sampai semua target terkirim dan (jika ada pacer) keluar dari kabel"""
+        if not self._idle():
+            fut = self.loop.create_future()
+            self._drain_futs.append(fut)
+            await fut
+        if self.pacer is not None:
+            wire = self.pacer.queued() * self.pacer.byte_time
+            if wire > 0:
+                await asyncio.sleep(wire)
+
+    def close(self):
+        """Hentikan writer, batalkan target yang belum terkirim, tutup port"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop()
+        if self._paused is not None:
+            self._paused.cancel()
+        for fut in self._pending_futs + [f for _, f in self._inflight] + self._drain_futs:
+            if not fut.done():
+                fut.cancel()
+        self._pending_futs = []
+        self._inflight = []
+        self._drain_futs = []
+        if self.port is not None:
+            self.port.close()
+
+    def _idle(self):
+        return not self._out and not self._pending_futs
+
+    def _start(self):
+        if not self._writing and self._paused is None:
+            self.loop.add_writer(self.fd, self._on_writable)
+            self._writing = True
+
+    def _stop(self):
+        if self._writing:
+            self.loop.remove_writer(self.fd)
+            self._writing = False
+
+    def _resume(self):
+        self._paused = None
+        if not self._closed:
+            self._start()
+
+    def _take_pending(self):
+        pending = self._pending
+        out = self._out
+        for ch in range(1, NUM_CHANNELS + 1):
+            angle = pending[ch]
+            if angle is not None:
+                out += FRAMES[ch][angle]
+                pending[ch] = None
+                self._queued += FRAME_LEN
+        for fut in self._pending_futs:
+            self._inflight.append((self._queued, fut))
+        self._pending_futs = []
+
+    def _on_writable(self):
+        # Target baru hanya diambil saat buffer kosong: selama port masih
+        # sibuk, post() berikutnya menimpa slot (coalescing)
+        if not self._out:
+            self._take_pending()
+
+        if self._out:
+            if self.pacer is not None:
+                delay = self.pacer.delay_for(len(self._out))
+                if delay > 0:
+                    self._stop()
+                    self._paused = self.loop.call_later(delay, self._resume)
+                    return
+            try:
+                n = os.write(self.fd, self._out)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                self._fail(e)
+                return
+            del self._out[:n]
+            self._written += n
+            if self.pacer is not None:
+                self.pacer.sent(n)
+
+        while self._inflight and self._inflight[0][0] <= self._written:
+            fut = self._inflight.pop(0)[1]
+            if not fut.done():
+                fut.set_result(None)
+
+        if self._idle():
+            self._stop()
+            for fut in self._drain_futs:
+                if not fut.done():
+                    fut.set_result(None)
+            self._drain_futs = []
+
+    def _fail(self, error):
+        self.error = error
+        self._stop()
+        self._out.clear()
+        for fut in self._pending_futs + [f for _, f in self._inflight] + self._drain_futs:
+            if not fut.done():
+                fut.set_exception(error)
+        self._pending_futs = []
+        self._inflight = []
+        self._drain_futs = []
@@ -0,0 +1,410 @@
+# -*- coding:utf-8 -*-
+"""
+Benchmark encoding, penulisan dan animasi servo.
+
+Diukur terhadap null sink (port yang membuang data) dan simulator pty
+(yahboom.sim), jadi tidak butuh hardware. Hasil ditulis ke file JSON
+supaya regresi antar rilis bisa dibandingkan.
+
+Jalankan:
+    python -m yahboom.bench                 # tulis bench.json
+    python -m yahboom.bench --quick -o -    # versi singkat, JSON ke stdout
+
+Bagian:
+  - encode:    biaya frame() per panggilan dan set_many() 16 servo per batch,
+               dibandingkan dengan encoding lama (float + bytearray per call)
+  - throughput: frame/detik berkelanjutan ke null sink dan ke simulator
+  - latency:   dari set_many()/ServoWriter.post() sampai byte '#' terakhir
+               diterima simulator
+  - animation: durasi & jitter gerakan pattern (trajectory.play) dibanding
+               gaya lama 20 langkah + time.sleep
+  - i2c:       waktu set_all() 16 servo lewat FakeSMBus 100kHz, single write
+               vs block write
+  - kinematics: forward kinematics N pose sekaligus (NumPy) dibanding loop
+               math.cos/math.sin per pose (dilewati jika NumPy tidak ada)
+  - ik:        waktu per query IKSolver.solve() (seed tabel dan warm start)
+               dan error posisi (dilewati jika NumPy/SciPy tidak ada)
+"""
+
+import json
+import math
+import platform
+import sys
+import time
+
+from .driver import NUM_CHANNELS, FRAME_LEN, FRAMES, ServoDriver, frame, open_serial
+from .i2c import FakeSMBus, I2CDriver
+from .pacing import Pacer
+from .trajectory import plan, play
+from .writer import ServoWriter
+
+PATTERN = ([90, 90, 90, 90, 90, 90], [90, 60, 120, 90, 90, 45])
+
+
+class NullPort:
+    """Port yang membuang semua data (mengukur biaya CPU saja)"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        n = len(data)
+        self.bytes += n
+        return n
+
+    def close(self):
+        pass
+
+
+def _legacy_frame(servonum, angle):
+    # Encoding asli UARTServo sebelum tabel frame
+    return bytearray([36, 64 + servonum, int(angle / 100 + 48),
+                      int((angle % 100) / 10 + 48), int(angle % 10 + 48), 35])
+
+
+def _stats(values):
+    """Ringkasan list angka (detik) dalam milidetik"""
+    if not values:
+        return {"n": 0}
+    v = sorted(values)
+    n = len(v)
+    mean = sum(v) / n
+
+    def pct(p):
+        return v[min(n - 1, int(round(p / 100.0 * (n - 1))))] * 1000.0
+
+    return {
+        "n": n,
+        "mean_ms": mean * 1000.0,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "max_ms": v[-1] * 1000.0,
+        "min_ms": v[0] * 1000.0,
+    }
+
+
+def _per_call(fn, calls):
+    """Waktu rata-rata per panggilan fn() dalam nanodetik"""
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1e9
+
+
+def bench_encode(calls):
+    angles = [(ch, a) for ch in range(1, NUM_CHANNELS + 1) for a in (0, 90, 180)]
+    k = len(angles)
+
+    def loop(encode):
+        def run():
+            for ch, a in angles:
+                encode(ch, a)
+        return _per_call(run, max(1, calls // k)) / k
+
+    driver = ServoDriver(NullPort())
+    batch = [[(ch, a) for ch in range(1, NUM_CHANNELS + 1)] for a in (10, 20)]
+    flip = [0]
+
+    def set_batch():
+        flip[0] ^= 1
+        driver.set_many(batch[flip[0]])
+
+    return {
+        "frame_ns": loop(frame),
+        "legacy_frame_ns": loop(_legacy_frame),
+        "set_many_16_ns": _per_call(set_batch, max(1, calls // NUM_CHANNELS)),
+    }
+
+
+def bench_null_throughput(seconds):
+    port = NullPort()
+    driver = ServoDriver(port)
+    a = 0
+    t0 = time.perf_counter()
+    end = t0 + seconds
+    while time.perf_counter() < end:
+        for _ in range(100):
+            a = 1 - a
+            driver.set_all(a)
+    elapsed = time.perf_counter() - t0
+    return {"frames_per_s": port.bytes / FRAME_LEN / elapsed}
+
+
+def bench_sim_throughput(sim, driver, seconds):
+    # Maksimal dua batch belum diterima board: link tetap penuh, tapi tidak
+    # ada backlog di buffer pty yang harus dikuras lama setelah deadline
+    # (Pacer.max_queue tidak membantu di sini, out_waiting pty selalu 0)
+    backlog = 2 * NUM_CHANNELS
+    sim.reset()
+    start = time.monotonic()
+    end = start + seconds
+    n = 0
+    a = 0
+    while time.monotonic() < end:
+        if not sim.wait_for(n - backlog, end - time.monotonic()):
+            break
+        a = 1 - a
+        n += driver.set_all(a) // FRAME_LEN
+    sim.wait_for(n, 5.0)
+    cmds = sim.commands
+    span = cmds[-1].time - cmds[0].time if len(cmds) > 1 else 0.0
+    link = 1.0 / (FRAME_LEN * sim.byte_time)
+    fps = (len(cmds) - 1) / span if span > 0 else 0.0
+    return {
+        "frames": sim.accepted,
+        "rejected": sim.rejected,
+        "frames_per_s": fps,
+        "link_frames_per_s": link,
+        "link_utilization": fps / link,
+    }
+
+
+def bench_sim_latency(sim, driver, rounds):
+    # set_many: 16 servo -> waktu sampai frame terakhir diterima board
+    batch = []
+    for r in range(rounds):
+        angle = r % 2
+        sim.reset()
+        t0 = time.monotonic()
+        driver.set_all(angle, force=True)
+        sim.wait_for(NUM_CHANNELS, 5.0)
+        batch.append(sim.commands[-1].time - t0)
+        time.sleep(0.02)
+
+    # ServoWriter.post: satu servo lewat thread penulis
+    writer = ServoWriter(driver)
+    single = []
+    try:
+        for r in range(rounds):
+            sim.reset()
+            t0 = time.monotonic()
+            writer.post(1, 10 + r % 2)
+            sim.wait_for(1, 5.0)
+            single.append(sim.commands[-1].time - t0)
+            time.sleep(0.02)
+    finally:
+        writer.close()
+    return {"set_all_16": _stats(batch), "writer_post_1": _stats(single)}
+
+
+def bench_sim_animation(sim, driver, rate, vmax):
+    start, end = PATTERN
+    result = {}
+
+    # Gaya lama: 20 langkah linear + time.sleep(50ms), satu port.write()
+    # per servo tanpa shadow/batch/pacer (jalur sebelum driver)
+    driver.set_pose(start, force=True)
+    time.sleep(0.2)
+    port = driver.port
+    sim.reset()
+    t0 = time.monotonic()
+    for step in range(21):
+        for i in range(6):
+            port.write(FRAMES[i + 1][int(start[i] + (end[i] - start[i]) * step / 20)])
+        time.sleep(0.05)
+    # Selesai = frame terakhir diterima board, bukan saat write() kembali
+    sim.wait_for(21 * 6, 5.0)
+    result["legacy_20_steps"] = {"duration_s": sim.commands[-1].time - t0}
+    driver.invalidate()
+
+    # Trajectory dengan deadline absolut
+    driver.set_pose(start, force=True)
+    time.sleep(0.2)
+    traj = plan(start, end, vmax=vmax, rate=rate)
+    deadlines = []
+    t_start = []
+
+    def send(pose):
+        deadlines.append(time.monotonic() - t_start[0])
+        driver.set_pose(pose)
+
+    sim.reset()
+    t_start.append(time.monotonic())
+    sent = play(traj, send)
+    elapsed = time.monotonic() - t_start[0]
+    planned = [t for t, _ in traj]
+    jitter = [abs(d - p) for d, p in zip(deadlines, planned)]
+    result["trajectory"] = {
+        "profile": traj.profile,
+        "rate_hz": rate,
+        "planned_s": traj.duration,
+        "duration_s": elapsed,
+        "samples": len(traj),
+        "sent": sent,
+        "jitter": _stats(jitter),
+    }
+    return result
+
+
+def bench_i2c(rounds, freq=100000):
+    result = {}
+    for name, block in (("single", False), ("block", True)):
+        bus = FakeSMBus(freq)
+        driver = I2CDriver(bus, block=block)
+        times = []
+        for r in range(rounds):
+            t0 = time.perf_counter()
+            driver.set_all(r % 2)
+            times.append(time.perf_counter() - t0)
+        result[name] = {"set_all_16": _stats(times),
+                        "transactions": len(bus.log) // rounds}
+    # Gaya lama: write_byte_data + time.sleep(0.1) per servo
+    result["legacy_set_all_16_s"] = NUM_CHANNELS * 0.1
+    return result
+
+
+def _fk_scalar(pose, links):
+    # Loop Python per pose, sama seperti draw_arm (plus base yaw)
+    h, l1, l2, l3 = links
+    yaw = math.radians(pose[0] - 90)
+    phi = math.radians(180 - pose[1])
+    r = l1 * math.cos(phi)
+    z = h + l1 * math.sin(phi)
+    phi -= math.radians(pose[2])
+    r += l2 * math.cos(phi)
+    z += l2 * math.sin(phi)
+    phi -= math.radians(pose[3])
+    r += l3 * math.cos(phi)
+    z += l3 * math.sin(phi)
+    return r * math.cos(yaw), r * math.sin(yaw), z
+
+
+def bench_kinematics(n):
+    import numpy as np
+    from .kinematics import ArmModel, DEFAULT_LINKS
+    arm = ArmModel()
+    poses = np.random.default_rng(0).uniform(0, 180, (n, 6))
+    t0 = time.perf_counter()
+    tips = arm.end_effector(poses)
+    vector = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    arm.forward(poses)
+    full = time.perf_counter() - t0
+    rows = poses.tolist()
+    t0 = time.perf_counter()
+    scalar = [_fk_scalar(p, DEFAULT_LINKS) for p in rows]
+    loop = time.perf_counter() - t0
+    return {
+        "poses": n,
+        "end_effector_ms": vector * 1000.0,
+        "forward_all_joints_ms": full * 1000.0,
+        "python_loop_ms": loop * 1000.0,
+        "max_abs_diff": float(np.abs(tips - np.array(scalar)).max()),
+    }
+
+
+def bench_ik(n):
+    import tempfile
+    import numpy as np
+    from .ik import IKSolver
+    from .kinematics import ArmModel
+    with tempfile.TemporaryDirectory() as cache:
+        t0 = time.perf_counter()
+        solver = IKSolver(cache_dir=cache)
+        build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        solver = IKSolver(cache_dir=cache)
+        cached = time.perf_counter() - t0
+
+    poses = np.random.default_rng(0).uniform(0, 180, (4 * n, 6))
+    tips = ArmModel().end_effector(poses)
+    targets = [tuple(p) for p in tips[tips[:, 2] > 0][:n]]
+    times, errors = [], []
+    for target in targets:
+        t0 = time.perf_counter()
+        sol = solver.solve(target)
+        times.append(time.perf_counter() - t0)
+        errors.append(sol.error)
+    # Loop kontrol: target bergeser sedikit, seed = pose sebelumnya
+    warm = []
+    sol = solver.solve((200.0, 0.0, 150.0))
+    for k in range(n):
+        t0 = time.perf_counter()
+        sol = solver.solve((200.0, 0.1 * k, 150.0), seed=sol.pose)
+        warm.append(time.perf_counter() - t0)
+    return {
+        "table_points": len(solver.points),
+        "build_ms": build * 1000.0,
+        "cached_load_ms": cached * 1000.0,
+        "solve": _stats(times),
+        "solve_warm": _stats(warm),
+        # Error posisi setelah pembulatan ke 1° (satuan panjang link)
+        "error_p50": float(np.percentile(errors, 50)),
+        "error_p95": float(np.percentile(errors, 95)),
+    }
+
+
+def run(quick=False, sim=True):
+    calls = 20000 if quick else 200000
+    seconds = 0.5 if quick else 2.0
+    rounds = 10 if quick else 50
+
+    results = {
+        "encode": bench_encode(calls),
+        "null_throughput": bench_null_throughput(seconds),
+        "i2c": bench_i2c(rounds),
+    }
+    try:
+        results["kinematics"] = bench_kinematics(10000 if quick else 100000)
+    except ImportError as e:
+        results["kinematics"] = {"skipped": str(e)}
+    try:
+        results["ik"] = bench_ik(200 if quick else 2000)
+    except ImportError as e:
+        results["ik"] = {"skipped": str(e)}
+
+    if sim:
+        try:
+            from .sim import BoardSimulator
+            board = BoardSimulator()
+            port = board.open()
+        except (ImportError, OSError) as e:
+            results["sim"] = {"skipped": str(e)}
+        else:
+            try:
+                driver = open_serial(port, pacer=Pacer(baudrate=9600))
+                try:
+                    results["sim_throughput"] = bench_sim_throughput(board, driver, seconds)
+                    results["sim_latency"] = bench_sim_latency(board, driver, rounds)
+                    results["sim_animation"] = bench_sim_animation(board, driver, 25.0, 90.0)
+                finally:
+                    driver.close()
+            finally:
+                board.close()
+
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "implementation": sys.implementation.name,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark yahboom servo library')
+    parser.add_argument('-o', '--output', default='bench.json',
+                        help='File JSON hasil (default: bench.json, "-" untuk stdout)')
+    parser.add_argument('--quick', action='store_true',
+                        help='Versi singkat untuk CI')
+    parser.add_argument('--no-sim', action='store_true',
+                        help='Lewati benchmark simulator pty')
+    args = parser.parse_args()
+
+    report = run(quick=args.quick, sim=not args.no_sim)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding:utf-8 -*-
+"""
+Scene retained-mode di atas tkinter Canvas.
+
+Kode gambar tetap ditulis seperti biasa (create_line, create_oval, ...),
+tapi item hanya dibuat pada frame pertama. Frame berikutnya memakai ulang
+item yang sama sesuai urutan panggilan dan hanya memanggil coords()/
+itemconfig(text=...) jika nilainya berubah, jadi tidak ada delete("all")
+dan pembuatan ulang ~20 item setiap slider bergerak.
+
+Syarat: setiap frame harus menggambar item yang sama dengan urutan yang
+sama. Hanya koordinat dan text yang dianggap dinamis; opsi lain (fill,
+width, font, ...) dipakai saat item dibuat saja.
+
+Example:
+    scene = CanvasScene(canvas)
+
+    def render():
+        scene.begin()
+        scene.create_line(0, 0, x, y, fill="blue", width=8)
+        scene.create_text(x, y, text=f"{angle}°")
+"""
+
+
+class CanvasScene:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._items = []
+        # (coords, text) terakhir per item
+        self._state = []
+        self._next = 0
+
+    def begin(self):
+        """Mulai frame baru"""
+        self._next = 0
+
+    def _item(self, kind, coords, opts):
+        i = self._next
+        self._next += 1
+        text = opts.get("text")
+        if i == len(self._items):
+            item = getattr(self.canvas, "create_" + kind)(*coords, **opts)
+            self._items.append(item)
+            self._state.append((coords, text))
+            return item
+        item = self._items[i]
+        old_coords, old_text = self._state[i]
+        if coords != old_coords:
+            self.canvas.coords(item, *coords)
+        if text != old_text:
+            self.canvas.itemconfig(item, text=text)
+        self._state[i] = (coords, text)
+        return item
+
+    def create_line(self, *coords, **opts):
+        return self._item("line", coords, opts)
+
+    def create_oval(self, *coords, **opts):
+        return self._item("oval", coords, opts)
+
+    def create_rectangle(self, *coords, **opts):
+        return self._item("rectangle", coords, opts)
+
+    def create_arc(self, *coords, **opts):
+        return self._item("arc", coords, opts)
+
+    def create_text(self, *coords, **opts):
+        return self._item("text", coords, opts)
+
+    def clear(self):
+        """Hapus semua item (mis. jika struktur gambar berubah)"""
+        for item in self._items:
+            self.canvas.delete(item)
+        self._items = []
+        self._state = []
+        self._next = 0
@@ -0,0 +1,329 @@
+# -*- coding:utf-8 -*-
+"""
+Koreografi baris-per-baris yang diputar sebagai pipeline generator.
+
+File dibaca malas (lazy) satu baris demi satu baris, lalu melewati
+tahap-tahap generator:
+
+    read_lines -> parse -> interpolate -> quantize -> perform (send)
+
+Setiap tahap hanya menyimpan state per channel (maksimal 16 nilai) dan satu
+keyframe, jadi memori tetap sama untuk show 10 detik maupun berjam-jam,
+baik dari file maupun stdin.
+
+Format (boleh dicampur, baris kosong dan baris '#' diabaikan):
+
+  NDJSON, satu keyframe per baris:
+    {"t": 0.0, "pose": [90, 90, 90, 90, 90, 90]}
+    {"t": 1.5, "servos": {"2": 60, "3": 120}, "ease": "minjerk"}
+    {"t": 3.0, "pose": [90, 45], "first": 2}
+    {"t": 4.0, "pattern": "Reach Up"}            # nama pose dari `patterns`
+
+  CSV, satu channel per baris (baris header opsional):
+    t,servo,angle,ease
+    1.5,2,60,minjerk
+    1.5,3,120,minjerk
+
+`t` adalah detik sejak awal show dan tidak boleh mundur. Keyframe pada
+waktu t berarti: channel yang disebut bergerak dari nilainya di keyframe
+sebelumnya dan tiba tepat pada t dengan easing `ease` (nama di
+trajectory.PROFILES atau "step"); channel lain diam. Baris berurutan dengan
+t yang sama digabung menjadi satu keyframe.
+
+Example:
+    perform("show.ndjson", driver)                  # file
+    perform("-", driver, speed=0.5)                 # stdin
+
+    python -m yahboom.choreo show.ndjson -p /dev/ttyUSB0
+    python -m yahboom.choreo - --dry-run < show.csv
+"""
+
+import collections
+import json
+import math
+import sys
+import time
+
+from .driver import NUM_CHANNELS, check
+from .trajectory import DEFAULT_RATE, PROFILES
+
+# targets: list (servo, sudut, easing)
+Keyframe = collections.namedtuple("Keyframe", "time targets")
+
+
+def _step(s):
+    return 1.0 if s >= 1.0 else 0.0
+
+
+# nama -> u(s) untuk s di 0..1
+EASINGS = {name: shape for name, (shape, _, _) in PROFILES.items()}
+EASINGS["step"] = _step
+
+
+def read_lines(source):
+    """
+    Generator baris dari path file, "-" (stdin), file object atau iterable string.
+
+    Baris kosong dan komentar '#' dilewati. Return pasangan (nomor baris, teks).
+    """
+    if source == "-":
+        source = sys.stdin
+    if isinstance(source, str):
+        with open(source, "r") as f:
+            for item in read_lines(f):
+                yield item
+        return
+    for lineno, line in enumerate(source, start=1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield lineno, line
+
+
+def _parse_json(obj, patterns):
+    targets = []
+    if "pattern" in obj:
+        if patterns is None or obj["pattern"] not in patterns:
+            raise ValueError("Pattern tidak dikenal: %r" % (obj["pattern"],))
+        pose = patterns[obj["pattern"]]
+    else:
+        pose = obj.get("pose", ())
+    first = int(obj.get("first", 1))
+    targets.extend(zip(range(first, first + len(pose)), pose))
+    targets.extend((int(ch), angle) for ch, angle in obj.get("servos", {}).items())
+    return float(obj["t"]), targets, obj.get("ease")
+
+
+def _parse_csv(line):
+    fields = [f.strip() for f in line.split(",")]
+    if len(fields) < 3:
+        raise ValueError("Baris CSV harus berisi t,servo,angle[,ease]")
+    ease = fields[3] if len(fields) > 3 and fields[3] else None
+    return float(fields[0]), [(int(fields[1]), int(fields[2]))], ease
+
+
+def parse(lines, patterns=None, ease="linear"):
+    """
+    Generator Keyframe dari baris (nomor, teks) hasil read_lines().
+
+    Args:
+        patterns: Mapping nama -> pose untuk key "pattern" (dict atau PatternStore)
+        ease: Easing default untuk baris tanpa "ease"
+
+    Raise ValueError (dengan nomor baris) untuk baris tidak valid atau t mundur.
+    """
+    pending = None
+    last_t = None
+    for lineno, line in lines:
+        try:
+            if line.startswith("{"):
+                t, targets, line_ease = _parse_json(json.loads(line), patterns)
+            else:
+                try:
+                    t, targets, line_ease = _parse_csv(line)
+                except ValueError:
+                    if last_t is None and pending is None:
+                        continue  # header CSV
+                    raise
+            line_ease = line_ease or ease
+            if line_ease not in EASINGS:
+                raise ValueError("Easing tidak dikenal: %r" % (line_ease,))
+            if not targets:
+                raise ValueError("Keyframe tanpa servo")
+            for ch, angle in targets:
+                check(ch, angle)
+            targets = [(ch, angle, line_ease) for ch, angle in targets]
+            if math.isnan(t) or (last_t is not None and t < last_t):
+                raise ValueError("Waktu tidak boleh mundur (%s setelah %s)" % (t, last_t))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError("Baris %d: %s" % (lineno, e))
+
+        if pending is not None and t == pending.time:
+            # Baris dengan t yang sama = satu keyframe
+            pending.targets.extend(targets)
+        else:
+            if pending is not None:
+                yield pending
+            pending = Keyframe(t, targets)
+        last_t = t
+    if pending is not None:
+        yield pending
+
+
+def interpolate(keyframes, rate=DEFAULT_RATE, start=None):
+    """
+    Generator (t, {servo: sudut float}) pada grid 1/rate detik.
+
+    Setiap sampel hanya berisi channel yang sedang bergerak. Sampel juga
+    dikeluarkan tepat di waktu setiap keyframe, jadi target selalu tercapai.
+
+    Args:
+        rate: Frekuensi sampel (Hz)
+        start: Posisi awal {servo: sudut} opsional; tanpa ini channel yang
+               belum diketahui posisinya melompat ke target keyframe pertama
+    """
+    if rate <= 0:
+        raise ValueError("Rate harus > 0")
+    current = [None] * (NUM_CHANNELS + 1)
+    if start:
+        for ch, angle in (start.items() if hasattr(start, "items") else start):
+            current[ch] = float(angle)
+    t_prev = 0.0 if start else None
+    for kf in keyframes:
+        # Channel berulang dalam satu keyframe: nilai terakhir yang dipakai
+        targets = {}
+        for ch, b, ease in kf.targets:
+            targets[ch] = (float(b), EASINGS[ease])
+        if t_prev is not None and kf.time > t_prev:
+            begin = [(ch, current[ch], b, shape) for ch, (b, shape) in targets.items()
+                     if current[ch] is not None and current[ch] != b]
+            span = kf.time - t_prev
+            k = int(math.floor(t_prev * rate)) + 1
+            while begin:
+                t = k / rate
+                if t >= kf.time - 1e-9:
+                    break
+                s = (t - t_prev) / span
+                sample = {}
+                for ch, a, b, shape in begin:
+                    current[ch] = a + (b - a) * shape(s)
+                    sample[ch] = current[ch]
+                yield t, sample
+                k += 1
+        for ch, (b, _) in targets.items():
+            current[ch] = float(b)
+        yield kf.time, {ch: b for ch, (b, _) in targets.items()}
+        t_prev = kf.time
+
+
+def quantize(samples):
+    """
+    Generator (t, [(servo, sudut int)]) yang hanya berisi channel yang
+    sudut bulatnya berubah. Sampel tanpa perubahan dilewati.
+    """
+    last = [None] * (NUM_CHANNELS + 1)
+    for t, sample in samples:
+        changed = []
+        for ch, value in sample.items():
+            angle = int(round(value))
+            if last[ch] != angle:
+                last[ch] = angle
+                changed.append((ch, angle))
+        if changed:
+            yield t, changed
+
+
+def stream(source, patterns=None, ease="linear", rate=DEFAULT_RATE, start=None):
+    """Pipeline lengkap: source -> (t, [(servo, sudut)]) siap kirim"""
+    return quantize(interpolate(parse(read_lines(source), patterns, ease), rate, start))
+
+
+def perform(source, driver, speed=1.0, patterns=None, ease="linear", rate=DEFAULT_RATE,
+            start=None, clock=time.monotonic, sleep=time.sleep, stop=None):
+    """
+    Putar koreografi dengan deadline absolut.
+
+    Jika pemutar tertinggal, perubahan dari sampel yang sudah lewat
+    deadline-nya digabung ke batch berikutnya (nilai terakhir per servo),
+    jadi tidak ada target yang hilang dan show tetap selesai tepat waktu.
+
+    Args:
+        source: Path file, "-" (stdin), file object atau iterable baris
+        driver: Driver dengan set_many(), ServoWriter (post_many) atau
+                callable send(list pasangan (servo, sudut))
+        speed: Skala waktu (2.0 = dua kali lebih cepat)
+        stop: Callable opsional, return True untuk berhenti
+
+    Return: jumlah batch yang dikirim
+    """
+    if speed <= 0:
+        raise ValueError("Speed harus > 0")
+    if callable(driver):
+        send = driver
+    else:
+        send = getattr(driver, "set_many", None) or driver.post_many
+    pending = [None] * (NUM_CHANNELS + 1)
+    order = []
+    sent = 0
+    t0 = clock()
+    it = stream(source, patterns, ease, rate, start)
+    item = next(it, None)
+    while item is not None:
+        if stop is not None and stop():
+            break
+        t, changed = item
+        delay = t0 + t / speed - clock()
+        if delay > 0:
+            sleep(delay)
+        for ch, angle in changed:
+            if pending[ch] is None:
+                order.append(ch)
+            pending[ch] = angle
+        item = next(it, None)
+        # Tertinggal: sampel berikutnya juga sudah jatuh tempo, gabungkan
+        if item is not None and t0 + item[0] / speed <= clock():
+            continue
+        send([(ch, pending[ch]) for ch in order])
+        for ch in order:
+            pending[ch] = None
+        del order[:]
+        sent += 1
+    return sent
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Putar file koreografi (NDJSON/CSV) secara streaming')
+    parser.add_argument('source', help='File koreografi, atau - untuk stdin')
+    parser.add_argument('-p', '--port', default=None,
+                        help='Serial port, mis. COM3 atau /dev/ttyUSB0 (atau i2c:1)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help='Frekuensi interpolasi dalam Hz (default: %g)' % DEFAULT_RATE)
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Skala waktu (default: 1.0)')
+    parser.add_argument('--ease', default='linear', choices=sorted(EASINGS),
+                        help='Easing untuk keyframe tanpa "ease" (default: linear)')
+    parser.add_argument('--patterns', default=None, metavar='FILE',
+                        help='Pattern tambahan untuk key "pattern": library SQLite GUI '
+                             '(patterns.db) atau JSON {nama: [sudut, ...]}; '
+                             'pose bawaan GUI (Home Position, ...) selalu tersedia')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Jangan kirim ke board, cetak setiap batch ke stdout')
+    args = parser.parse_args()
+    if args.port is None and not args.dry_run:
+        parser.error("Berikan --port atau --dry-run")
+    if args.speed <= 0 or args.rate <= 0:
+        parser.error("Speed dan rate harus lebih besar dari 0")
+
+    from .patterns import BUILTIN_PATTERNS, PatternStore
+    patterns = BUILTIN_PATTERNS
+    if args.patterns is not None:
+        if PatternStore.is_database(args.patterns):
+            loaded = PatternStore(args.patterns)
+        else:
+            with open(args.patterns, 'r') as f:
+                loaded = json.load(f)
+        # Pattern dari file menang atas pose bawaan dengan nama sama
+        patterns = collections.ChainMap(loaded, BUILTIN_PATTERNS)
+
+    if args.dry_run:
+        # Tanpa timing: stream langsung ke stdout (bisa di-pipe)
+        for t, changed in stream(args.source, patterns, args.ease, args.rate):
+            print("%.3f %s" % (t / args.speed, " ".join("%d:%d" % c for c in changed)))
+        return
+
+    from .multi import open_board
+    driver = open_board(args.port)
+    try:
+        batches = perform(args.source, driver, speed=args.speed, patterns=patterns,
+                          ease=args.ease, rate=args.rate)
+        driver.flush()
+        print("OK %d batch dikirim" % batches)
+    except KeyboardInterrupt:
+        print("\nDihentikan oleh user (Ctrl+C)")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
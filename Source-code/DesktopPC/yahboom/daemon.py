@@ -0,0 +1,391 @@
+# -*- coding:utf-8 -*-
+"""
+Daemon servo lokal: satu proses memegang port serial, banyak client
+(GUI, script, CLI) berbagi board lewat UNIX socket dan TCP localhost.
+
+Daemon memakai AsyncServoController (yahboom/aio.py), jadi permintaan dari
+semua client yang datang selama port masih sibuk digabung per channel
+(nilai terbaru menang) ke satu write() berikutnya. Setiap permintaan
+dijawab ack berisi nomor urutnya setelah frame-nya (atau frame pengganti
+yang lebih baru) ditulis ke port. Client tidak perlu open()/close() port
+lagi: satu perintah = satu round trip socket.
+
+Protokol biner (little-endian), boleh di-pipeline:
+
+  request  op:u8  n:u8  seq:u16  lalu n pasang (servo:u8, angle:u8)
+  ack      seq:u16  status:u8
+
+  op   OP_PING  (0)  ack langsung (cek koneksi / ukur round trip)
+       OP_SET   (1)  gerakkan n servo; ack saat frame ditulis ke port
+       OP_DRAIN (2)  ack saat semua target sudah keluar dari kabel
+
+  status  STATUS_OK (0), STATUS_BAD_REQUEST (1), STATUS_IO_ERROR (2),
+          STATUS_CLOSED (3)
+
+Hanya POSIX (Linux/macOS), sama seperti yahboom.aio.
+
+Example:
+    python -m yahboom.daemon /dev/ttyUSB0               # socket default + TCP 9107
+
+    driver = DaemonDriver()                             # seperti ServoDriver
+    driver.set_pose([90, 60, 120, 90, 90, 45])
+    driver.flush()
+"""
+
+import asyncio
+import os
+import socket
+import struct
+import tempfile
+
+from .driver import FRAME_LEN, NUM_CHANNELS, BaseDriver, check, _clock
+
+OP_PING = 0
+OP_SET = 1
+OP_DRAIN = 2
+
+STATUS_OK = 0
+STATUS_BAD_REQUEST = 1
+STATUS_IO_ERROR = 2
+STATUS_CLOSED = 3
+
+REQUEST = struct.Struct("<BBH")
+ACK = struct.Struct("<HB")
+
+DEFAULT_TCP_PORT = 9107
+DEFAULT_SOCKET = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+                              "yahboom-servo.sock")
+
+
+def _status(task):
+    if task.cancelled():
+        return STATUS_CLOSED
+    error = task.exception()
+    if error is None:
+        return STATUS_OK
+    if isinstance(error, ValueError):
+        return STATUS_BAD_REQUEST
+    if isinstance(error, RuntimeError):
+        return STATUS_CLOSED
+    return STATUS_IO_ERROR
+
+
+def _remove_stale(path):
+    """Hapus socket sisa daemon yang sudah mati; raise jika daemon masih jalan"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError("Daemon lain sudah berjalan di %s" % path)
+
+
+class ServoDaemon:
+    """
+    Server request/ack di atas satu AsyncServoController.
+
+    Args:
+        ctrl: AsyncServoController yang memegang port
+    """
+
+    def __init__(self, ctrl):
+        self.ctrl = ctrl
+        self.servers = []
+        self.socket_path = None
+        self.clients = 0
+        self.requests = 0
+
+    async def start(self, path=DEFAULT_SOCKET, host="127.0.0.1", port=DEFAULT_TCP_PORT):
+        """
+        Mulai mendengarkan. path=None mematikan UNIX socket, port=None
+        mematikan TCP (port=0 = pilih port bebas).
+        """
+        if path is not None:
+            _remove_stale(path)
+            self.servers.append(await asyncio.start_unix_server(self._client, path))
+            self.socket_path = path
+        if port is not None:
+            self.servers.append(await asyncio.start_server(self._client, host, port))
+        if not self.servers:
+            raise ValueError("Aktifkan minimal satu dari UNIX socket atau TCP")
+        return self
+
+    @property
+    def tcp_port(self):
+        for server in self.servers:
+            for sock in server.sockets:
+                if sock.family in (socket.AF_INET, socket.AF_INET6):
+                    return sock.getsockname()[1]
+        return None
+
+    async def serve_forever(self):
+        await asyncio.gather(*(server.serve_forever() for server in self.servers))
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+        self.servers = []
+        if self.socket_path is not None:
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            self.socket_path = None
+
+    def _ack(self, writer, seq, status):
+        if not writer.is_closing():
+            writer.write(ACK.pack(seq, status))
+
+    def _submit(self, op, payload):
+        # Return coroutine yang selesai saat request boleh di-ack, atau None (ack langsung)
+        if op == OP_PING:
+            return None
+        if op == OP_DRAIN:
+            return self.ctrl.drain()
+        if op == OP_SET:
+            targets = [(payload[i], payload[i + 1]) for i in range(0, len(payload), 2)]
+            for ch, angle in targets:
+                check(ch, angle)
+            return self.ctrl.set_many(targets)
+        raise ValueError("Op tidak dikenal: %d" % op)
+
+    async def _client(self, reader, writer):
+        self.clients += 1
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST.size)
+                    op, n, seq = REQUEST.unpack(header)
+                    payload = await reader.readexactly(2 * n) if n else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self.requests += 1
+                try:
+                    work = self._submit(op, payload)
+                except ValueError:
+                    self._ack(writer, seq, STATUS_BAD_REQUEST)
+                    continue
+                if work is None:
+                    self._ack(writer, seq, STATUS_OK)
+                    continue
+                # Tidak di-await: request berikutnya dari client ini (pipeline)
+                # ikut digabung ke write() yang sama
+                task = asyncio.ensure_future(work)
+                task.add_done_callback(lambda t, seq=seq: self._ack(writer, seq, _status(t)))
+        finally:
+            self.clients -= 1
+            writer.close()
+
+
+class DaemonDriver(BaseDriver):
+    """
+    Client daemon dengan interface driver biasa (set, set_many, set_pose,
+    flush, close), jadi bisa dipakai di mana pun ServoDriver dipakai.
+
+    Recorder dan metrics bekerja seperti driver lain; byte yang dilaporkan
+    = byte frame yang diminta ke daemon. Tidak seperti driver lain, frame
+    yang sama dengan shadow tetap dikirim: client lain bisa sudah
+    menggerakkan servo yang sama, jadi shadow satu client tidak
+    mencerminkan isi board. Shadow hanya dipakai refresh().
+
+    Args:
+        address: Path UNIX socket, "host:port" atau (host, port).
+                 None = DEFAULT_SOCKET jika ada, selain itu TCP localhost
+        timeout: Timeout socket (detik)
+    """
+
+    def __init__(self, address=None, timeout=5.0):
+        BaseDriver.__init__(self)
+        if address is None:
+            address = DEFAULT_SOCKET if os.path.exists(DEFAULT_SOCKET) \
+                else ("127.0.0.1", DEFAULT_TCP_PORT)
+        if isinstance(address, str) and ":" in address and not os.path.exists(address):
+            host, port = address.rsplit(":", 1)
+            address = (host or "127.0.0.1", int(port))
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(address)
+        except OSError:
+            self.sock.close()
+            raise
+        self.address = address
+        self._seq = 0
+        self._acks = {}
+        self._rbuf = bytearray()
+
+    def post(self, op, targets=()):
+        """Kirim request tanpa menunggu ack (pipeline); return seq"""
+        if len(targets) > 255:
+            raise ValueError("Maksimal 255 servo per request")
+        seq = self._seq
+        self._seq = (seq + 1) & 0xFFFF
+        data = bytearray(REQUEST.pack(op, len(targets), seq))
+        for ch, angle in targets:
+            data.append(ch)
+            data.append(angle)
+        self.sock.sendall(data)
+        self._acks[seq] = None
+        return seq
+
+    def wait(self, seq=None):
+        """
+        Tunggu ack satu request (atau semua yang masih jalan jika seq=None).
+
+        Raise ValueError (request ditolak), OSError (port daemon error) atau
+        KeyError jika seq tidak pernah dikirim atau ack-nya sudah diambil.
+        """
+        if seq is not None and seq not in self._acks:
+            # Tanpa ini loop di bawah menunggu ack yang tidak akan datang
+            raise KeyError("Request %d tidak sedang menunggu ack" % seq)
+        pending = [seq] if seq is not None else list(self._acks)
+        for s in pending:
+            while self._acks.get(s) is None:
+                self._read_ack()
+            status = self._acks.pop(s)
+            if status == STATUS_BAD_REQUEST:
+                raise ValueError("Daemon menolak request %d" % s)
+            if status == STATUS_IO_ERROR:
+                raise OSError("Daemon gagal menulis ke port (request %d)" % s)
+            if status == STATUS_CLOSED:
+                raise OSError("Daemon sudah menutup port")
+
+    def _read_ack(self):
+        while len(self._rbuf) < ACK.size:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("Koneksi ke daemon terputus")
+            self._rbuf += chunk
+        seq, status = ACK.unpack_from(self._rbuf)
+        del self._rbuf[:ACK.size]
+        if seq in self._acks:
+            self._acks[seq] = status
+
+    def _send(self, targets):
+        metrics = self.metrics
+        t0 = _clock()
+        try:
+            self.wait(self.post(OP_SET, targets))
+        except Exception:
+            self.invalidate()
+            if metrics is not None:
+                metrics.write_errors += 1
+                metrics.frames_dropped += len(targets)
+            raise
+        if metrics is not None:
+            dt = _clock() - t0
+            metrics.wrote(len(targets), len(targets) * FRAME_LEN, dt)
+            metrics.set_to_wire_seconds.observe(dt)
+        if self.recorder is not None:
+            t = self.recorder.clock()
+            for ch, angle in targets:
+                self.recorder.record(ch, angle, t)
+        return len(targets) * FRAME_LEN
+
+    def set(self, ch, angle, force=False):
+        """Gerakkan satu servo; return byte frame yang dikirim"""
+        return self.set_many([(ch, angle)], force)
+
+    def set_many(self, targets, force=False):
+        """
+        Gerakkan beberapa servo dengan satu request; return byte frame yang dikirim.
+
+        Selalu dikirim (force tidak berpengaruh), lihat docstring kelas.
+        """
+        if hasattr(targets, "items"):
+            targets = targets.items()
+        latest = [None] * (NUM_CHANNELS + 1)
+        order = []
+        for ch, angle in targets:
+            check(ch, angle)
+            if latest[ch] is None:
+                order.append(ch)
+            latest[ch] = angle
+        if not order:
+            return 0
+        batch = [(ch, latest[ch]) for ch in order]
+        sent = self._send(batch)
+        for ch, angle in batch:
+            self.shadow[ch] = angle
+        return sent
+
+    def ping(self):
+        """Round trip ke daemon (detik)"""
+        t0 = _clock()
+        self.wait(self.post(OP_PING))
+        return _clock() - t0
+
+    def flush(self):
+        """Tunggu sampai daemon selesai mengirim semua target ke kabel"""
+        self.wait(self.post(OP_DRAIN))
+
+    def close(self):
+        self.sock.close()
+
+
+async def serve(port, path=DEFAULT_SOCKET, host="127.0.0.1", tcp_port=DEFAULT_TCP_PORT, ready=None):
+    """Buka port serial dan jalankan daemon sampai dibatalkan"""
+    from .aio import AsyncServoController
+    from .pacing import Pacer
+    # Maksimal satu batch antri di port: sisanya digabung di slot per channel
+    ctrl = AsyncServoController.open(port, pacer=Pacer(baudrate=9600, max_queue=96))
+    daemon = ServoDaemon(ctrl)
+    try:
+        await daemon.start(path, host, tcp_port)
+        if ready is not None:
+            ready(daemon)
+        await daemon.serve_forever()
+    finally:
+        daemon.close()
+        ctrl.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Daemon servo: pegang port serial, layani banyak client lewat socket')
+    parser.add_argument('port', nargs='?', default='auto',
+                        help='Serial port, mis. /dev/ttyUSB0 (atau /dev/pts/N dari yahboom.sim); '
+                             'default: auto (cari lewat identitas USB, lihat yahboom.discover)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                        help='Path UNIX socket (default: %s)' % DEFAULT_SOCKET)
+    parser.add_argument('--no-socket', action='store_true', help='Jangan buka UNIX socket')
+    parser.add_argument('--host', default='127.0.0.1', help='Alamat TCP (default: 127.0.0.1)')
+    parser.add_argument('--tcp', type=int, default=DEFAULT_TCP_PORT,
+                        help='Port TCP (default: %d, 0 = matikan TCP)' % DEFAULT_TCP_PORT)
+    args = parser.parse_args()
+    from .discover import resolve
+    try:
+        args.port = resolve(args.port)
+    except OSError as e:
+        parser.exit(1, "ERROR: %s\n" % e)
+
+    def ready(daemon):
+        where = []
+        if daemon.socket_path:
+            where.append(daemon.socket_path)
+        if daemon.tcp_port:
+            where.append("%s:%d" % (args.host, daemon.tcp_port))
+        print("Daemon siap untuk %s di %s (Ctrl+C untuk berhenti)" % (args.port, ", ".join(where)))
+
+    try:
+        asyncio.run(serve(args.port, None if args.no_socket else args.socket,
+                          args.host, args.tcp or None, ready))
+    except KeyboardInterrupt:
+        print("\nDaemon dihentikan")
+
+
+if __name__ == "__main__":
+    main()
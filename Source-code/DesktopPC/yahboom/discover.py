@@ -0,0 +1,291 @@
+# -*- coding:utf-8 -*-
+"""
+Temukan port board lewat identitas USB, dengan cache kecil di disk.
+
+Nama /dev/ttyUSB* dan nomor COM bisa berubah setiap reboot, tapi identitas
+adapter USB-serial (VID, PID, serial number, lokasi port USB) tetap.
+find_port() menyimpan identitas board yang terakhir berhasil dibuka per
+nama board. Run berikutnya hanya memeriksa entri itu (di Linux cukup
+membaca sysfs satu device) dan baru melakukan scan penuh comports() + probe
+jika entri itu tidak cocok lagi.
+
+Adapter CH340 tidak punya serial number; untuk adapter seperti itu
+identitasnya adalah lokasi port USB, jadi board harus tetap dicolok di
+port USB yang sama (atau beri match={"location": ...} per board).
+
+Protokol board satu arah (tidak ada balasan) dan setiap frame menggerakkan
+servo, jadi probe default hanya membuka port 9600 8N1. Untuk firmware yang
+membalas, berikan check: callable(serial.Serial) -> bool.
+
+Di Windows/macOS entri cache diverifikasi dengan probe saja (tanpa sysfs);
+nomor COM di Windows memang mengikuti adapter.
+
+Example:
+    port = find_port()                                  # board "default"
+    port = find_port("kaki-kiri", match={"location": "1-1.2"})
+    driver = open_board("auto")                         # lewat spec, lihat multi.py
+"""
+
+import json
+import os
+import sys
+import time
+
+# Field identitas USB yang disimpan (atribut ListPortInfo pyserial)
+IDENTITY = ("vid", "pid", "serial_number", "location")
+
+# Chip USB-serial yang umum di board servo: CH340/CH341/CH9102, CP210x,
+# FTDI, PL2303. Tanpa match, hanya port dengan chip ini yang di-probe
+# (port bawaan seperti /dev/ttyS0 selalu bisa dibuka, probe tidak berarti).
+USB_SERIAL_IDS = frozenset([
+    (0x1A86, 0x7523), (0x1A86, 0x5523), (0x1A86, 0x55D4),
+    (0x10C4, 0xEA60),
+    (0x0403, 0x6001), (0x0403, 0x6015),
+    (0x067B, 0x2303),
+])
+
+CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    or os.path.join(os.path.expanduser("~"), ".cache"),
+    "yahboom", "ports.json")
+
+
+def identity(info):
+    """Dict identitas USB dari ListPortInfo, None jika bukan device USB"""
+    if info is None or info.vid is None:
+        return None
+    return {name: getattr(info, name, None) for name in IDENTITY}
+
+
+def _key(ident):
+    # Serial number jika ada (board boleh pindah port USB), selain itu lokasi
+    if not ident:
+        return None
+    if ident.get("serial_number"):
+        return (ident["vid"], ident["pid"], ident["serial_number"])
+    return (ident["vid"], ident["pid"], None, ident.get("location"))
+
+
+def matches(ident, want):
+    """True jika setiap field want yang bukan None sama dengan ident"""
+    if ident is None:
+        return False
+    return all(value is None or ident.get(name) == value for name, value in want.items())
+
+
+def _sysfs_identity(device):
+    # Linux: identitas satu device dari sysfs, tanpa scan semua port
+    from serial.tools.list_ports_linux import SysFS
+    if not os.path.exists(device):
+        return None
+    return identity(SysFS(device))
+
+
+def load_cache(path=None):
+    """Isi cache {nama: {"device", "identity", "seen"}}; {} jika belum ada/rusak"""
+    try:
+        with open(path or CACHE_PATH) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(cache, path=None):
+    """Tulis cache secara atomik"""
+    path = path or CACHE_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def remember(device, name="default", ident=None, path=None):
+    """
+    Catat device sebagai port board `name`.
+
+    ident: identitas USB (mis. dari scan); None = baca dari sysfs (Linux).
+    Return True jika tercatat; False jika identitas USB tidak diketahui
+    (mis. /dev/pts/N simulator atau Windows tanpa ident).
+    """
+    cache = load_cache(path)
+    entry = cache.get(name)
+    if ident is None:
+        if entry is not None and entry.get("device") == device:
+            return True  # Sudah tercatat, tidak perlu membaca identitas lagi
+        if sys.platform.startswith("linux"):
+            ident = _sysfs_identity(device)
+    if ident is None:
+        return False
+    cache[name] = {"device": device, "identity": ident, "seen": time.time()}
+    try:
+        save_cache(cache, path)
+    except OSError:
+        return False
+    return True
+
+
+def forget(name=None, path=None):
+    """Hapus entri board `name` (None = semua) dari cache"""
+    cache = load_cache(path)
+    if name is None:
+        cache = {}
+    elif cache.pop(name, None) is None:
+        return
+    save_cache(cache, path)
+
+
+def cached_port(name="default", path=None):
+    """
+    Device dari cache jika masih cocok dengan identitasnya, tanpa membuka
+    port; None jika tidak ada atau (di Linux) identitasnya sudah berbeda.
+    """
+    entry = load_cache(path).get(name)
+    if not entry:
+        return None
+    device = entry.get("device")
+    if sys.platform.startswith("linux"):
+        if _key(_sysfs_identity(device)) != _key(entry.get("identity")):
+            return None
+    return device
+
+
+def probe(device, check=None, timeout=0.2):
+    """Buka device 9600 8N1; return True jika terbuka (dan check(ser) True)"""
+    import serial
+    try:
+        ser = serial.Serial(port=device, baudrate=9600, timeout=timeout)
+    except (OSError, ValueError):
+        return False
+    try:
+        return check is None or bool(check(ser))
+    except (OSError, ValueError):
+        return False
+    finally:
+        ser.close()
+
+
+def describe(info):
+    """Satu baris ringkas: device dan identitas USB-nya"""
+    ident = identity(info)
+    if ident is None:
+        return info.device
+    return "%s (%04X:%04X sn=%s loc=%s)" % (
+        info.device, ident["vid"], ident["pid"], ident["serial_number"] or "-",
+        ident["location"] or "-")
+
+
+def candidates(ports, match=None, known=None, claimed=()):
+    """
+    Urutkan port hasil comports() untuk di-probe.
+
+    Dengan match: hanya port yang cocok. Tanpa match: identitas `known`
+    (entri cache lama) dulu, lalu chip USB-serial umum yang tidak
+    tercatat milik board lain (`claimed` = set key identitas).
+    """
+    first, rest = [], []
+    known = _key(known)
+    for info in ports:
+        ident = identity(info)
+        if match is not None:
+            if matches(ident, match):
+                rest.append(info)
+        elif known is not None and _key(ident) == known:
+            first.append(info)
+        elif ident is not None and (ident["vid"], ident["pid"]) in USB_SERIAL_IDS \
+                and _key(ident) not in claimed:
+            rest.append(info)
+    return first + rest
+
+
+def find_port(name="default", match=None, check=None, path=None):
+    """
+    Port board `name`: entri cache dulu, scan penuh hanya jika meleset.
+
+    Pada scan, port dengan identitas yang tercatat untuk `name` dipakai
+    langsung. Tanpa itu hanya satu kandidat yang boleh cocok; jika lebih
+    dari satu (mis. board servo dan Arduino sama-sama CH340) raise OSError
+    berisi daftarnya daripada menebak.
+
+    Args:
+        name: Nama board di cache (untuk beberapa board: "kiri", "kanan", ...)
+        match: Dict field identitas yang wajib sama, mis. {"serial_number": "A9X1"}
+               atau {"vid": 0x1A86, "pid": 0x7523, "location": "1-1.2"}
+        check: Probe tambahan callable(serial.Serial) -> bool
+        path: File cache (default CACHE_PATH)
+
+    Raise OSError jika tidak ada port yang lolos probe.
+    """
+    cache = load_cache(path)
+    entry = cache.get(name)
+    if entry is not None and (match is None or matches(entry.get("identity"), match)):
+        device = cached_port(name, path)
+        if device is not None and probe(device, check):
+            return device
+
+    import serial.tools.list_ports
+    ports = serial.tools.list_ports.comports()
+    known = entry and entry.get("identity")
+    claimed = set(_key(e.get("identity")) for n, e in cache.items() if n != name)
+    found = candidates(ports, match, known, claimed)
+    if known is not None and found and _key(identity(found[0])) == _key(known):
+        # Board yang tercatat hanya pindah nama device
+        found = found[:1]
+    elif len(found) > 1:
+        # Probe hanya membuka port, tidak bisa membedakan board servo dari
+        # Arduino/adapter lain: jangan menebak
+        raise OSError("Beberapa port cocok untuk board %r: %s. Pilih dengan --port "
+                      "atau beri match (lihat python -m yahboom.discover)"
+                      % (name, ", ".join(describe(info) for info in found)))
+    for info in found:
+        if probe(info.device, check):
+            remember(info.device, name, identity(info), path)
+            return info.device
+    raise OSError("Board %r tidak ditemukan (%d port discan)" % (name, len(ports)))
+
+
+def resolve(spec, path=None):
+    """"auto" / "auto:NAMA" -> device hasil find_port(); spec lain dikembalikan apa adanya"""
+    if spec == "auto" or spec.startswith("auto:"):
+        return find_port(spec[5:] or "default", path=path)
+    return spec
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Daftar port serial dengan identitas USB, cari board lewat cache')
+    parser.add_argument('--find', nargs='?', const='default', default=None, metavar='NAME',
+                        help='Cari port board NAME (default: default), cache dulu')
+    parser.add_argument('--forget', nargs='?', const='', default=None, metavar='NAME',
+                        help='Hapus entri NAME dari cache (tanpa NAME: semua)')
+    parser.add_argument('--cache', default=CACHE_PATH, help='File cache (default: %s)' % CACHE_PATH)
+    args = parser.parse_args()
+
+    if args.forget is not None:
+        forget(args.forget or None, args.cache)
+        print("Cache dihapus" if not args.forget else "Entri %r dihapus" % args.forget)
+        return
+    if args.find is not None:
+        t0 = time.perf_counter()
+        try:
+            device = find_port(args.find, path=args.cache)
+        except OSError as e:
+            print("ERROR: %s" % e)
+            sys.exit(1)
+        print("%s (%.1f ms)" % (device, (time.perf_counter() - t0) * 1000.0))
+        return
+
+    import serial.tools.list_ports
+    owners = {}
+    for board, entry in load_cache(args.cache).items():
+        owners[_key(entry.get("identity"))] = board
+    for info in sorted(serial.tools.list_ports.comports(), key=lambda p: p.device):
+        ident = identity(info)
+        owner = owners.get(_key(ident))
+        print(describe(info) + ("  [%s]" % owner if owner else ""))
+
+
+if __name__ == "__main__":
+    main()
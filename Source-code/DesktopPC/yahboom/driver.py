@@ -0,0 +1,383 @@
+# -*- coding:utf-8 -*-
+"""
+Driver UART untuk Yahboom 16 Channel Servo Controller.
+
+Protokol: $[A-P][000-180]# @ 9600bps 8N1
+
+Semua frame (16 channel x 181 sudut) dibuat sekali saat modul di-import,
+sehingga set() hanya melakukan lookup tabel lalu write() - tanpa pembagian
+float, tanpa int(), tanpa bytearray baru per panggilan. Di CPython lookup
+tidak mengalokasi apa pun; di MicroPython setiap lookup membuat satu objek
+memoryview kecil (lihat _FrameRow), harga untuk tabel 17KB alih-alih ~60KB.
+
+Modul ini sengaja hanya memakai fitur Python yang juga ada di MicroPython,
+jadi folder `yahboom` bisa langsung disalin ke Raspberry Pi Pico.
+"""
+
+import sys
+import time
+
+from . import trace
+
+NUM_CHANNELS = 16
+MAX_ANGLE = 180
+FRAME_LEN = 6
+
+START_BYTE = 36  # '$'
+END_BYTE = 35    # '#'
+
+_MICROPYTHON = sys.implementation.name == "micropython"
+_clock = getattr(time, "monotonic", time.time)
+
+
+def _frame_bytes(ch, angle):
+    # $ + ServoChar + Angle(3 digit) + #
+    return bytes((START_BYTE, 64 + ch,
+                  48 + angle // 100, 48 + angle // 10 % 10, 48 + angle % 10,
+                  END_BYTE))
+
+
+if _MICROPYTHON:
+    # Di Pico 2896 objek bytes terlalu boros RAM (~140KB), jadi tabel
+    # disimpan sebagai satu blob 17KB dan tiap baris channel hanya
+    # mengembalikan potongan memoryview dari blob tersebut.
+    #
+    # Trade-off: setiap lookup mengalokasi satu memoryview (16 byte, tanpa
+    # menyalin frame), jadi jalur MicroPython TIDAK bebas alokasi. Menyimpan
+    # 2896 memoryview jadi butuh ~46KB objek + ~12KB tuple, lebih dari tiga
+    # kali blob-nya; di heap Pico (~190KB) itu lebih mahal daripada GC kecil
+    # sesekali. Loop kontrol yang sensitif GC bisa memanggil gc.collect()
+    # di luar bagian yang kritis timing.
+    FRAME_TABLE = b"".join(_frame_bytes(ch, a)
+                           for ch in range(1, NUM_CHANNELS + 1)
+                           for a in range(MAX_ANGLE + 1))
+
+    class _FrameRow:
+        def __init__(self, ch):
+            self._mv = memoryview(FRAME_TABLE)
+            self._base = (ch - 1) * (MAX_ANGLE + 1) * FRAME_LEN
+
+        def __getitem__(self, angle):
+            off = self._base + angle * FRAME_LEN
+            return self._mv[off:off + FRAME_LEN]
+
+    FRAMES = (None,) + tuple(_FrameRow(ch) for ch in range(1, NUM_CHANNELS + 1))
+else:
+    # FRAMES[servo][angle] -> bytes, servo 1-16 (index 0 tidak dipakai)
+    FRAMES = (None,) + tuple(
+        tuple(_frame_bytes(ch, a) for a in range(MAX_ANGLE + 1))
+        for ch in range(1, NUM_CHANNELS + 1)
+    )
+
+
+def check(ch, angle):
+    """
+    Validasi nomor servo (int 1-16) dan sudut (int 0-180), raise ValueError
+    jika salah. Float dan bool ditolak: tabel FRAMES hanya bisa diindeks int.
+    """
+    if type(ch) is not int or not 0 < ch <= NUM_CHANNELS:
+        raise ValueError("Servo number harus int 1-16, bukan %r" % (ch,))
+    if type(angle) is not int or not 0 <= angle <= MAX_ANGLE:
+        raise ValueError("Angle harus int 0-180 derajat, bukan %r" % (angle,))
+
+
+def frame(ch, angle):
+    """
+    Ambil frame siap kirim untuk satu servo.
+
+    Args:
+        ch: Nomor servo (1-16)
+        angle: Sudut servo (int 0-180)
+
+    Example: frame(1, 180) -> b"$A180#"
+    """
+    check(ch, angle)
+    return FRAMES[ch][angle]
+
+
+class BaseDriver:
+    """
+    Interface bersama semua transport (UART, I2C, ...).
+
+    Subclass mengimplementasikan set(ch, angle, force) dan
+    set_many(targets, force) yang mengembalikan jumlah byte yang dikirim;
+    set_all(), set_pose() dan refresh() dibangun di atas set_many().
+
+    Driver menyimpan tabel sudut terakhir yang dikirim per channel (shadow)
+    dan tidak mengirim servo yang sudutnya sama dengan shadow. Pakai
+    force=True atau refresh() untuk tetap kirim. Board tidak bisa dibaca
+    balik, jadi jika resync diberikan shadow dianggap basi setiap `resync`
+    detik dan frame berikutnya tetap dikirim (mis. setelah board reset
+    atau servo sempat tanpa power).
+
+    Jika `recorder` diisi (mis. yahboom.recorder.MotionRecorder), setiap
+    servo yang benar-benar dikirim dicatat dengan record(servo, angle).
+    Begitu juga `metrics` (yahboom.metrics.DriverMetrics): frame, byte,
+    latency write() dan waktu dari set() sampai data di kabel dicatat di
+    sana. Jika yahboom.trace aktif, set()/set_many() dan write() menjadi
+    span trace.
+
+    Args:
+        resync: Interval (detik) untuk membuang shadow (None = tidak pernah)
+    """
+
+    def __init__(self, resync=None):
+        # shadow[servo] -> sudut terakhir yang dikirim (None = belum diketahui)
+        self.shadow = [None] * (NUM_CHANNELS + 1)
+        self.resync = resync
+        self._synced_at = _clock()
+        self.recorder = None
+        self.metrics = None
+
+    def _check_resync(self):
+        if self.resync is not None:
+            now = _clock()
+            if now - self._synced_at >= self.resync:
+                self.invalidate()
+                self._synced_at = now
+
+    def invalidate(self, ch=None):
+        """Lupakan shadow satu servo (atau semua) supaya frame berikutnya pasti dikirim"""
+        if ch is None:
+            for i in range(NUM_CHANNELS + 1):
+                self.shadow[i] = None
+        else:
+            self.shadow[ch] = None
+
+    def _commit(self, written, t):
+        # Servo yang data-nya sudah ditulis: perbarui shadow dan recorder
+        shadow = self.shadow
+        recorder = self.recorder
+        for ch, angle in written:
+            shadow[ch] = angle
+            if recorder is not None:
+                recorder.record(ch, angle, t)
+
+    def wire_time(self):
+        """Perkiraan waktu (_clock) saat data terakhir yang dikirim sampai di kabel"""
+        return _clock()
+
+    def refresh(self):
+        """Kirim ulang semua sudut di shadow. Return byte yang dikirim."""
+        targets = [(ch, a) for ch, a in enumerate(self.shadow) if a is not None]
+        return self.set_many(targets, force=True)
+
+    def set(self, ch, angle, force=False):
+        """Gerakkan satu servo; return byte yang dikirim (0 jika sama dengan shadow)"""
+        raise NotImplementedError
+
+    def set_many(self, targets, force=False):
+        """Gerakkan beberapa servo {servo: angle}; return byte yang dikirim"""
+        raise NotImplementedError
+
+    def set_all(self, angle, channels=NUM_CHANNELS, force=False):
+        """Gerakkan servo 1..channels ke sudut yang sama sekaligus"""
+        return self.set_many(((ch, angle) for ch in range(1, channels + 1)), force)
+
+    def set_pose(self, angles, first=1, force=False):
+        """
+        Kirim pose (list sudut) ke servo berurutan mulai dari `first`.
+
+        Example: set_pose([90, 60, 120, 90, 90, 45]) -> servo 1-6
+        """
+        return self.set_many(zip(range(first, first + len(angles)), angles), force)
+
+    def flush(self):
+        """Tunggu sampai semua data benar-benar terkirim (jika didukung)"""
+
+    def close(self):
+        pass
+
+
+class ServoDriver(BaseDriver):
+    """
+    Driver servo di atas port apa saja yang punya method write().
+
+    Bisa dipakai dengan serial.Serial (pyserial) di PC/Raspberry Pi/Jetson
+    maupun machine.UART di MicroPython. Driver tidak membuka/menutup port
+    sendiri kecuali close() dipanggil.
+
+    set_many()/set_all()/set_pose() menyusun semua frame ke satu buffer
+    yang dialokasikan sekali lalu memanggil write() satu kali, jadi 16 servo
+    hanya butuh 96 byte (~100ms @ 9600bps) tanpa sleep di antaranya.
+
+    Jika pacer diberikan (lihat yahboom/pacing.py), setiap write() didahului
+    pacer.wait() sehingga laju kirim mengikuti baudrate dan jeda minimum
+    board. Dengan min_gap > 0 frame batch dikirim satu per satu dengan jeda.
+
+    Frame yang tidak mengubah apa pun dibuang oleh shadow (lihat
+    BaseDriver), karena di 9600bps setiap frame 6 byte yang mubazir
+    menunda frame yang penting.
+
+    Args:
+        port: Object port dengan method write(bytes). Port harus menyalin
+              data saat write() (pyserial dan machine.UART melakukannya),
+              karena buffer batch dipakai ulang.
+        pacer: Pacer opsional (default None = langsung write)
+        resync: Interval (detik) untuk membuang shadow (None = tidak pernah)
+    """
+
+    def __init__(self, port, pacer=None, resync=None):
+        BaseDriver.__init__(self, resync)
+        self.port = port
+        self._write = port.write
+        self._buf = bytearray(NUM_CHANNELS * FRAME_LEN)
+        self._view = memoryview(self._buf)
+        self.pacer = pacer
+        if pacer is not None and pacer.port is None:
+            pacer.port = port
+
+    def _send(self, data, nbytes):
+        pacer = self.pacer
+        metrics = self.metrics
+        tracer = trace.tracer
+        try:
+            waited = pacer.wait(nbytes) if pacer is not None else 0.0
+            if metrics is None and tracer is None:
+                self._write(data)
+            else:
+                t0 = trace.now()
+                self._write(data)
+                dt = trace.now() - t0
+                if metrics is not None:
+                    metrics.wrote(nbytes // FRAME_LEN, nbytes, dt / 1e9, waited)
+                if tracer is not None:
+                    tracer.add("port.write", "io", t0, dt, {"bytes": nbytes})
+            if pacer is not None:
+                pacer.sent(nbytes)
+        except Exception:
+            # Tidak tahu frame mana yang sampai ke board
+            self.invalidate()
+            if metrics is not None:
+                metrics.write_errors += 1
+                metrics.frames_dropped += nbytes // FRAME_LEN
+            raise
+
+    def wire_time(self):
+        """Perkiraan waktu byte terakhir keluar dari port (dari Pacer jika ada)"""
+        if self.pacer is not None:
+            return self.pacer.wire_free
+        return _clock()
+
+    def set(self, ch, angle, force=False):
+        """
+        Gerakkan satu servo (1-16) ke sudut (int 0-180).
+
+        Return: jumlah byte yang dikirim (0 jika servo sudah di sudut itu)
+        """
+        check(ch, angle)
+        self._check_resync()
+        metrics = self.metrics
+        if not force and self.shadow[ch] == angle:
+            if metrics is not None:
+                metrics.frames_skipped += 1
+            return 0
+        if metrics is not None:
+            t0 = _clock()
+        tracer = trace.tracer
+        if tracer is not None:
+            start = trace.now()
+        self._send(FRAMES[ch][angle], FRAME_LEN)
+        # Shadow baru diubah setelah frame benar-benar ditulis
+        self.shadow[ch] = angle
+        if self.recorder is not None:
+            self.recorder.record(ch, angle)
+        if metrics is not None:
+            metrics.set_to_wire_seconds.observe(max(0.0, self.wire_time() - t0))
+        if tracer is not None:
+            tracer.add("driver.set", "driver", start, trace.now() - start,
+                       {"servo": ch, "angle": angle})
+        return FRAME_LEN
+
+    def set_many(self, targets, force=False):
+        """
+        Gerakkan beberapa servo sekaligus dengan satu write().
+
+        Args:
+            targets: dict {servo: angle} atau iterable pasangan (servo, angle)
+            force: Kirim juga servo yang shadow-nya sudah sama
+
+        Return: jumlah byte yang dikirim
+        """
+        if hasattr(targets, "items"):
+            targets = targets.items()
+        # Validasi seluruh batch dulu: target salah tidak mengubah apa pun
+        targets = list(targets)
+        for ch, angle in targets:
+            check(ch, angle)
+        self._check_resync()
+        # Perbandingan memakai salinan shadow; shadow asli hanya diisi
+        # servo yang frame-nya sudah berhasil ditulis (lihat _commit)
+        latest = list(self.shadow)
+        recorder = self.recorder
+        t = recorder.clock() if recorder is not None else None
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = _clock()
+        tracer = trace.tracer
+        if tracer is not None:
+            start = trace.now()
+        # Board butuh jeda antar frame: tidak bisa digabung dalam satu write()
+        per_frame = self.pacer is not None and self.pacer.min_gap > 0
+        buf = self._buf
+        size = len(buf)
+        n = 0
+        sent = 0
+        chunk = []  # (servo, sudut) yang ada di buffer
+        for ch, angle in targets:
+            if not force and latest[ch] == angle:
+                if metrics is not None:
+                    metrics.frames_skipped += 1
+                continue
+            latest[ch] = angle
+            if per_frame:
+                self._send(FRAMES[ch][angle], FRAME_LEN)
+                sent += FRAME_LEN
+                self._commit(((ch, angle),), t)
+                continue
+            if n == size:
+                # Lebih dari 16 frame (channel berulang): kirim yang sudah ada dulu
+                self._send(self._view[:n], n)
+                sent += n
+                n = 0
+                self._commit(chunk, t)
+                chunk = []
+            buf[n:n + FRAME_LEN] = FRAMES[ch][angle]
+            n += FRAME_LEN
+            chunk.append((ch, angle))
+        if n:
+            self._send(self._view[:n], n)
+            sent += n
+            self._commit(chunk, t)
+        if sent and metrics is not None:
+            metrics.set_to_wire_seconds.observe(max(0.0, self.wire_time() - t0))
+        if tracer is not None:
+            tracer.add("driver.set_many", "driver", start, trace.now() - start,
+                       {"frames": sent // FRAME_LEN})
+        return sent
+
+    def flush(self):
+        """Tunggu sampai semua byte benar-benar keluar dari port (jika didukung)"""
+        if self.pacer is not None:
+            self.pacer.drain()
+            return
+        flush = getattr(self.port, "flush", None)
+        if flush is not None:
+            flush()
+
+    def close(self):
+        self.port.close()
+
+
+def open_serial(port, timeout=1, pacer=None, resync=None):
+    """Buka port serial 9600 8N1 (pyserial) dan kembalikan ServoDriver"""
+    import serial
+    ser = serial.Serial(
+        port=port,
+        baudrate=9600,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=timeout
+    )
+    return ServoDriver(ser, pacer, resync)
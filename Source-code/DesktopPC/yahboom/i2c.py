@@ -0,0 +1,231 @@
+# -*- coding:utf-8 -*-
+"""
+Driver I2C untuk Yahboom 16 Channel Servo Controller.
+
+Protokol: tulis register `servo` (1-16) dengan nilai `angle` (0-180) ke
+alamat 0x2D. Interface sama dengan ServoDriver (UART): set(), set_many(),
+set_all(), set_pose(), refresh(), shadow.
+
+Script contoh lama memanggil write_byte_data() lalu time.sleep(0.1) per
+servo (16 servo = 1.6 detik) dan membuka bus di level modul. Driver ini:
+
+  - memakai satu handle SMBus/machine.I2C yang hidup selama driver hidup
+  - block=True: channel berurutan dikirim dalam satu block write
+    (register awal + beberapa sudut). Hanya aktifkan jika firmware board
+    menaikkan nomor register otomatis; ukur sekali per board.
+  - block=False (default): single write dikirim berurutan, dengan jeda
+    minimum `gap` antar transaksi yang hanya ditunggu jika memang belum
+    lewat (tidak ada sleep setelah write terakhir)
+
+Bisa dipakai di Raspberry Pi/Jetson (smbus/smbus2) maupun MicroPython
+(machine.I2C). FakeSMBus disediakan untuk benchmark tanpa bus.
+"""
+
+import time
+
+from . import trace
+from .driver import NUM_CHANNELS, BaseDriver, check, _clock
+
+I2C_ADDR = 0x2D
+
+
+class I2CDriver(BaseDriver):
+    """
+    Args:
+        bus: smbus.SMBus / smbus2.SMBus (write_byte_data, write_i2c_block_data)
+             atau machine.I2C (writeto)
+        address: Alamat I2C board (default 0x2D)
+        block: Gabungkan channel berurutan dalam satu block write
+        gap: Jeda minimum antar transaksi (detik)
+        resync: Interval (detik) untuk membuang shadow (None = tidak pernah)
+    """
+
+    def __init__(self, bus, address=I2C_ADDR, block=False, gap=0.0, resync=None):
+        BaseDriver.__init__(self, resync)
+        self.bus = bus
+        self.address = address
+        self.block = block
+        self.gap = gap
+        self._smbus = hasattr(bus, "write_byte_data")
+        self._ready_at = 0.0
+
+    def _write(self, reg, values):
+        if self.gap > 0:
+            delay = self._ready_at - _clock()
+            if delay > 0:
+                time.sleep(delay)
+        metrics = self.metrics
+        tracer = trace.tracer
+        t0 = trace.now() if metrics is not None or tracer is not None else 0
+        try:
+            if not self._smbus:
+                self.bus.writeto(self.address, bytes([reg] + values))
+            elif len(values) == 1:
+                self.bus.write_byte_data(self.address, reg, values[0])
+            else:
+                self.bus.write_i2c_block_data(self.address, reg, values)
+        except Exception:
+            self.invalidate()
+            if metrics is not None:
+                metrics.write_errors += 1
+                metrics.frames_dropped += len(values)
+            raise
+        if metrics is not None or tracer is not None:
+            dt = trace.now() - t0
+            if metrics is not None:
+                metrics.wrote(len(values), 1 + len(values), dt / 1e9)
+            if tracer is not None:
+                tracer.add("i2c.write", "io", t0, dt, {"reg": reg, "bytes": 1 + len(values)})
+        if self.gap > 0:
+            self._ready_at = _clock() + self.gap
+        return 1 + len(values)
+
+    def set(self, ch, angle, force=False):
+        """
+        Gerakkan satu servo (1-16) ke sudut (int 0-180).
+
+        Return: jumlah byte data yang dikirim (0 jika servo sudah di sudut itu)
+        """
+        check(ch, angle)
+        self._check_resync()
+        metrics = self.metrics
+        if not force and self.shadow[ch] == angle:
+            if metrics is not None:
+                metrics.frames_skipped += 1
+            return 0
+        if metrics is not None:
+            t0 = _clock()
+        tracer = trace.tracer
+        if tracer is not None:
+            start = trace.now()
+        sent = self._write(ch, [angle])
+        # Shadow/recorder baru diubah setelah write berhasil
+        self.shadow[ch] = angle
+        if self.recorder is not None:
+            self.recorder.record(ch, angle)
+        if metrics is not None:
+            metrics.set_to_wire_seconds.observe(_clock() - t0)
+        if tracer is not None:
+            tracer.add("driver.set", "driver", start, trace.now() - start,
+                       {"servo": ch, "angle": angle})
+        return sent
+
+    def set_many(self, targets, force=False):
+        """
+        Gerakkan beberapa servo; channel berulang hanya dikirim nilai terakhirnya.
+
+        Args:
+            targets: dict {servo: angle} atau iterable pasangan (servo, angle)
+            force: Kirim juga servo yang shadow-nya sudah sama
+
+        Return: jumlah byte data yang dikirim
+        """
+        if hasattr(targets, "items"):
+            targets = targets.items()
+        # Validasi seluruh batch dulu: target salah tidak mengubah apa pun
+        pending = [None] * (NUM_CHANNELS + 1)
+        for ch, angle in targets:
+            check(ch, angle)
+            pending[ch] = angle
+        self._check_resync()
+
+        # Perbandingan memakai salinan shadow; shadow asli dan recorder hanya
+        # diisi servo yang sudah berhasil ditulis (lihat _commit)
+        latest = list(self.shadow)
+        recorder = self.recorder
+        # Satu timestamp untuk seluruh batch
+        t = recorder.clock() if recorder is not None else None
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = _clock()
+        tracer = trace.tracer
+        if tracer is not None:
+            start = trace.now()
+        sent = 0
+        run_start = 0
+        run = []
+        for ch in range(1, NUM_CHANNELS + 1):
+            angle = pending[ch]
+            if angle is None:
+                continue
+            if not force and latest[ch] == angle:
+                if metrics is not None:
+                    metrics.frames_skipped += 1
+                continue
+            latest[ch] = angle
+            if not self.block:
+                sent += self._write(ch, [angle])
+                self._commit(((ch, angle),), t)
+                continue
+            if run and run_start + len(run) != ch:
+                sent += self._write(run_start, run)
+                self._commit(zip(range(run_start, ch), run), t)
+                run = []
+            if not run:
+                run_start = ch
+            run.append(angle)
+        if run:
+            sent += self._write(run_start, run)
+            self._commit(zip(range(run_start, run_start + len(run)), run), t)
+        if sent and metrics is not None:
+            metrics.set_to_wire_seconds.observe(_clock() - t0)
+        if tracer is not None:
+            tracer.add("driver.set_many", "driver", start, trace.now() - start,
+                       {"bytes": sent})
+        return sent
+
+    def close(self):
+        close = getattr(self.bus, "close", None)
+        if close is not None:
+            close()
+
+
+def open_i2c(bus=1, address=I2C_ADDR, block=False, gap=0.0, resync=None):
+    """Buka /dev/i2c-<bus> sekali (smbus2 atau smbus) dan kembalikan I2CDriver"""
+    try:
+        from smbus2 import SMBus
+    except ImportError:
+        from smbus import SMBus
+    return I2CDriver(SMBus(bus), address, block, gap, resync)
+
+
+class FakeSMBus:
+    """
+    Pengganti smbus.SMBus untuk benchmark/uji tanpa bus.
+
+    Setiap transaksi dicatat di `log` sebagai (time, address, register,
+    values) dan isi register disimpan di `registers[address]` (block write
+    menaikkan register otomatis). Jika freq diberikan, setiap transaksi
+    memakan waktu bus yang sesuai (9 bit per byte + start/stop).
+
+    Args:
+        freq: Clock I2C (Hz) untuk simulasi waktu, None = instan
+    """
+
+    def __init__(self, freq=None):
+        self.freq = freq
+        self.log = []
+        self.registers = {}
+        self.closed = False
+
+    def _transfer(self, address, reg, values):
+        if self.closed:
+            raise OSError("FakeSMBus sudah ditutup")
+        if self.freq:
+            # alamat + register + data, masing-masing 8 bit + ACK, plus start/stop
+            time.sleep((9 * (2 + len(values)) + 2) / float(self.freq))
+        regs = self.registers.setdefault(address, bytearray(256))
+        for i, v in enumerate(values):
+            regs[(reg + i) & 0xFF] = v
+        self.log.append((_clock(), address, reg, tuple(values)))
+
+    def write_byte_data(self, address, reg, value):
+        self._transfer(address, reg, [value])
+
+    def write_i2c_block_data(self, address, reg, values):
+        if len(values) > 32:
+            raise ValueError("SMBus block write maksimal 32 byte")
+        self._transfer(address, reg, list(values))
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,247 @@
+# -*- coding:utf-8 -*-
+"""
+Inverse kinematics ARM 6DOF dengan seed dari tabel workspace (KD-tree).
+
+Target (x, y, z) diselesaikan dalam tiga langkah:
+
+  1. base yaw dihitung langsung: atan2(y, x). Target di belakang base
+     (di luar jangkauan servo 1) dicapai dengan membalik yaw 180° dan
+     melipat lengan ke belakang (r negatif).
+  2. seed shoulder/elbow/wrist diambil dari tabel workspace: grid sudut
+     servo 2-4 yang sudah dihitung posisinya di bidang vertikal (r, z)
+     dan di-index dengan KD-tree. Tabel di-cache ke disk per geometri.
+  3. seed diperhalus dengan damped least squares (Python murni, 3 joint),
+     dengan batas sudut servo 0-180.
+
+Wrist roll dan gripper tidak mempengaruhi posisi dan diteruskan apa
+adanya. Pitch tangan (sudut elevasi dari horizontal) opsional.
+
+Query biasa selesai dalam ~0.1ms (seed dari pose sebelumnya bisa diberikan),
+cukup untuk loop kontrol 50Hz.
+Butuh NumPy dan SciPy (pip install numpy scipy).
+
+Example:
+    solver = IKSolver(ArmModel(links=(50, 150, 120, 60)))
+    sol = solver.solve((200, 50, 120), pitch=-30)
+    if sol.error < 2.0:
+        driver.set_pose(sol.pose)
+"""
+
+import collections
+import hashlib
+import math
+import os
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .kinematics import ArmModel, sweep
+
+Solution = collections.namedtuple("Solution", "pose error iterations")
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yahboom")
+
+
+def _solve3(a, b):
+    # Eliminasi Gauss untuk sistem kecil (2x2/3x3), a dan b diubah di tempat
+    n = len(b)
+    for i in range(n):
+        p = max(range(i, n), key=lambda r: abs(a[r][i]))
+        a[i], a[p] = a[p], a[i]
+        b[i], b[p] = b[p], b[i]
+        for r in range(i + 1, n):
+            f = a[r][i] / a[i][i]
+            for c in range(i, n):
+                a[r][c] -= f * a[i][c]
+            b[r] -= f * b[i]
+    x = [0.0] * n
+    for i in range(n - 1, -1, -1):
+        x[i] = (b[i] - sum(a[i][c] * x[c] for c in range(i + 1, n))) / a[i][i]
+    return x
+
+
+class IKSolver:
+    """
+    Args:
+        arm: ArmModel (default geometri GUI)
+        step: Jarak grid tabel workspace dalam derajat servo
+        floor: Titik elbow, wrist dan tip di tabel harus di atas z ini
+               (None = tanpa batas)
+        cache: Simpan/muat tabel dari disk (False = selalu hitung ulang)
+        cache_dir: Folder cache (default ~/.cache/yahboom)
+    """
+
+    def __init__(self, arm=None, step=3.0, floor=0.0, cache=True, cache_dir=CACHE_DIR):
+        self.arm = arm if arm is not None else ArmModel()
+        self.step = float(step)
+        self.floor = floor
+        self.cache_dir = cache_dir
+        self.angles, self.points, self.pitch = self._load_table(cache)
+        self.tree = cKDTree(self.points)
+
+        zero, sign = self.arm.zero, self.arm.sign
+        # Batas sudut joint (radian) dari batas servo 0-180
+        self._bounds = []
+        for i in range(5):
+            a = math.radians((0.0 - zero[i]) * sign[i])
+            b = math.radians((180.0 - zero[i]) * sign[i])
+            self._bounds.append((min(a, b), max(a, b)))
+        self._links = [float(v) for v in self.arm.links]
+
+    def cache_path(self):
+        key = repr((self.arm.links.tolist(), self.arm.zero.tolist(), self.arm.sign.tolist(),
+                    self.step, self.floor))
+        return os.path.join(self.cache_dir, "ik_%s.npz" % hashlib.sha1(key.encode()).hexdigest()[:12])
+
+    def _load_table(self, cache):
+        path = self.cache_path()
+        if cache and os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    return data["angles"], data["points"], data["pitch"]
+            except (OSError, KeyError, ValueError):
+                pass  # cache rusak: hitung ulang
+        table = self.build_table()
+        if cache:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = path + ".tmp.npz"
+                np.savez(tmp, angles=table[0], points=table[1], pitch=table[2])
+                os.replace(tmp, path)
+            except OSError:
+                pass  # cache opsional
+        return table
+
+    def build_table(self):
+        """
+        Hitung tabel workspace: sudut servo 2-4 (N, 3), titik (r, z) (N, 2)
+        dan pitch tangan (N,) dalam radian.
+        """
+        n = int(round(180.0 / self.step)) + 1
+        grid = sweep([(0.0, 180.0)] * 3, n)
+        poses = np.empty((len(grid), 5))
+        poses[:, 0] = self.arm.zero[0]
+        poses[:, 1:4] = grid
+        poses[:, 4] = self.arm.zero[4]
+        phi, r, z = self.arm._planar(self.arm.joint_angles(poses))
+        keep = np.ones(len(grid), dtype=bool)
+        if self.floor is not None:
+            keep = z.min(axis=-1) >= self.floor
+        points = np.stack((r[keep, -1], z[keep, -1]), axis=-1)
+        return grid[keep].astype(np.float32), points, phi[keep, -1]
+
+    def _servo(self, i, q):
+        return float(self.arm.zero[i] + math.degrees(q) / self.arm.sign[i])
+
+    def _joint(self, i, servo):
+        return math.radians((servo - self.arm.zero[i]) * self.arm.sign[i])
+
+    def _refine(self, q, r_t, z_t, pitch, tol, max_iter, damping=1e-3):
+        h, l1, l2, l3 = self._links
+        b1, b2, b3 = self._bounds[1], self._bounds[2], self._bounds[3]
+        q1, q2, q3 = q
+        wp = l3  # bobot error pitch (radian -> satuan panjang)
+        err = prev = float("inf")
+        for it in range(max_iter + 1):
+            p1 = q1
+            p2 = p1 + q2
+            p3 = p2 + q3
+            c1, s1 = math.cos(p1), math.sin(p1)
+            c2, s2 = math.cos(p2), math.sin(p2)
+            c3, s3 = math.cos(p3), math.sin(p3)
+            er = r_t - (l1 * c1 + l2 * c2 + l3 * c3)
+            ez = z_t - (h + l1 * s1 + l2 * s2 + l3 * s3)
+            err = math.hypot(er, ez)
+            e = [er, ez]
+            if pitch is not None:
+                ep = (pitch - p3) * wp
+                e.append(ep)
+                err = math.hypot(err, ep)
+            # Selesai, atau tidak ada kemajuan (target di luar jangkauan)
+            if err < tol or it == max_iter or prev - err < tol * 1e-3:
+                break
+            prev = err
+            # Jacobian d(r, z[, pitch]) / d(q1, q2, q3)
+            j3r, j3z = -l3 * s3, l3 * c3
+            j2r, j2z = j3r - l2 * s2, j3z + l2 * c2
+            j1r, j1z = j2r - l1 * s1, j2z + l1 * c1
+            jac = [(j1r, j2r, j3r), (j1z, j2z, j3z)]
+            if pitch is not None:
+                jac.append((wp, wp, wp))
+            # DLS: dq = J^T (J J^T + λ²I)^-1 e
+            m = len(jac)
+            lam = damping * (l1 + l2 + l3) ** 2
+            a = [[sum(x * y for x, y in zip(jac[i], jac[k])) + (lam if i == k else 0.0)
+                  for k in range(m)] for i in range(m)]
+            y = _solve3(a, e)
+            q1 = min(max(q1 + sum(jac[i][0] * y[i] for i in range(m)), b1[0]), b1[1])
+            q2 = min(max(q2 + sum(jac[i][1] * y[i] for i in range(m)), b2[0]), b2[1])
+            q3 = min(max(q3 + sum(jac[i][2] * y[i] for i in range(m)), b3[0]), b3[1])
+        return (q1, q2, q3), err, it
+
+    def solve(self, target, pitch=None, roll=90, gripper=90, seed=None,
+              tol=0.05, max_iter=30, k=4):
+        """
+        Cari pose servo untuk posisi tip `target` = (x, y, z).
+
+        Args:
+            pitch: Sudut elevasi tangan dari horizontal (derajat), None = bebas
+            roll: Sudut servo 5 (wrist roll) yang diteruskan
+            gripper: Sudut servo 6 yang diteruskan
+            seed: Pose awal opsional (mis. pose saat ini di loop kontrol);
+                  dicoba sebelum seed dari tabel
+            tol: Toleransi error posisi (satuan panjang link)
+            k: Jumlah kandidat seed dari tabel
+
+        Return: Solution(pose list 6 int, error posisi pose yang dibulatkan,
+                iterasi)
+        """
+        x, y, z = (float(v) for v in target)
+        yaw = math.atan2(y, x)
+        r = math.hypot(x, y)
+        lo, hi = self._bounds[0]
+        if not lo - 1e-9 <= yaw <= hi + 1e-9:
+            # Di belakang base: putar 180° dan lipat lengan ke belakang
+            yaw = yaw - math.pi if yaw > 0 else yaw + math.pi
+            r = -r
+        if r == 0.0:
+            yaw = self._joint(0, seed[0]) if seed is not None else 0.0
+        yaw = min(max(yaw, lo), hi)
+        pitch_rad = None if pitch is None else math.radians(pitch)
+
+        candidates = []
+        if seed is not None:
+            candidates.append([self._joint(i, seed[i]) for i in (1, 2, 3)])
+        _, idx = self.tree.query((r, z), k=k)
+        idx = np.atleast_1d(idx)
+        if pitch_rad is not None:
+            # Dari k tetangga terdekat, dahulukan yang pitch-nya paling dekat
+            idx = idx[np.argsort(np.abs(self.pitch[idx] - pitch_rad))]
+        for i in idx:
+            candidates.append([self._joint(j + 1, float(a)) for j, a in enumerate(self.angles[i])])
+
+        best = None
+        total = 0
+        for q in candidates:
+            q, err, it = self._refine(q, r, z, pitch_rad, tol, max_iter)
+            total += it
+            if best is None or err < best[1]:
+                best = (q, err)
+            if err < tol:
+                break
+
+        q1, q2, q3 = best[0]
+        pose = [self._servo(0, yaw), self._servo(1, q1), self._servo(2, q2), self._servo(3, q3)]
+        pose = [min(max(int(round(a)), 0), 180) for a in pose] + [int(roll), int(gripper)]
+        return Solution(pose, self._error(pose, x, y, z), total)
+
+    def _error(self, pose, x, y, z):
+        # Jarak tip pose (sudah dibulatkan) ke target, tanpa overhead NumPy
+        h, l1, l2, l3 = self._links
+        yaw = self._joint(0, pose[0])
+        p1 = self._joint(1, pose[1])
+        p2 = p1 + self._joint(2, pose[2])
+        p3 = p2 + self._joint(3, pose[3])
+        r = l1 * math.cos(p1) + l2 * math.cos(p2) + l3 * math.cos(p3)
+        tz = h + l1 * math.sin(p1) + l2 * math.sin(p2) + l3 * math.sin(p3)
+        return math.sqrt((r * math.cos(yaw) - x) ** 2 + (r * math.sin(yaw) - y) ** 2 + (tz - z) ** 2)
@@ -0,0 +1,153 @@
+# -*- coding:utf-8 -*-
+"""
+Forward kinematics 3D ARM 6DOF, di-vectorize dengan NumPy.
+
+Menghitung posisi semua joint dan end-effector untuk array pose (N x 6,
+atau bentuk apa pun (..., 6)) dalam satu panggilan, tanpa loop Python,
+jadi seluruh trajectory atau sweep ribuan pose selesai dalam milidetik.
+Butuh NumPy (pip install numpy); modul lain di `yahboom` tidak.
+
+Model (sumbu: x ke depan saat base di posisi nol, y ke kiri, z ke atas):
+
+  servo 1  base yaw      rotasi seluruh lengan di sumbu z
+  servo 2  shoulder      pitch, sudut elevasi upper arm dari horizontal
+  servo 3  elbow         pitch, relatif terhadap upper arm
+  servo 4  wrist pitch   pitch, relatif terhadap forearm
+  servo 5  wrist roll    rotasi di sumbu panjang tangan (orientasi saja)
+  servo 6  gripper       tidak mempengaruhi posisi
+
+Sudut joint = sign * (sudut servo - zero). Default zero/sign dan panjang
+link sama dengan gambar ARM di GUI (shoulder 180° - servo, dst).
+
+Example:
+    arm = ArmModel(links=(50, 150, 120, 60))
+    poses = np.array([[90, 60, 120, 90, 90, 45], [90, 90, 90, 90, 90, 90]])
+    arm.forward(poses).shape        # (2, 5, 3): base, shoulder, elbow, wrist, tip
+    arm.end_effector(poses)         # (2, 3)
+"""
+
+import numpy as np
+
+# Urutan titik di hasil forward()
+POINTS = ("base", "shoulder", "elbow", "wrist", "tip")
+
+# base_height, upper_arm, forearm, wrist (tangan + gripper)
+DEFAULT_LINKS = (50.0, 150.0, 120.0, 60.0)
+# Sudut servo 1-5 yang menjadi sudut joint nol, dan arah putarnya
+DEFAULT_ZERO = (90.0, 180.0, 0.0, 0.0, 90.0)
+DEFAULT_SIGN = (1.0, -1.0, -1.0, -1.0, 1.0)
+
+
+class ArmModel:
+    """
+    Args:
+        links: (base_height, upper_arm, forearm, wrist), satuan bebas (mm, px, ...)
+        zero: Sudut servo 1-5 yang menjadi sudut joint nol (derajat)
+        sign: Arah putar joint 1-5 (+1 atau -1) relatif terhadap sudut servo
+    """
+
+    def __init__(self, links=DEFAULT_LINKS, zero=DEFAULT_ZERO, sign=DEFAULT_SIGN):
+        self.links = np.array(links, dtype=float)
+        self.zero = np.array(zero, dtype=float)
+        self.sign = np.array(sign, dtype=float)
+        if self.links.shape != (4,):
+            raise ValueError("links harus berisi 4 panjang: base_height, upper_arm, forearm, wrist")
+        if self.zero.shape != (5,) or self.sign.shape != (5,):
+            raise ValueError("zero dan sign harus berisi 5 nilai (servo 1-5)")
+
+    @property
+    def reach(self):
+        """Jangkauan horizontal maksimum dari sumbu base"""
+        return float(self.links[1:].sum())
+
+    def joint_angles(self, poses):
+        """Sudut servo (..., >=5) -> sudut joint (..., 5) dalam radian"""
+        poses = np.asarray(poses, dtype=float)
+        if poses.shape[-1] < 5:
+            raise ValueError("Pose butuh minimal 5 sudut (servo 1-5)")
+        return np.radians((poses[..., :5] - self.zero) * self.sign)
+
+    def _planar(self, q):
+        # Sudut elevasi absolut tiap link di bidang vertikal lengan
+        phi = np.cumsum(q[..., 1:4], axis=-1)
+        lengths = self.links[1:]
+        r = np.cumsum(lengths * np.cos(phi), axis=-1)
+        z = self.links[0] + np.cumsum(lengths * np.sin(phi), axis=-1)
+        return phi, r, z
+
+    def forward(self, poses):
+        """
+        Posisi 3D semua titik untuk array pose.
+
+        Args:
+            poses: Array (..., 6) sudut servo (derajat); kolom ke-6 diabaikan
+
+        Return: array (..., 5, 3) dengan urutan POINTS
+        """
+        q = self.joint_angles(poses)
+        _, r, z = self._planar(q)
+        yaw = q[..., 0, None]
+        out = np.zeros(q.shape[:-1] + (5, 3))
+        out[..., 1, 2] = self.links[0]
+        out[..., 2:, 0] = r * np.cos(yaw)
+        out[..., 2:, 1] = r * np.sin(yaw)
+        out[..., 2:, 2] = z
+        return out
+
+    def end_effector(self, poses):
+        """Posisi ujung gripper (..., 3)"""
+        q = self.joint_angles(poses)
+        _, r, z = self._planar(q)
+        yaw = q[..., 0]
+        return np.stack((r[..., -1] * np.cos(yaw), r[..., -1] * np.sin(yaw), z[..., -1]), axis=-1)
+
+    def orientation(self, poses):
+        """
+        Matriks rotasi frame tangan (..., 3, 3) = Rz(yaw) Ry(-pitch) Rx(roll).
+
+        Kolom 0 = arah tangan (approach), kolom 1/2 ikut berputar dengan
+        wrist roll.
+        """
+        q = self.joint_angles(poses)
+        yaw = q[..., 0]
+        pitch = q[..., 1:4].sum(axis=-1)
+        roll = q[..., 4]
+        cy, sy = np.cos(yaw), np.sin(yaw)
+        cp, sp = np.cos(pitch), np.sin(pitch)
+        cr, sr = np.cos(roll), np.sin(roll)
+        m = np.empty(q.shape[:-1] + (3, 3))
+        m[..., 0, 0] = cy * cp
+        m[..., 0, 1] = -sy * cr - cy * sp * sr
+        m[..., 0, 2] = sy * sr - cy * sp * cr
+        m[..., 1, 0] = sy * cp
+        m[..., 1, 1] = cy * cr - sy * sp * sr
+        m[..., 1, 2] = -cy * sr - sy * sp * cr
+        m[..., 2, 0] = sp
+        m[..., 2, 1] = cp * sr
+        m[..., 2, 2] = cp * cr
+        return m
+
+
+def sweep(ranges, steps=10):
+    """
+    Grid pose untuk sweep workspace.
+
+    Args:
+        ranges: List (min, max) sudut per servo, mis. [(0, 180)] * 4 + [(90, 90)] * 2
+        steps: Jumlah titik per servo (int atau list per servo)
+
+    Return: array (N, len(ranges)), N = hasil kali steps
+    """
+    if isinstance(steps, int):
+        steps = [steps] * len(ranges)
+    axes = [np.linspace(lo, hi, n if lo != hi else 1) for (lo, hi), n in zip(ranges, steps)]
+    grid = np.meshgrid(*axes, indexing="ij")
+    return np.stack([g.ravel() for g in grid], axis=-1)
+
+
+def trajectory_poses(traj):
+    """Kumpulkan (t, pose) dari Trajectory/iterable menjadi (times (N,), poses (N, k))"""
+    samples = list(traj)
+    times = np.array([t for t, _ in samples], dtype=float)
+    poses = np.array([pose for _, pose in samples], dtype=float)
+    return times, poses
@@ -0,0 +1,251 @@
+# -*- coding:utf-8 -*-
+"""
+Counter dan histogram ringan untuk driver dan thread penulis.
+
+Pasang ke driver (driver.metrics = DriverMetrics()); ServoWriter yang
+memakai driver itu ikut mengisi metrik antrian. Tanpa metrics (default
+None) jalur kirim tidak berubah sama sekali.
+
+Yang dicatat:
+
+  frames/bytes/writes      frame, byte dan panggilan write() ke port
+  frames_skipped           frame yang dibuang shadow (sudut sama)
+  frames_coalesced         target yang ditimpa target lebih baru di writer
+                           sebelum sempat dikirim
+  frames_dropped           target yang tidak pernah terkirim (write gagal,
+                           writer ditutup)
+  queue_depth              jumlah channel menunggu di writer (terakhir/maks)
+  write_latency_seconds    lama satu panggilan write() ke port
+  pacer_wait_seconds       waktu menunggu Pacer (baudrate/min_gap)
+  set_to_wire_seconds      dari set()/set_many() sampai byte terakhir di kabel
+  post_to_wire_seconds     dari ServoWriter.post() sampai byte terakhir di kabel
+
+Bisa dibaca lewat snapshot(), ditulis ke file format Prometheus
+(write_prometheus, untuk node_exporter textfile collector) atau disajikan
+di http://127.0.0.1:<port>/metrics (serve).
+
+Example:
+    driver.metrics = DriverMetrics()
+    ...
+    print(driver.metrics.snapshot()["post_to_wire_seconds"]["p95"])
+    driver.metrics.write_prometheus("/var/lib/node_exporter/yahboom.prom")
+"""
+
+import os
+import threading
+from bisect import bisect_left
+
+from .driver import _clock
+
+# Batas atas bucket histogram latency (detik)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_COUNTERS = (
+    ("frames_sent", "Frame servo yang ditulis ke port"),
+    ("bytes_sent", "Byte yang ditulis ke port"),
+    ("writes", "Panggilan write() ke port"),
+    ("write_errors", "Panggilan write() yang gagal"),
+    ("frames_skipped", "Frame yang tidak dikirim karena sudut sama dengan shadow"),
+    ("frames_coalesced", "Target yang ditimpa target lebih baru sebelum terkirim"),
+    ("frames_dropped", "Target yang tidak pernah terkirim"),
+)
+
+_HISTOGRAMS = (
+    ("write_latency_seconds", "Lama satu panggilan write() ke port"),
+    ("pacer_wait_seconds", "Waktu menunggu Pacer sebelum write()"),
+    ("set_to_wire_seconds", "Dari set()/set_many() sampai byte terakhir di kabel"),
+    ("post_to_wire_seconds", "Dari ServoWriter.post() sampai byte terakhir di kabel"),
+)
+
+
+class Histogram:
+    """Histogram bucket tetap (kumulatif saat diekspor, seperti Prometheus)"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # bucket terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Perkiraan kuantil (batas atas bucket), None jika kosong"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _labels(labels, extra=None):
+    items = list((labels or {}).items())
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{%s}" % ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                             for k, v in items)
+
+
+def _num(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class DriverMetrics:
+    """
+    Metrik satu driver/board.
+
+    Counter di-update tanpa lock (satu writer per driver); angka yang
+    dibaca dari thread lain bisa tertinggal satu update, cukup untuk
+    monitoring.
+
+    Args:
+        labels: Label Prometheus tambahan, mis. {"board": "0", "port": "COM3"}
+    """
+
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        for name, _ in _COUNTERS:
+            setattr(self, name, 0)
+        self.queue_depth = 0
+        self.queue_depth_max = 0
+        for name, _ in _HISTOGRAMS:
+            setattr(self, name, Histogram())
+        self.started = _clock()
+
+    def wrote(self, frames, nbytes, seconds, waited=0.0):
+        """Catat satu write() yang berhasil"""
+        self.frames_sent += frames
+        self.bytes_sent += nbytes
+        self.writes += 1
+        self.write_latency_seconds.observe(seconds)
+        if waited:
+            self.pacer_wait_seconds.observe(waited)
+
+    def queue(self, depth):
+        """Catat kedalaman antrian writer saat ini"""
+        self.queue_depth = depth
+        if depth > self.queue_depth_max:
+            self.queue_depth_max = depth
+
+    def reset(self):
+        labels = self.labels
+        self.__init__(labels)
+
+    def snapshot(self):
+        """Semua metrik sebagai dict (histogram diringkas)"""
+        elapsed = _clock() - self.started
+        data = {name: getattr(self, name) for name, _ in _COUNTERS}
+        data["queue_depth"] = self.queue_depth
+        data["queue_depth_max"] = self.queue_depth_max
+        data["uptime_seconds"] = elapsed
+        data["frames_per_second"] = self.frames_sent / elapsed if elapsed > 0 else 0.0
+        for name, _ in _HISTOGRAMS:
+            data[name] = getattr(self, name).snapshot()
+        return data
+
+    def to_prometheus(self, prefix="yahboom"):
+        """Metrik dalam format teks Prometheus (exposition format 0.0.4)"""
+        return prometheus_text([self], prefix)
+
+    def write_prometheus(self, path, prefix="yahboom"):
+        """Tulis ke file secara atomik (aman dibaca collector kapan saja)"""
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp, path)
+
+    def serve(self, port=9105, host="127.0.0.1", prefix="yahboom"):
+        """
+        Sajikan /metrics lewat HTTP di thread latar belakang.
+
+        Return: server (panggil server.shutdown() untuk berhenti)
+        """
+        return serve_metrics([self], port, host, prefix)
+
+
+def prometheus_text(metrics, prefix="yahboom"):
+    """
+    Gabungkan beberapa DriverMetrics (mis. satu per board, dibedakan lewat
+    labels) ke satu teks Prometheus; HELP/TYPE ditulis sekali per metrik.
+    """
+    lines = []
+
+    def header(metric, help_text, kind):
+        lines.append("# HELP %s %s" % (metric, help_text))
+        lines.append("# TYPE %s %s" % (metric, kind))
+
+    for name, help_text in _COUNTERS:
+        metric = "%s_%s_total" % (prefix, name)
+        header(metric, help_text, "counter")
+        for m in metrics:
+            lines.append("%s%s %d" % (metric, _labels(m.labels), getattr(m, name)))
+    for name, help_text in (("queue_depth", "Channel yang menunggu di writer"),
+                            ("queue_depth_max", "Kedalaman antrian writer maksimum")):
+        metric = "%s_%s" % (prefix, name)
+        header(metric, help_text, "gauge")
+        for m in metrics:
+            lines.append("%s%s %d" % (metric, _labels(m.labels), getattr(m, name)))
+    for name, help_text in _HISTOGRAMS:
+        metric = "%s_%s" % (prefix, name)
+        header(metric, help_text, "histogram")
+        for m in metrics:
+            hist = getattr(m, name)
+            seen = 0
+            for bound, n in zip(hist.bounds + (float("inf"),), hist.counts):
+                seen += n
+                lines.append("%s_bucket%s %d" % (metric, _labels(m.labels, ("le", _num(bound))), seen))
+            lines.append("%s_sum%s %s" % (metric, _labels(m.labels), _num(hist.sum)))
+            lines.append("%s_count%s %d" % (metric, _labels(m.labels), hist.count))
+    return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics, port=9105, host="127.0.0.1", prefix="yahboom"):
+    """Sajikan beberapa DriverMetrics (mis. satu per board) di satu endpoint /metrics"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text(metrics, prefix).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
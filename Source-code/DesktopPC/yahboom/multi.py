@@ -0,0 +1,169 @@
+# -*- coding:utf-8 -*-
+"""
+Beberapa board 16 channel sebagai satu controller dengan nomor channel global.
+
+Channel global 1..N dipetakan ke (board, servo) berurutan: dengan dua board
+16 channel, channel 1-16 = board 0 servo 1-16, channel 17-32 = board 1
+servo 1-16. Board boleh campuran UART dan I2C (apa saja turunan BaseDriver).
+
+Setiap board punya ServoWriter sendiri, jadi board mengirim paralel: total
+throughput bertambah dengan jumlah board, tidak dibatasi satu link 9600bps.
+
+Example:
+    boards = MultiBoard.open(["/dev/ttyUSB0", "/dev/ttyUSB1", "i2c:1:0x2D"])
+    boards.set(20, 90)                      # board 1, servo 4
+    boards.set_many({1: 0, 17: 180, 33: 90})
+    boards.flush()
+    boards.close()
+"""
+
+import time
+
+from .driver import NUM_CHANNELS, MAX_ANGLE
+from .writer import ServoWriter
+
+
+def open_board(spec, pacer=True):
+    """
+    Buka satu board dari string spec.
+
+      "COM3", "/dev/ttyUSB0"   -> UART 9600 8N1 (ServoDriver + Pacer)
+      "i2c:1", "i2c:1:0x2D"     -> I2C bus 1, alamat opsional (I2CDriver)
+      "daemon", "daemon:ADDR"   -> board milik yahboom.daemon (DaemonDriver),
+                                   ADDR = path UNIX socket atau host:port
+      "auto", "auto:NAMA"       -> UART, port dicari lewat identitas USB
+                                   (yahboom.discover, cache dulu)
+    """
+    if spec == "daemon" or spec.startswith("daemon:"):
+        from .daemon import DaemonDriver
+        return DaemonDriver(spec[7:] or None)
+    if spec.startswith("i2c:"):
+        from .i2c import I2C_ADDR, open_i2c
+        parts = spec.split(":")
+        bus = int(parts[1])
+        address = int(parts[2], 0) if len(parts) > 2 else I2C_ADDR
+        return open_i2c(bus, address)
+    from .driver import open_serial
+    from .pacing import Pacer
+    if spec == "auto" or spec.startswith("auto:"):
+        from .discover import resolve
+        spec = resolve(spec)
+    # Maksimal satu batch antri di port supaya writer tetap bisa coalescing
+    return open_serial(spec, pacer=Pacer(baudrate=9600, max_queue=96) if pacer else None)
+
+
+class MultiBoard:
+    """
+    Args:
+        drivers: List driver (ServoDriver, I2CDriver, ...), urutan = urutan channel global
+        channels: Jumlah servo terpakai per board (int untuk semua board, atau list)
+        on_error: Callback(board_index, exc) jika write di salah satu board gagal
+    """
+
+    def __init__(self, drivers, channels=NUM_CHANNELS, on_error=None):
+        self.drivers = list(drivers)
+        if isinstance(channels, int):
+            channels = [channels] * len(self.drivers)
+        if len(channels) != len(self.drivers):
+            raise ValueError("Jumlah channel harus diberikan untuk setiap board")
+
+        # _map[global] -> (board, servo), index 0 tidak dipakai
+        self._map = [None]
+        self._first = []
+        for board, count in enumerate(channels):
+            if not 0 < count <= NUM_CHANNELS:
+                raise ValueError("Channel per board harus 1-16, bukan %r" % (count,))
+            self._first.append(len(self._map))
+            self._map.extend((board, ch) for ch in range(1, count + 1))
+
+        self.writers = []
+        for board, driver in enumerate(self.drivers):
+            handler = None
+            if on_error is not None:
+                handler = (lambda b: lambda e: on_error(b, e))(board)
+            self.writers.append(ServoWriter(driver, on_error=handler))
+
+    @classmethod
+    def open(cls, specs, channels=NUM_CHANNELS, on_error=None):
+        """Buka semua board dari list spec (lihat open_board)"""
+        drivers = []
+        try:
+            for spec in specs:
+                drivers.append(open_board(spec))
+        except Exception:
+            for driver in drivers:
+                driver.close()
+            raise
+        return cls(drivers, channels, on_error)
+
+    @property
+    def channels(self):
+        """Jumlah channel global"""
+        return len(self._map) - 1
+
+    def locate(self, channel):
+        """Channel global -> (board, servo)"""
+        if not 0 < channel < len(self._map):
+            raise ValueError("Channel harus antara 1-%d, bukan %r" % (self.channels, channel))
+        return self._map[channel]
+
+    def channel(self, board, servo):
+        """(board, servo) -> channel global"""
+        return self._first[board] + servo - 1
+
+    def set(self, channel, angle):
+        """Simpan target satu channel global; dikirim oleh writer board-nya"""
+        board, ch = self.locate(channel)
+        self.writers[board].post(ch, angle)
+
+    def set_many(self, targets):
+        """
+        Simpan target untuk banyak channel global sekaligus.
+
+        Target dikelompokkan per board lalu diserahkan ke writer masing-masing
+        dengan satu post_many(), jadi setiap board mengirim satu batch.
+
+        Args:
+            targets: dict {channel: angle} atau iterable pasangan (channel, angle)
+        """
+        if hasattr(targets, "items"):
+            targets = targets.items()
+        groups = [[] for _ in self.drivers]
+        for channel, angle in targets:
+            if not 0 <= angle <= MAX_ANGLE:
+                raise ValueError("Angle harus antara 0-180 derajat, bukan %r" % (angle,))
+            board, ch = self.locate(channel)
+            groups[board].append((ch, angle))
+        for writer, group in zip(self.writers, groups):
+            if group:
+                writer.post_many(group)
+
+    def set_all(self, angle):
+        """Semua channel global ke sudut yang sama"""
+        self.set_many((ch, angle) for ch in range(1, len(self._map)))
+
+    def set_pose(self, angles, first=1):
+        """Pose (list sudut) ke channel global berurutan mulai dari `first`"""
+        self.set_many(zip(range(first, first + len(angles)), angles))
+
+    def flush(self, timeout=None):
+        """
+        Tunggu sampai semua board selesai mengirim dan byte terakhir keluar
+        dari port. timeout berlaku untuk semua board bersama (satu deadline),
+        bukan per board. Return False jika timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ok = True
+        for writer, driver in zip(self.writers, self.drivers):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if writer.flush(remaining):
+                driver.flush()
+            else:
+                ok = False
+        return ok
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+        for driver in self.drivers:
+            driver.close()
@@ -0,0 +1,110 @@
+# -*- coding:utf-8 -*-
+"""
+Pacing berbasis baudrate untuk link UART servo.
+
+Menggantikan time.sleep(0.05)/sleep(0.1) yang tidak ada hubungannya dengan
+link. Pada 9600 8N1 satu byte = 10 bit = ~1.04ms, jadi satu frame 6 byte
+butuh ~6.25ms di kabel. Pacer memperkirakan kapan byte terakhir benar-benar
+keluar (dikoreksi dengan out_waiting dari pyserial jika tersedia) dan hanya
+menunggu jika:
+
+  - board butuh jeda minimum antar frame (min_gap, diukur sekali per board)
+  - antrian di OS/adapter sudah melebihi max_queue byte (supaya frame basi
+    tidak menumpuk di buffer dan coalescing di ServoWriter tetap berguna)
+"""
+
+import time
+
+from . import trace
+from .driver import FRAME_LEN
+
+
+class Pacer:
+    """
+    Args:
+        baudrate: Baudrate link (default 9600)
+        min_gap: Jeda minimum (detik) antara akhir satu frame dan awal frame
+                 berikutnya di kabel. 0 = kirim secepat link mengizinkan.
+        max_queue: Batas byte yang boleh antri di port (None = tanpa batas)
+        bits_per_byte: 10 untuk 8N1 (start + 8 data + stop)
+        port: Port serial (opsional, untuk out_waiting/flush)
+    """
+
+    def __init__(self, baudrate=9600, min_gap=0.0, max_queue=None, bits_per_byte=10, port=None):
+        self.baudrate = baudrate
+        self.byte_time = bits_per_byte / float(baudrate)
+        self.min_gap = min_gap
+        self.max_queue = max_queue
+        self.port = port
+        # Perkiraan waktu (time.monotonic) saat byte terakhir keluar dari port
+        self._wire_free = 0.0
+
+    @property
+    def wire_free(self):
+        """Perkiraan waktu (time.monotonic) saat byte terakhir keluar dari port"""
+        return self._wire_free
+
+    def frame_time(self, nbytes=FRAME_LEN):
+        """Waktu di kabel untuk nbytes (detik)"""
+        return nbytes * self.byte_time
+
+    def frames_per_second(self, frame_len=FRAME_LEN):
+        """Frame maksimum per detik yang diizinkan link + min_gap"""
+        return 1.0 / (self.frame_time(frame_len) + self.min_gap)
+
+    def _out_waiting(self):
+        try:
+            return self.port.out_waiting
+        except (AttributeError, OSError, NotImplementedError):
+            return None
+
+    def queued(self, now=None):
+        """Perkiraan jumlah byte yang masih antri di port"""
+        if now is None:
+            now = time.monotonic()
+        out = self._out_waiting() if self.port is not None else None
+        if out is not None:
+            # Koreksi perkiraan dengan angka dari driver OS
+            if out:
+                self._wire_free = now + out * self.byte_time
+            else:
+                self._wire_free = min(self._wire_free, now)
+            return out
+        return max(0.0, self._wire_free - now) / self.byte_time
+
+    def delay_for(self, nbytes, now=None):
+        """Berapa detik harus menunggu sebelum menulis nbytes"""
+        if now is None:
+            now = time.monotonic()
+        queued = self.queued(now)
+        delay = 0.0
+        if self.min_gap > 0:
+            delay = self._wire_free + self.min_gap - now
+        if self.max_queue is not None and queued + nbytes > self.max_queue:
+            delay = max(delay, (queued + nbytes - self.max_queue) * self.byte_time)
+        return delay if delay > 0 else 0.0
+
+    def wait(self, nbytes=FRAME_LEN):
+        """Tunggu (jika perlu) sebelum menulis nbytes. Return detik yang ditunggu."""
+        delay = self.delay_for(nbytes)
+        if delay:
+            # Durasi span vs planned_ms = overshoot time.sleep
+            with trace.span("pacer.sleep", "io", {"planned_ms": delay * 1000.0}):
+                time.sleep(delay)
+        return delay
+
+    def sent(self, nbytes=FRAME_LEN):
+        """Catat bahwa nbytes baru saja ditulis ke port"""
+        now = time.monotonic()
+        self._wire_free = max(now, self._wire_free) + nbytes * self.byte_time
+
+    def drain(self):
+        """Tunggu sampai byte terakhir keluar (port.flush atau perkiraan waktu)"""
+        flush = getattr(self.port, "flush", None)
+        if flush is not None:
+            flush()
+        else:
+            remaining = self._wire_free - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+        self._wire_free = min(self._wire_free, time.monotonic())
@@ -0,0 +1,233 @@
+# -*- coding:utf-8 -*-
+"""
+Pattern store di atas SQLite untuk library pose yang besar.
+
+Menggantikan "dump seluruh dict custom_patterns ke JSON" setiap kali
+menyimpan. Setiap pattern adalah satu baris dengan primary key nama, tag
+disimpan di tabel terpisah yang ter-index, jadi:
+
+  - membuka library hanya membuka file (tidak ada yang dibaca di depan)
+  - keys() hanya membaca nama; sudut dibaca saat dibutuhkan (lazy)
+  - simpan/hapus satu pattern = satu baris, tidak menulis ulang semuanya
+  - import/export tetap memakai format JSON lama {nama: [sudut, ...]}
+
+PatternStore bisa dipakai seperti dict (`in`, `[]`, `del`, keys(),
+update()), sehingga bisa langsung menggantikan custom_patterns di GUI.
+
+Example:
+    store = PatternStore("patterns.db")
+    store.put("Wave 1", [90, 60, 120, 90, 90, 45], tags=["wave"])
+    store["Wave 1"]            # -> [90, 60, 120, 90, 90, 45]
+    store.find(tag="wave")     # -> ["Wave 1"]
+    store.import_json("example_patterns.json")
+"""
+
+import json
+import sqlite3
+import threading
+
+from .driver import check
+
+# Pose bawaan ARM 6DOF (servo 1-6), dipakai GUI dan key "pattern" di choreo
+BUILTIN_PATTERNS = {
+    "Home Position": [90, 90, 90, 90, 90, 90],
+    "Rest Position": [90, 45, 45, 90, 90, 90],
+    "Reach Forward": [90, 60, 120, 90, 90, 45],
+    "Reach Up": [90, 135, 45, 90, 90, 45],
+    "Pick Position": [90, 60, 90, 120, 90, 90],
+}
+
+# Header file SQLite, untuk membedakan library .db dari file JSON
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+
+_SCHEMA = """
+PRAGMA foreign_keys = ON;
+CREATE TABLE IF NOT EXISTS patterns (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    angles TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    pattern INTEGER NOT NULL REFERENCES patterns(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, pattern)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_pattern ON tags(pattern);
+"""
+
+
+def _encode(angles):
+    return ",".join(str(int(a)) for a in angles)
+
+
+def _decode(text):
+    return [int(a) for a in text.split(",")] if text else []
+
+
+class PatternStore:
+    """
+    Args:
+        path: File database (default ":memory:" = tidak disimpan ke disk)
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        # Dipakai juga dari thread animasi; akses diserialkan dengan lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.executescript(_SCHEMA)
+            # WAL: commit satu pattern tidak perlu menulis ulang file utama
+            if path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.commit()
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def put(self, name, angles, tags=None):
+        """
+        Simpan (atau timpa) satu pattern.
+
+        tags: Tag baru, menggantikan tag lama pattern ini ([] = hapus semua
+              tag); None = tag yang sudah ada dibiarkan
+        """
+        with self._lock, self._db:
+            self._put(name, angles, tags)
+
+    def _put(self, name, angles, tags):
+        db = self._db
+        db.execute("INSERT INTO patterns(name, angles) VALUES (?, ?) "
+                   "ON CONFLICT(name) DO UPDATE SET angles = excluded.angles",
+                   (name, _encode(angles)))
+        if tags is not None:
+            pid = db.execute("SELECT id FROM patterns WHERE name = ?", (name,)).fetchone()[0]
+            db.execute("DELETE FROM tags WHERE pattern = ?", (pid,))
+            db.executemany("INSERT OR IGNORE INTO tags(tag, pattern) VALUES (?, ?)",
+                           [(tag, pid) for tag in tags])
+
+    def get(self, name, default=None):
+        rows = self._query("SELECT angles FROM patterns WHERE name = ?", (name,))
+        return _decode(rows[0][0]) if rows else default
+
+    def delete(self, name):
+        """Hapus satu pattern (tag ikut terhapus). Return False jika tidak ada."""
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM patterns WHERE name = ?", (name,)).rowcount > 0
+
+    def tag(self, name, *tags):
+        """Tambah tag ke pattern yang sudah ada"""
+        with self._lock, self._db:
+            row = self._db.execute("SELECT id FROM patterns WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise KeyError(name)
+            self._db.executemany("INSERT OR IGNORE INTO tags(tag, pattern) VALUES (?, ?)",
+                                 [(tag, row[0]) for tag in tags])
+
+    def tags(self, name=None):
+        """Tag milik satu pattern, atau semua tag yang ada jika name None"""
+        if name is None:
+            return [r[0] for r in self._query("SELECT DISTINCT tag FROM tags ORDER BY tag")]
+        return [r[0] for r in self._query(
+            "SELECT tag FROM tags JOIN patterns ON patterns.id = tags.pattern "
+            "WHERE patterns.name = ? ORDER BY tag", (name,))]
+
+    def find(self, tag=None, prefix=None, limit=None):
+        """Nama pattern dengan tag dan/atau awalan nama tertentu (urut waktu simpan)"""
+        sql = "SELECT p.name FROM patterns p"
+        where = []
+        args = []
+        if tag is not None:
+            sql += " JOIN tags t ON t.pattern = p.id"
+            where.append("t.tag = ?")
+            args.append(tag)
+        if prefix:
+            # Rentang [prefix, prefix+U+10FFFF) memakai index UNIQUE(name)
+            where.append("p.name >= ? AND p.name < ?")
+            args.extend((prefix, prefix + "\U0010ffff"))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.id"
+        if limit is not None:
+            sql += " LIMIT %d" % int(limit)
+        return [r[0] for r in self._query(sql, args)]
+
+    def keys(self):
+        return [r[0] for r in self._query("SELECT name FROM patterns ORDER BY id")]
+
+    def items(self):
+        return [(name, _decode(angles)) for name, angles in
+                self._query("SELECT name, angles FROM patterns ORDER BY id")]
+
+    def update(self, patterns, tags=None):
+        """Simpan banyak pattern {nama: sudut} dalam satu transaksi (tags seperti put)"""
+        if hasattr(patterns, "items"):
+            patterns = patterns.items()
+        with self._lock, self._db:
+            for name, angles in patterns:
+                self._put(name, angles, tags)
+
+    def import_json(self, filename, tags=None):
+        """
+        Import file JSON format lama {nama: [sudut, ...]}. Return jumlah pattern.
+
+        Semua pose divalidasi (servo 1-16, sudut int 0-180) sebelum ada yang
+        disimpan; raise ValueError jika satu saja salah.
+        """
+        with open(filename, 'r') as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError("File pattern harus berisi {nama: [sudut, ...]}")
+        for name, angles in loaded.items():
+            if not isinstance(angles, list):
+                raise ValueError("Pattern %r: sudut harus list, bukan %r" % (name, angles))
+            try:
+                for ch, angle in enumerate(angles, start=1):
+                    check(ch, angle)
+            except ValueError as e:
+                raise ValueError("Pattern %r: %s" % (name, e))
+        self.update(loaded, tags)
+        return len(loaded)
+
+    def export_json(self, filename, names=None):
+        """Export ke format JSON lama (semua pattern atau hanya `names`)"""
+        if names is None:
+            data = dict(self.items())
+        else:
+            data = {name: self[name] for name in names}
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2)
+        return len(data)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @classmethod
+    def is_database(cls, filename):
+        """True jika file adalah database SQLite (bukan JSON format lama)"""
+        with open(filename, 'rb') as f:
+            return f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+
+    def __getitem__(self, name):
+        angles = self.get(name)
+        if angles is None:
+            raise KeyError(name)
+        return angles
+
+    def __setitem__(self, name, angles):
+        self.put(name, angles)
+
+    def __delitem__(self, name):
+        if not self.delete(name):
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return bool(self._query("SELECT 1 FROM patterns WHERE name = ?", (name,)))
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM patterns")[0][0]
+
+    def __iter__(self):
+        return iter(self.keys())
@@ -0,0 +1,218 @@
+# -*- coding:utf-8 -*-
+"""
+Rekaman gerakan servo ke ring buffer bertimestamp dan pemutar presisi.
+
+MotionRecorder menyimpan (waktu, servo, sudut) di tiga array yang
+dialokasikan sekali (8 + 1 + 1 byte per event). Jika penuh, event paling
+lama ditimpa, jadi sesi teach-by-demonstration yang panjang tidak pernah
+menambah memori. Pasang ke driver mana pun (driver.recorder = rec) untuk
+merekam setiap frame yang benar-benar dikirim oleh GUI, CLI atau API.
+
+Format file (.ybr, little-endian):
+    b"YBR1" | uint32 jumlah | float64 waktu[n] | uint8 servo[n] | uint8 sudut[n]
+Waktu disimpan relatif terhadap event pertama (detik).
+
+Example:
+    rec = MotionRecorder(capacity=100000)
+    driver.recorder = rec
+    ...                              # gerakkan servo
+    rec.save("teach.ybr")
+
+    report = replay(MotionRecorder.load("teach.ybr").events(), driver, speed=0.5)
+    print(report["error"]["p95_ms"])
+"""
+
+import struct
+import sys
+import threading
+import time
+from array import array
+
+from .driver import NUM_CHANNELS, check
+
+_MAGIC = b"YBR1"
+
+
+class MotionRecorder:
+    """
+    Args:
+        capacity: Jumlah event maksimum yang disimpan (event lama ditimpa)
+        clock: Sumber waktu (default time.monotonic)
+    """
+
+    def __init__(self, capacity=65536, clock=time.monotonic):
+        if capacity <= 0:
+            raise ValueError("Capacity harus > 0")
+        self.capacity = capacity
+        self.clock = clock
+        self._times = array("d", bytes(8 * capacity))
+        self._servos = array("B", bytes(capacity))
+        self._angles = array("B", bytes(capacity))
+        self._head = 0      # index tulis berikutnya
+        self._count = 0
+        self.dropped = 0    # event lama yang tertimpa
+        self.enabled = True
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def record(self, ch, angle, t=None):
+        """Catat satu event (dipanggil driver setiap frame terkirim)"""
+        if not self.enabled:
+            return
+        if t is None:
+            t = self.clock()
+        with self._lock:
+            i = self._head
+            self._times[i] = t
+            self._servos[i] = ch
+            self._angles[i] = angle
+            self._head = (i + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+            else:
+                self.dropped += 1
+
+    def record_many(self, targets, t=None):
+        """Catat beberapa event dengan timestamp yang sama"""
+        if t is None:
+            t = self.clock()
+        for ch, angle in targets:
+            self.record(ch, angle, t)
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._count = 0
+            self.dropped = 0
+
+    def events(self):
+        """List (waktu, servo, sudut) dari yang paling lama"""
+        with self._lock:
+            start = (self._head - self._count) % self.capacity
+            idx = [(start + k) % self.capacity for k in range(self._count)]
+            return [(self._times[i], self._servos[i], self._angles[i]) for i in idx]
+
+    def duration(self):
+        with self._lock:
+            if self._count < 2:
+                return 0.0
+            first = (self._head - self._count) % self.capacity
+            last = (self._head - 1) % self.capacity
+            return self._times[last] - self._times[first]
+
+    def save(self, filename):
+        """Simpan ke file biner .ybr. Return jumlah event."""
+        events = self.events()
+        t0 = events[0][0] if events else 0.0
+        times = array("d", (t - t0 for t, _, _ in events))
+        if sys.byteorder == "big":
+            times.byteswap()
+        with open(filename, "wb") as f:
+            f.write(_MAGIC + struct.pack("<I", len(events)))
+            times.tofile(f)
+            array("B", (ch for _, ch, _ in events)).tofile(f)
+            array("B", (a for _, _, a in events)).tofile(f)
+        return len(events)
+
+    @classmethod
+    def load(cls, filename, capacity=None):
+        """Baca file .ybr ke recorder baru (capacity default = jumlah event)"""
+        with open(filename, "rb") as f:
+            if f.read(4) != _MAGIC:
+                raise ValueError("Bukan file rekaman .ybr: %s" % filename)
+            n = struct.unpack("<I", f.read(4))[0]
+            times = array("d")
+            times.fromfile(f, n)
+            servos = array("B")
+            servos.fromfile(f, n)
+            angles = array("B")
+            angles.fromfile(f, n)
+        if sys.byteorder == "big":
+            times.byteswap()
+        rec = cls(capacity or max(1, n))
+        for t, ch, a in zip(times, servos, angles):
+            check(ch, a)
+            rec.record(ch, a, t)
+        return rec
+
+
+def _error_stats(errors):
+    if not errors:
+        return {"n": 0}
+    v = sorted(errors)
+    n = len(v)
+    return {
+        "n": n,
+        "mean_ms": sum(v) / n * 1000.0,
+        "p95_ms": v[min(n - 1, int(round(0.95 * (n - 1))))] * 1000.0,
+        "max_ms": v[-1] * 1000.0,
+    }
+
+
+def replay(events, driver, speed=1.0, clock=time.monotonic, sleep=time.sleep, stop=None):
+    """
+    Putar ulang event (waktu, servo, sudut) dengan deadline absolut.
+
+    Event dengan deadline yang sudah tercapai dikirim bersama dalam satu
+    set_many(); jika satu servo muncul lebih dari sekali dalam batch, hanya
+    nilai terakhir yang dikirim.
+
+    Args:
+        events: Iterable (waktu, servo, sudut), mis. MotionRecorder.events()
+        driver: Driver dengan set_many() (ServoDriver, I2CDriver), ServoWriter
+                (post_many) atau callable send(list pasangan (servo, sudut))
+        speed: Skala waktu (2.0 = dua kali lebih cepat, 0.5 = setengah)
+        stop: Callable opsional, return True untuk berhenti
+
+    Return: dict laporan: events, batches, duration_s, planned_s, error
+            (keterlambatan batch terhadap deadline-nya, ms)
+    """
+    if speed <= 0:
+        raise ValueError("Speed harus > 0")
+    if callable(driver):
+        send = driver
+    elif hasattr(driver, "set_many"):
+        send = driver.set_many
+    else:
+        # ServoWriter: timing dijaga replay, jarak minimum channel tidak berlaku
+        send = lambda targets: driver.post_many(targets, immediate=True)
+    events = list(events)
+    report = {"events": len(events), "batches": 0, "duration_s": 0.0, "planned_s": 0.0}
+    if not events:
+        report["error"] = _error_stats([])
+        return report
+
+    t_first = events[0][0]
+    t0 = clock()
+    errors = []
+    pending = [None] * (NUM_CHANNELS + 1)
+    i = 0
+    n = len(events)
+    while i < n:
+        if stop is not None and stop():
+            break
+        deadline = t0 + (events[i][0] - t_first) / speed
+        delay = deadline - clock()
+        if delay > 0:
+            sleep(delay)
+        now = clock()
+        # Ambil semua event yang deadline-nya sudah lewat
+        batch = []
+        while i < n and t0 + (events[i][0] - t_first) / speed <= now:
+            _, ch, angle = events[i]
+            if pending[ch] is None:
+                batch.append(ch)
+            pending[ch] = angle
+            i += 1
+        send([(ch, pending[ch]) for ch in batch])
+        for ch in batch:
+            pending[ch] = None
+        errors.append(max(0.0, clock() - deadline))
+        report["batches"] += 1
+
+    report["duration_s"] = clock() - t0
+    report["planned_s"] = (events[-1][0] - t_first) / speed
+    report["error"] = _error_stats(errors)
+    return report
@@ -0,0 +1,260 @@
+# -*- coding:utf-8 -*-
+"""
+Script perintah servo yang dibaca sebagai stream (file atau stdin).
+
+Satu perintah per baris (baris kosong dan '#' diabaikan, huruf bebas):
+
+    set 3 90                     servo 3 ke 90°
+    setall 45                    servo 1-16 ke 45°
+    pose 90,60,120,90,90,45      servo 1-6 (angka kedua opsional = servo pertama)
+    wait 200ms                   tunggu (200ms, 1.5s, atau angka saja = ms)
+    flush                        tunggu sampai semua frame keluar dari kabel
+    loop 3                       ulangi blok sampai 'end' 3x
+      ...                        (loop tanpa angka = terus sampai dihentikan)
+    end
+
+Perintah kirim diteruskan ke ServoWriter tanpa menunggu port, jadi parsing
+baris berikutnya berjalan paralel dengan write() (pipeline), dan perintah
+untuk servo berbeda tanpa wait di antaranya digabung ke satu write().
+Script adalah urutan perintah: tidak ada yang dibuang, servo yang masih
+antri di writer di-flush dulu sebelum diberi sudut baru. Wait dijadwalkan dengan
+deadline absolut sejak awal script, sehingga overhead per baris tidak
+menggeser timing. Memori tetap kecil: hanya isi blok loop yang disimpan
+(sebagai perintah hasil parse, tidak diekspansi).
+
+Example:
+    run("show.txt", writer, flush=writer.flush)
+
+    printf 'loop 100\\nset 1 0\\nwait 20ms\\nset 1 180\\nwait 20ms\\nend\\n' |
+        python 01-servo-test-cli.py -p /dev/ttyUSB0 --script -
+"""
+
+import collections
+import math
+import time
+
+from .choreo import read_lines
+from .driver import NUM_CHANNELS, check
+
+# op: "send" (arg = list (servo, sudut)), "wait" (detik), "flush" (None)
+Command = collections.namedtuple("Command", "op arg line")
+
+
+def parse_duration(text):
+    """'200ms' / '1.5s' / '200' (ms) -> detik"""
+    text = text.strip().lower()
+    if text.endswith("ms"):
+        value = float(text[:-2])
+    elif text.endswith("s"):
+        value = float(text[:-1]) * 1000.0
+    else:
+        value = float(text)
+    if not (value >= 0 and math.isfinite(value)):
+        raise ValueError("Durasi harus angka >= 0 yang terbatas: %r" % (text,))
+    return value / 1000.0
+
+
+def _parse_line(words):
+    op = words[0].lower()
+    args = words[1:]
+    if op == "set":
+        if len(args) != 2:
+            raise ValueError("Format: set SERVO ANGLE")
+        ch, angle = int(args[0]), int(args[1])
+        check(ch, angle)
+        return "send", [(ch, angle)]
+    if op == "setall":
+        if len(args) != 1:
+            raise ValueError("Format: setall ANGLE")
+        angle = int(args[0])
+        check(1, angle)
+        return "send", [(ch, angle) for ch in range(1, NUM_CHANNELS + 1)]
+    if op == "pose":
+        if not 1 <= len(args) <= 2:
+            raise ValueError("Format: pose A,B,C,... [SERVO_PERTAMA]")
+        angles = [int(a) for a in args[0].split(",") if a.strip()]
+        first = int(args[1]) if len(args) > 1 else 1
+        targets = list(zip(range(first, first + len(angles)), angles))
+        for ch, angle in targets:
+            check(ch, angle)
+        return "send", targets
+    if op == "wait":
+        if len(args) != 1:
+            raise ValueError("Format: wait DURASI (mis. 200ms, 1.5s)")
+        return "wait", parse_duration(args[0])
+    if op == "flush":
+        return "flush", None
+    raise ValueError("Perintah tidak dikenal: %r" % (words[0],))
+
+
+# Blok loop yang sudah diparse; body = list Command/_Loop, belum diekspansi
+_Loop = collections.namedtuple("_Loop", "count body")
+
+
+def _nodes(lines, depth=0):
+    # Generator Command/_Loop; berhenti di 'end' (untuk blok loop) atau akhir input
+    for lineno, line in lines:
+        words = line.split("#", 1)[0].split()
+        if not words:
+            continue
+        op = words[0].lower()
+        try:
+            if op == "end":
+                if depth == 0:
+                    raise ValueError("'end' tanpa 'loop'")
+                return
+            if op == "loop":
+                if len(words) > 2:
+                    raise ValueError("Format: loop [N]")
+                count = int(words[1]) if len(words) > 1 else None
+                if count is not None and count < 0:
+                    raise ValueError("Jumlah loop tidak boleh negatif")
+        except ValueError as e:
+            raise ValueError("Baris %d: %s" % (lineno, e))
+        if op == "loop":
+            yield _Loop(count, list(_nodes(lines, depth + 1)))
+            continue
+        try:
+            kind, arg = _parse_line(words)
+        except ValueError as e:
+            raise ValueError("Baris %d: %s" % (lineno, e))
+        yield Command(kind, arg, lineno)
+    if depth:
+        raise ValueError("'loop' tanpa 'end' di akhir script")
+
+
+def _expand(nodes):
+    # Command satu per satu; loop (juga loop tanpa batas di dalam loop)
+    # diulang tanpa menyalin atau mengekspansi isinya lebih dulu
+    for node in nodes:
+        if not isinstance(node, _Loop):
+            yield node
+            continue
+        n = 0
+        while node.count is None or n < node.count:
+            produced = False
+            for cmd in _expand(node.body):
+                produced = True
+                yield cmd
+            if not produced:
+                break  # Blok tanpa perintah: jangan berputar tanpa hasil
+            n += 1
+
+
+def parse(source):
+    """
+    Generator Command dari path file, "-" (stdin) atau iterable baris.
+
+    Raise ValueError (dengan nomor baris) untuk perintah tidak valid.
+    """
+    return _expand(_nodes(iter(read_lines(source))))
+
+
+def _ordered(writer):
+    # post_many() menyimpan satu target per servo: sebelum servo yang masih
+    # antri diberi sudut baru, tunggu sampai yang lama terkirim
+    queued = set()
+
+    def send(targets):
+        channels = set(ch for ch, _ in targets)
+        if not queued.isdisjoint(channels):
+            writer.flush()
+            queued.clear()
+        writer.post_many(targets, immediate=True)
+        queued.update(channels)
+    return send
+
+
+def run(source, driver, clock=time.monotonic, sleep=time.sleep, flush=None, stop=None):
+    """
+    Jalankan script.
+
+    Args:
+        source: Path file, "-" (stdin) atau iterable baris
+        driver: ServoWriter (post_many, disarankan), driver dengan set_many()
+                atau callable send(list pasangan (servo, sudut)). Lewat
+                ServoWriter setiap perintah dikirim tanpa jarak minimum
+                channel dan tidak pernah digabung dengan perintah berikutnya
+                untuk servo yang sama
+        flush: Callable untuk perintah 'flush' (mis. writer.flush);
+               None = perintah flush diabaikan
+        stop: Callable opsional, return True untuk berhenti
+
+    Return: dict statistik: commands, sends, waits, late (wait yang
+            deadline-nya sudah lewat), max_late_ms, duration_s
+    """
+    if callable(driver):
+        send = driver
+    elif hasattr(driver, "post_many"):
+        send = _ordered(driver)
+    else:
+        send = driver.set_many
+    stats = {"commands": 0, "sends": 0, "waits": 0, "late": 0, "max_late_ms": 0.0}
+    t0 = deadline = clock()
+    for cmd in parse(source):
+        if stop is not None and stop():
+            break
+        stats["commands"] += 1
+        if cmd.op == "send":
+            send(cmd.arg)
+            stats["sends"] += 1
+        elif cmd.op == "wait":
+            stats["waits"] += 1
+            deadline += cmd.arg
+            delay = deadline - clock()
+            if delay > 0:
+                sleep(delay)
+            elif cmd.arg > 0:
+                stats["late"] += 1
+                stats["max_late_ms"] = max(stats["max_late_ms"], -delay * 1000.0)
+        elif cmd.op == "flush":
+            if flush is not None:
+                flush()
+            # Lama flush tidak bisa diprediksi: timeline mulai lagi dari sini
+            deadline = clock()
+    stats["duration_s"] = clock() - t0
+    return stats
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Jalankan script perintah servo (set/setall/pose/wait/loop) secara streaming')
+    parser.add_argument('source', help='File script, atau - untuk stdin')
+    parser.add_argument('-p', '--port', default=None,
+                        help='Serial port, mis. COM3 atau /dev/ttyUSB0 (atau i2c:1, daemon)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Jangan kirim ke board, cetak setiap perintah dengan waktunya')
+    args = parser.parse_args()
+    if args.port is None and not args.dry_run:
+        parser.error("Berikan --port atau --dry-run")
+
+    if args.dry_run:
+        # Tanpa sleep: cetak timeline script (bisa di-pipe)
+        t = 0.0
+        for cmd in parse(args.source):
+            if cmd.op == "wait":
+                t += cmd.arg
+            elif cmd.op == "send":
+                print("%.3f %s" % (t, " ".join("%d:%d" % c for c in cmd.arg)))
+        return
+
+    from .multi import open_board
+    from .writer import ServoWriter
+    driver = open_board(args.port)
+    writer = ServoWriter(driver)
+    try:
+        stats = run(args.source, writer, flush=lambda: (writer.flush(), driver.flush()))
+        writer.flush()
+        driver.flush()
+        print("OK %d perintah dalam %.2f detik (%d wait terlambat, maks %.1f ms)" % (
+            stats["commands"], stats["duration_s"], stats["late"], stats["max_late_ms"]))
+    except KeyboardInterrupt:
+        print("\nDihentikan oleh user (Ctrl+C)")
+    finally:
+        writer.close()
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
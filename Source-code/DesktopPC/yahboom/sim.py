@@ -0,0 +1,274 @@
+# -*- coding:utf-8 -*-
+"""
+Simulator board Yahboom 16 Channel di atas pseudo-terminal (pty).
+
+Simulator membuka pasangan pty: sisi slave (/dev/pts/N) dipakai program
+seperti port serial biasa, sisi master dibaca simulator dengan laju 9600bps
+8N1 (~1.04ms per byte), jadi buffer pty penuh dan penulis tertahan seperti
+di kabel asli. Setiap frame `$[A-P][000-180]#` yang valid dicatat dengan
+timestamp (time.monotonic) saat byte '#' selesai diterima; frame rusak
+ditolak dan dihitung. Posisi servo dimodelkan dengan slew rate (°/s).
+
+Memori tetap untuk soak test yang lama: `commands` hanya menyimpan
+`history` frame terakhir, jumlah totalnya ada di `accepted`. `rejected`
+menghitung frame yang ditolak (satu per resync), bukan byte sampah.
+
+Hanya untuk POSIX (Linux/macOS).
+
+Jalankan:
+    python -m yahboom.sim
+    python 01-servo-test-cli.py -p /dev/pts/N --test-sweep
+
+Atau dari Python:
+    with BoardSimulator() as sim:
+        driver = open_serial(sim.port)
+        driver.set(1, 90)
+        sim.wait_for(1)
+        print(sim.commands[-1])
+"""
+
+import collections
+import os
+import select
+import threading
+import time
+
+from .driver import NUM_CHANNELS, MAX_ANGLE, FRAME_LEN, START_BYTE, END_BYTE
+
+Command = collections.namedtuple("Command", "time servo angle")
+
+
+class ServoModel:
+    """
+    Posisi satu servo yang bergerak ke target dengan kecepatan tetap.
+
+    Args:
+        slew_rate: Kecepatan servo (°/s), mis. 0.15s/60° = 400°/s
+    """
+
+    def __init__(self, slew_rate):
+        self.slew_rate = slew_rate
+        self.target = None
+        self._from = None
+        self._t0 = 0.0
+
+    def command(self, angle, t):
+        """Target baru pada waktu t; servo yang belum pernah diberi target langsung di sana"""
+        pos = self.position(t)
+        self._from = angle if pos is None else pos
+        self.target = angle
+        self._t0 = t
+
+    def position(self, t):
+        """Posisi (float, derajat) pada waktu t, None jika belum pernah diberi target"""
+        if self.target is None:
+            return None
+        dist = self.target - self._from
+        travel = self.slew_rate * (t - self._t0)
+        if travel >= abs(dist):
+            return float(self.target)
+        return self._from + (travel if dist > 0 else -travel)
+
+    def arrival(self):
+        """Waktu (time.monotonic) servo sampai di target"""
+        if self.target is None:
+            return self._t0
+        return self._t0 + abs(self.target - self._from) / self.slew_rate
+
+
+class BoardSimulator:
+    """
+    Args:
+        baudrate: Baudrate yang disimulasikan (default 9600)
+        slew_rate: Kecepatan servo (°/s)
+        bits_per_byte: 10 untuk 8N1
+        on_command: Callback(Command) dipanggil dari thread simulator
+        history: Jumlah Command terakhir yang disimpan di `commands`
+    """
+
+    def __init__(self, baudrate=9600, slew_rate=400.0, bits_per_byte=10, on_command=None,
+                 history=4096):
+        self.baudrate = baudrate
+        self.byte_time = bits_per_byte / float(baudrate)
+        self.on_command = on_command
+        self.servos = [None] + [ServoModel(slew_rate) for _ in range(NUM_CHANNELS)]
+
+        self.history = history
+        self.commands = collections.deque(maxlen=history)
+        self.accepted = 0
+        self.rejected = 0
+        self.received = 0
+        self.port = None
+
+        self._frame = bytearray()
+        # True selama membuang byte sampai '$' berikutnya (satu resync)
+        self._skipping = False
+        self._cond = threading.Condition()
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._running = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        """Buka pty dan mulai thread pembaca. Return path port (/dev/pts/N)."""
+        import pty
+        import tty
+        self._master, self._slave = pty.openpty()
+        # Raw: tanpa echo dan tanpa konversi newline, persis seperti UART
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="board-sim", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = None
+        self._slave = None
+
+    def _run(self):
+        wire_free = 0.0
+        while self._running:
+            ready, _, _ = select.select([self._master], [], [], 0.1)
+            if not ready:
+                continue
+            # Ambil sedikit-sedikit supaya sisanya tetap antri di pty
+            try:
+                data = os.read(self._master, FRAME_LEN * 4)
+            except OSError:
+                break
+            now = time.monotonic()
+            wire_free = max(now, wire_free) + len(data) * self.byte_time
+            self.feed(data, wire_free)
+            delay = wire_free - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def feed(self, data, t=None):
+        """
+        Proses byte yang diterima; t = waktu byte terakhir selesai diterima.
+
+        Bisa dipanggil langsung (tanpa pty) untuk benchmark parser.
+        """
+        if t is None:
+            t = time.monotonic()
+        n = len(data)
+        self.received += n
+        frame = self._frame
+        for i, b in enumerate(bytes(data)):
+            if b == START_BYTE:
+                if frame:
+                    # '$' di tengah frame: frame sebelumnya terpotong
+                    self.rejected += 1
+                frame[:] = b"$"
+                self._skipping = False
+                continue
+            if not frame:
+                # Sampah di luar frame: satu penolakan per resync, bukan per byte
+                if not self._skipping:
+                    self.rejected += 1
+                    self._skipping = True
+                continue
+            frame.append(b)
+            if len(frame) == FRAME_LEN:
+                self._accept(frame, t - (n - 1 - i) * self.byte_time)
+                frame.clear()
+
+    def _accept(self, frame, t):
+        servo = frame[1] - 64
+        digits = frame[2:5]
+        if (frame[5] != END_BYTE or not 0 < servo <= NUM_CHANNELS
+                or not all(48 <= d <= 57 for d in digits)):
+            self._reject()
+            return
+        angle = int(bytes(digits))
+        if angle > MAX_ANGLE:
+            self._reject()
+            return
+        self.servos[servo].command(angle, t)
+        cmd = Command(t, servo, angle)
+        with self._cond:
+            self.commands.append(cmd)
+            self.accepted += 1
+            self._cond.notify_all()
+        if self.on_command is not None:
+            self.on_command(cmd)
+
+    def _reject(self):
+        # Byte sisa frame rusak sampai '$' berikutnya masuk penolakan yang sama
+        self.rejected += 1
+        self._skipping = True
+
+    def position(self, servo, t=None):
+        """Posisi servo (derajat) pada waktu t (default sekarang)"""
+        return self.servos[servo].position(time.monotonic() if t is None else t)
+
+    def angles(self, t=None):
+        """Dict {servo: posisi} untuk servo yang sudah pernah diberi target"""
+        if t is None:
+            t = time.monotonic()
+        return {ch: self.servos[ch].position(t) for ch in range(1, NUM_CHANNELS + 1)
+                if self.servos[ch].target is not None}
+
+    def wait_for(self, count, timeout=None):
+        """Tunggu sampai `count` command diterima sejak reset(). Return False jika timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.accepted >= count, timeout)
+
+    def reset(self):
+        """Kosongkan rekaman dan statistik (posisi servo tetap)"""
+        with self._cond:
+            self.commands.clear()
+            self.accepted = 0
+            self.rejected = 0
+            self.received = 0
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description='Simulator Yahboom 16 Channel Servo Controller di pseudo-terminal')
+    parser.add_argument('--baud', type=int, default=9600,
+                        help='Baudrate yang disimulasikan (default: 9600)')
+    parser.add_argument('--slew', type=float, default=400.0,
+                        help='Kecepatan servo dalam derajat/detik (default: 400)')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Jangan cetak setiap command')
+    args = parser.parse_args()
+
+    t0 = time.monotonic()
+
+    def show(cmd):
+        print(f"  {cmd.time - t0:9.4f}s  Servo {cmd.servo:2d} ({chr(64 + cmd.servo)}) -> {cmd.angle:3d}°")
+
+    sim = BoardSimulator(baudrate=args.baud, slew_rate=args.slew,
+                         on_command=None if args.quiet else show)
+    port = sim.open()
+    print(f"Simulator siap di {port} @ {args.baud}bps (Ctrl+C untuk berhenti)")
+    print(f"  Contoh: python 01-servo-test-cli.py -p {port} --test-sweep\n")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.close()
+    print(f"\n{sim.accepted} command diterima, {sim.rejected} ditolak, {sim.received} byte")
+
+
+if __name__ == "__main__":
+    main()
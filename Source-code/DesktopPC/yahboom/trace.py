@@ -0,0 +1,249 @@
+# -*- coding:utf-8 -*-
+"""
+Tracing opsional untuk jalur panas (kirim frame, trajectory, GUI).
+
+Tanpa enable() modul ini tidak melakukan apa-apa: tracer bernilai None dan
+setiap titik trace hanya membaca satu atribut modul lalu lanjut. Setelah
+enable(), setiap span dicatat dengan waktu perf_counter_ns ke ring buffer
+(memori tetap) dan bisa disimpan sebagai JSON trace-event Chrome, lalu
+dibuka di chrome://tracing atau https://ui.perfetto.dev.
+
+Nama span yang dipakai library:
+
+  driver.set, driver.set_many   set()/set_many() termasuk menyusun frame
+  port.write, i2c.write         satu panggilan write() ke transport
+  pacer.sleep                   tunggu Pacer (args planned_ms = rencana)
+  play.sleep, play.send         tidur dan kirim di trajectory.play()
+  play.sample                   menghitung sampel trajectory berikutnya
+
+Modul ini juga jalan di MicroPython (tanpa perf_counter_ns: time_ns).
+
+Example:
+    from yahboom import trace
+    trace.enable()
+    with trace.span("my.step", "app"):
+        ...
+    trace.save("out.json")
+"""
+
+import time
+
+try:
+    from _thread import allocate_lock, get_ident
+except ImportError:  # MicroPython tanpa thread
+    allocate_lock = None
+
+    def get_ident():
+        return 0
+
+if hasattr(time, "perf_counter_ns"):
+    now = time.perf_counter_ns
+elif hasattr(time, "time_ns"):
+    now = time.time_ns
+else:
+    def now():
+        return int(time.time() * 1000000000)
+
+DEFAULT_CAPACITY = 200000
+
+# Tracer aktif, None = tracing mati
+tracer = None
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = now()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.cat, self.start, now() - self.start, self.args)
+        return False
+
+
+class Tracer:
+    """
+    Ring buffer event trace; jika penuh, event tertua ditimpa.
+
+    Args:
+        capacity: Jumlah event maksimum yang disimpan
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Capacity harus >= 1")
+        self.capacity = capacity
+        self._events = [None] * capacity
+        self._head = 0
+        self.count = 0
+        self.origin = now()
+        self._lock = allocate_lock() if allocate_lock is not None else None
+
+    def add(self, name, cat, start, dur, args=None):
+        """
+        Catat satu event. dur dalam ns untuk span, None untuk instant,
+        atau "C" untuk counter (args = {seri: nilai}).
+        """
+        event = (name, cat, start, dur, get_ident(), args)
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
+        i = self._head
+        self._events[i] = event
+        i += 1
+        self._head = 0 if i == self.capacity else i
+        self.count += 1
+        if lock is not None:
+            lock.release()
+
+    @property
+    def dropped(self):
+        """Jumlah event tertua yang sudah tertimpa"""
+        return max(0, self.count - self.capacity)
+
+    def span(self, name, cat="yahboom", args=None):
+        return _Span(self, name, cat, args)
+
+    def events(self):
+        """List event urut waktu catat"""
+        if self.count < self.capacity:
+            return self._events[:self.count]
+        return self._events[self._head:] + self._events[:self._head]
+
+    def to_chrome(self):
+        """Dict format Chrome trace-event (JSON Object Format)"""
+        try:
+            import os
+            pid = os.getpid()
+        except (ImportError, AttributeError):
+            pid = 1
+        origin = self.origin
+        out = []
+        tids = set()
+        for name, cat, start, dur, tid, args in self.events():
+            tids.add(tid)
+            ev = {"name": name, "cat": cat, "pid": pid, "tid": tid,
+                  "ts": (start - origin) / 1000.0}
+            if dur is None:
+                ev["ph"] = "i"
+                ev["s"] = "t"
+            elif dur == "C":
+                ev["ph"] = "C"
+            else:
+                ev["ph"] = "X"
+                ev["dur"] = dur / 1000.0
+            if args:
+                ev["args"] = args
+            out.append(ev)
+        # Nama thread (servo-writer, MainThread, ...) untuk tampilan Perfetto
+        try:
+            import threading
+            names = {t.ident: t.name for t in threading.enumerate()}
+        except ImportError:
+            names = {}
+        for tid in sorted(tids):
+            out.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                        "args": {"name": names.get(tid, "thread-%d" % tid)}})
+        return {"traceEvents": out, "displayTimeUnit": "ms",
+                "otherData": {"events": self.count, "dropped": self.dropped}}
+
+    def save(self, path):
+        """Tulis JSON trace ke file; return jumlah event yang ditulis"""
+        import json
+        data = self.to_chrome()
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        return self.count - self.dropped
+
+
+def enable(capacity=DEFAULT_CAPACITY):
+    """Mulai tracing dengan buffer baru; return Tracer"""
+    global tracer
+    tracer = Tracer(capacity)
+    return tracer
+
+
+def disable():
+    """Hentikan tracing; return Tracer terakhir (atau None)"""
+    global tracer
+    t, tracer = tracer, None
+    return t
+
+
+def span(name, cat="yahboom", args=None):
+    """
+    Context manager span; tanpa tracing mengembalikan object no-op bersama.
+
+    Example:
+        with trace.span("gui.redraw", "gui"):
+            ...
+    """
+    t = tracer
+    if t is None:
+        return _NOOP
+    return _Span(t, name, cat, args)
+
+
+def instant(name, cat="yahboom", args=None):
+    """Catat event sesaat (tanpa durasi)"""
+    t = tracer
+    if t is not None:
+        t.add(name, cat, now(), None, args)
+
+
+def counter(name, values, cat="yahboom"):
+    """Catat nilai counter/track, mis. counter("tk.after lag", {"ms": 3.2})"""
+    t = tracer
+    if t is not None:
+        t.add(name, cat, now(), "C", values)
+
+
+def traced(name=None, cat="yahboom"):
+    """
+    Decorator: setiap panggilan fungsi menjadi satu span.
+
+    Tracer dicek saat fungsi dipanggil, jadi enable() setelah import tetap
+    berlaku.
+    """
+    def wrap(fn):
+        label = name or fn.__name__
+
+        def wrapper(*args, **kwargs):
+            t = tracer
+            if t is None:
+                return fn(*args, **kwargs)
+            start = now()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                t.add(label, cat, start, now() - start)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return wrap
+
+
+def save(path):
+    """Simpan tracer aktif ke file JSON; return jumlah event (0 jika tracing mati)"""
+    t = tracer
+    if t is None:
+        return 0
+    return t.save(path)
@@ -0,0 +1,193 @@
+# -*- coding:utf-8 -*-
+"""
+Trajectory berbasis waktu untuk animasi pose servo.
+
+Menggantikan "20 langkah linear + time.sleep(speed)": gerakan sekarang
+punya durasi nyata (diberikan langsung atau dihitung dari batas kecepatan/
+percepatan per joint), di-sample pada frekuensi kontrol tetap, dan
+diputar dengan deadline absolut sehingga total waktu tidak bergeser karena
+overhead per langkah (redraw GUI, penjadwalan thread, dll).
+
+Profil (posisi ternormalisasi u(s), s = t/T di 0..1):
+
+  - linear:    kecepatan konstan (perilaku lama)
+  - trapezoid: percepatan - kecepatan konstan - perlambatan
+  - scurve:    cycloidal, kecepatan & percepatan nol di kedua ujung
+  - minjerk:   minimum-jerk (polinom derajat 5)
+
+Example:
+    traj = plan([90] * 6, [90, 60, 120, 90, 90, 45], vmax=90)
+    play(traj, driver.set_pose)
+"""
+
+import math
+import time
+
+from . import trace
+
+DEFAULT_RATE = 50.0
+
+
+def _linear(s):
+    return s
+
+
+def _trapezoid(s, accel=0.25):
+    # accel = fraksi durasi untuk fase percepatan (dan perlambatan)
+    v = 1.0 / (1.0 - accel)
+    if s < accel:
+        return 0.5 * v / accel * s * s
+    if s > 1.0 - accel:
+        r = 1.0 - s
+        return 1.0 - 0.5 * v / accel * r * r
+    return v * (s - 0.5 * accel)
+
+
+def _scurve(s):
+    return s - math.sin(2.0 * math.pi * s) / (2.0 * math.pi)
+
+
+def _minjerk(s):
+    return s * s * s * (10.0 + s * (-15.0 + 6.0 * s))
+
+
+# nama -> (u(s), kecepatan puncak, percepatan puncak) dalam satuan ternormalisasi.
+# Untuk jarak d dan durasi T: v_max = d/T * vel, a_max = d/T^2 * acc.
+PROFILES = {
+    "linear": (_linear, 1.0, None),
+    "trapezoid": (_trapezoid, 1.0 / 0.75, 1.0 / (0.25 * 0.75)),
+    "scurve": (_scurve, 2.0, 2.0 * math.pi),
+    "minjerk": (_minjerk, 1.875, 10.0 / math.sqrt(3.0)),
+}
+
+
+def _per_joint(value, n):
+    if value is None or isinstance(value, (int, float)):
+        return [value] * n
+    value = list(value)
+    if len(value) != n:
+        raise ValueError("Butuh %d batas per joint, bukan %d" % (n, len(value)))
+    return value
+
+
+def min_duration(start, end, vmax=None, amax=None, profile="minjerk"):
+    """
+    Durasi tersingkat agar tidak ada joint yang melewati vmax (°/s) atau
+    amax (°/s²). vmax/amax boleh satu angka atau list per joint.
+    """
+    _, vel, acc = PROFILES[profile]
+    n = len(start)
+    vmax = _per_joint(vmax, n)
+    amax = _per_joint(amax, n)
+    duration = 0.0
+    for a, b, v, am in zip(start, end, vmax, amax):
+        d = abs(b - a)
+        if not d:
+            continue
+        if v:
+            duration = max(duration, d * vel / v)
+        if am and acc is not None:
+            duration = max(duration, math.sqrt(d * acc / am))
+    return duration
+
+
+class Trajectory:
+    """
+    Gerakan dari pose start ke pose end dalam `duration` detik.
+
+    Iterasi menghasilkan (t, pose) dengan t detik sejak awal gerakan dan
+    pose berupa list sudut int, mulai t=0 (pose start) sampai t=duration
+    (tepat pose end).
+
+    Args:
+        start: List sudut awal
+        end: List sudut tujuan (panjang sama dengan start)
+        duration: Lama gerakan (detik)
+        profile: Nama profil di PROFILES
+        rate: Frekuensi kontrol (Hz)
+    """
+
+    def __init__(self, start, end, duration, profile="minjerk", rate=DEFAULT_RATE):
+        if len(start) != len(end):
+            raise ValueError("Pose start dan end harus sama panjang")
+        if profile not in PROFILES:
+            raise ValueError("Profil tidak dikenal: %r" % (profile,))
+        if rate <= 0:
+            raise ValueError("Rate harus > 0")
+        self.start = list(start)
+        self.end = list(end)
+        self.duration = max(0.0, float(duration))
+        self.profile = profile
+        self.rate = rate
+        self._shape = PROFILES[profile][0]
+        self.steps = max(1, int(math.ceil(self.duration * rate)))
+
+    def __len__(self):
+        return self.steps + 1
+
+    def sample(self, t):
+        """Pose (list float) pada waktu t detik"""
+        if self.duration <= 0 or t >= self.duration:
+            return [float(b) for b in self.end]
+        if t <= 0:
+            return [float(a) for a in self.start]
+        u = self._shape(t / self.duration)
+        return [a + (b - a) * u for a, b in zip(self.start, self.end)]
+
+    def __iter__(self):
+        dt = self.duration / self.steps
+        for k in range(self.steps):
+            t = k * dt
+            yield t, [int(round(a)) for a in self.sample(t)]
+        yield self.duration, [int(round(b)) for b in self.end]
+
+
+def plan(start, end, duration=None, vmax=None, amax=None, profile="minjerk", rate=DEFAULT_RATE):
+    """
+    Buat Trajectory dari durasi atau batas kecepatan/percepatan per joint.
+
+    Jika duration dan batas sama-sama diberikan, dipakai yang paling lama
+    supaya batas tetap dihormati.
+    """
+    if duration is None and vmax is None and amax is None:
+        raise ValueError("Berikan duration atau vmax/amax")
+    limited = min_duration(start, end, vmax, amax, profile)
+    return Trajectory(start, end, max(duration or 0.0, limited), profile, rate)
+
+
+def play(samples, send, clock=time.monotonic, sleep=time.sleep, stop=None):
+    """
+    Putar stream (t, pose) dengan deadline absolut.
+
+    Setiap sampel dikirim pada t0 + t. Jika pemutar tertinggal (mis. port
+    lambat), sampel yang sudah lewat deadline-nya dilewati dan hanya pose
+    terbaru yang dikirim, jadi gerakan tetap selesai tepat waktu.
+
+    Args:
+        samples: Iterable (t, pose), mis. Trajectory
+        send: Callback(pose)
+        stop: Callable opsional, return True untuk berhenti
+    Return: jumlah pose yang dikirim
+    """
+    t0 = clock()
+    sent = 0
+    it = iter(samples)
+    item = next(it, None)
+    while item is not None:
+        if stop is not None and stop():
+            break
+        t, pose = item
+        delay = t0 + t - clock()
+        if delay > 0:
+            with trace.span("play.sleep", "trajectory", {"planned_ms": delay * 1000.0}):
+                sleep(delay)
+        with trace.span("play.sample", "trajectory"):
+            item = next(it, None)
+        # Tertinggal: sampel berikutnya juga sudah jatuh tempo, lewati yang ini
+        if item is not None and t0 + item[0] <= clock():
+            trace.instant("play.skip", "trajectory", {"t": t})
+            continue
+        with trace.span("play.send", "trajectory"):
+            send(pose)
+        sent += 1
+    return sent
@@ -0,0 +1,205 @@
+# -*- coding:utf-8 -*-
+"""
+Thread penulis serial dengan mailbox "target terakhir" per channel.
+
+GUI/CLI hanya memanggil post() yang langsung kembali. Thread penulis yang
+memegang port; jika satu channel di-post berkali-kali sebelum sempat
+dikirim, hanya nilai terbaru yang dikirim (coalescing), sehingga kabel
+selalu membawa pose paling baru, bukan antrian sudut yang sudah basi.
+
+Jika driver punya metrics (yahboom.metrics.DriverMetrics), writer ikut
+mencatat target yang di-coalesce/dibuang, kedalaman antrian dan waktu dari
+post() sampai frame di kabel.
+"""
+
+import threading
+import time
+
+from .driver import NUM_CHANNELS, check
+
+
+class ServoWriter:
+    """
+    Penulis latar belakang di atas ServoDriver.
+
+    Args:
+        driver: ServoDriver yang sudah terhubung ke port
+        on_error: Callback(exc) dipanggil dari thread penulis jika write gagal
+    """
+
+    def __init__(self, driver, on_error=None):
+        self.driver = driver
+        self.on_error = on_error
+
+        # Slot 1-16: sudut target yang belum terkirim (None = kosong)
+        self._pending = [None] * (NUM_CHANNELS + 1)
+        # Jarak minimum antar frame per channel (detik) dan waktu kirim terakhir
+        self._interval = [0.0] * (NUM_CHANNELS + 1)
+        self._last_sent = [0.0] * (NUM_CHANNELS + 1)
+        # Waktu post() per slot, hanya diisi jika driver punya metrics
+        self._posted = [0.0] * (NUM_CHANNELS + 1)
+
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="servo-writer", daemon=True)
+        self._thread.start()
+
+    def post(self, ch, angle):
+        """Simpan target terbaru untuk satu servo, tidak pernah blocking"""
+        check(ch, angle)
+        metrics = getattr(self.driver, "metrics", None)
+        with self._cond:
+            if metrics is not None:
+                self._mark(metrics, ch, time.monotonic())
+            self._pending[ch] = angle
+            self._cond.notify()
+
+    def post_many(self, targets, immediate=False):
+        """
+        Simpan target untuk beberapa servo sekaligus.
+
+        Args:
+            targets: dict {servo: angle} atau iterable pasangan (servo, angle)
+            immediate: Kirim tanpa menunggu jarak minimum channel
+                       (set_interval); untuk sampel trajectory/rekaman yang
+                       timing-nya sudah diatur pemanggil
+        """
+        if hasattr(targets, "items"):
+            targets = targets.items()
+        targets = list(targets)
+        for ch, angle in targets:
+            check(ch, angle)
+        metrics = getattr(self.driver, "metrics", None)
+        now = time.monotonic()
+        with self._cond:
+            for ch, angle in targets:
+                if metrics is not None:
+                    self._mark(metrics, ch, now)
+                self._pending[ch] = angle
+                if immediate:
+                    self._last_sent[ch] = float("-inf")
+            self._cond.notify()
+
+    def _mark(self, metrics, ch, now):
+        # Slot masih terisi: target lama ditimpa sebelum sempat dikirim
+        if self._pending[ch] is not None:
+            metrics.frames_coalesced += 1
+        else:
+            self._posted[ch] = now
+
+    def batch(self):
+        """
+        Context manager: semua post() di dalam blok `with` dikirim bersama
+        dalam satu write(), thread penulis menunggu sampai blok selesai.
+
+        Example:
+            with writer.batch():
+                for i in range(1, 17):
+                    writer.post(i, 90)
+        """
+        return self._cond
+
+    def set_interval(self, ch, seconds):
+        """
+        Atur jarak minimum antar frame untuk satu channel.
+
+        Dipakai GUI untuk delay per joint (mis. S2 & S3 = 100ms): nilai di
+        antaranya tidak diantrikan, hanya yang terbaru dikirim saat jatah
+        waktunya tiba.
+        """
+        with self._cond:
+            self._interval[ch] = max(0.0, seconds)
+            self._cond.notify()
+
+    def refresh(self):
+        """Kirim ulang semua sudut yang sudah pernah dikirim (abaikan shadow driver)"""
+        with self._cond:
+            shadow = self.driver.shadow
+            for ch in range(1, NUM_CHANNELS + 1):
+                if self._pending[ch] is None:
+                    self._pending[ch] = shadow[ch]
+            self.driver.invalidate()
+            self._cond.notify()
+
+    def pending(self):
+        """Jumlah channel yang masih menunggu dikirim"""
+        with self._cond:
+            return sum(1 for a in self._pending if a is not None)
+
+    def flush(self, timeout=None):
+        """Tunggu sampai semua target terkirim. Return False jika timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._busy or any(a is not None for a in self._pending):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=1.0):
+        """Hentikan thread penulis (target yang belum terkirim dibuang)"""
+        with self._cond:
+            self._running = False
+            metrics = getattr(self.driver, "metrics", None)
+            if metrics is not None:
+                metrics.frames_dropped += sum(1 for a in self._pending if a is not None)
+                metrics.queue(0)
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _take_ready(self, now):
+        """Ambil channel yang siap dikirim; return (batch, waktu tunggu berikutnya)"""
+        batch = []
+        wait = None
+        pending = self._pending
+        for ch in range(1, NUM_CHANNELS + 1):
+            angle = pending[ch]
+            if angle is None:
+                continue
+            due = self._last_sent[ch] + self._interval[ch]
+            if due <= now:
+                batch.append((ch, angle))
+                pending[ch] = None
+                self._last_sent[ch] = now
+            elif wait is None or due - now < wait:
+                wait = due - now
+        metrics = getattr(self.driver, "metrics", None)
+        if metrics is not None:
+            # Kedalaman = yang diambil sekarang + yang masih menunggu jatah
+            metrics.queue(sum(1 for a in pending if a is not None) + len(batch))
+        return batch, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    batch, wait = self._take_ready(time.monotonic())
+                    if batch:
+                        break
+                    # Tidak ada yang siap: tunggu post baru atau jatah channel berikutnya
+                    self._busy = False
+                    self._cond.notify_all()
+                    self._cond.wait(wait)
+                self._busy = True
+                metrics = getattr(self.driver, "metrics", None)
+                if metrics is not None:
+                    posted = [self._posted[ch] for ch, _ in batch]
+                    for ch, _ in batch:
+                        self._posted[ch] = 0.0
+
+            try:
+                sent = self.driver.set_many(batch)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+                continue
+            # Tanpa byte terkirim (semua sama dengan shadow) wire_time() basi
+            if metrics is not None and sent:
+                wire = self.driver.wire_time()
+                for t in posted:
+                    if t:  # 0 = di-post sebelum metrics dipasang
+                        metrics.post_to_wire_seconds.observe(max(0.0, wire - t))
@@ -1,12 +1,17 @@
-import smbus
+# -*- coding:utf-8 -*-
+import os
+import sys
 import time
-bus = smbus.SMBus(1)
+#Library bersama ada di folder DesktopPC/yahboom
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "DesktopPC"))
+from yahboom.i2c import open_i2c
 
-Servo_ADD = 0x2D
+#Satu handle SMBus(1) untuk seluruh program, alamat board 0x2D
+#Tidak ada sleep(0.1) per servo: set_all/set_pose mengirim 16 servo berurutan
+servo = open_i2c(1, 0x2D)
 
 def IICServo(servonum, angle):
-    bus.write_byte_data(Servo_ADD,servonum,angle)
-    time.sleep(0.1)
+    servo.set(servonum, angle)
 
 IICServo(1,0)
 time.sleep(2)
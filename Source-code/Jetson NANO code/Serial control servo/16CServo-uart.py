@@ -1,7 +1,12 @@
 # -*- coding:utf-8 -*-
-import binascii
+import os
+import sys
 import serial
 import time
+#Library bersama ada di folder DesktopPC/yahboom
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "DesktopPC"))
+from yahboom import ServoDriver
+from yahboom.pacing import Pacer
 #Configure the serial port
 ser = serial.Serial(
     port="/dev/ttyTHS1",
@@ -11,14 +16,12 @@ ser = serial.Serial(
     stopbits=serial.STOPBITS_ONE,
 )
 
+#Frame $[A-P][000-180]# diambil dari tabel di yahboom/driver.py
+#Pacer mengatur jeda antar frame sesuai baudrate 9600 (bukan sleep tetap)
+servo = ServoDriver(ser, Pacer(baudrate=9600))
+
 def UARTServo(servonum, angle):
-    servonum = 64 + servonum
-    date1 = int(angle/100 + 48)
-    date2 = int((angle%100)/10 + 48)
-    date3 = int(angle%10 + 48)
-    cmd=bytearray([36,servonum,date1,date2,date3,35])
-    ser.write(cmd)
-    time.sleep(0.05)
+    servo.set(servonum, angle)
 
 UARTServo(1,0)
 time.sleep(2)
@@ -1,14 +1,17 @@
 from machine import Pin, I2C
 import time
+#Salin folder DesktopPC/yahboom ke filesystem Pico (mis. lewat Thonny)
+from yahboom.i2c import I2CDriver
 #Configure IIC
 i2c=I2C(0, scl=Pin(21),sda=Pin(20), freq=100000)
 #i2c=I2C(1, scl=Pin(19),sda=Pin(18), freq=100000)
 #Set IIC address
 Servo_ADD = 0x2D
 #IIC control servo function
+servo = I2CDriver(i2c, Servo_ADD)
+
 def IICServo(servonum, angle):
-    i2c.writeto(Servo_ADD,bytearray([servonum,angle]))
-    time.sleep(0.1)
+    servo.set(servonum, angle)
 
 IICServo(1,0)
 time.sleep(2)